@@ -0,0 +1,33 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import linspace
+
+from pystdatm import (airspeed_state, calibrated_airspeed_from_mach,
+                      dynamic_pressure, equivalent_airspeed, impact_pressure,
+                      mach_from_true_airspeed)
+
+#%%
+# Altitudes and True Airspeeds Spanning Subsonic and Supersonic Flight
+alt = linspace(0.0, 20000.0, 1_000_000)
+vtas = linspace(50.0, 600.0, alt.size)
+
+def separate_calls():
+    mach = mach_from_true_airspeed(alt, vtas)
+    equivalent_airspeed(alt, vtas)
+    calibrated_airspeed_from_mach(alt, mach)
+    dynamic_pressure(alt, mach)
+    impact_pressure(alt, mach)
+
+def single_pass():
+    airspeed_state(alt, vtas)
+
+#%%
+# Benchmark Separate Calls Against Single Pass
+number = 5
+t_sep = min(repeat(separate_calls, number=number, repeat=5))/number
+t_one = min(repeat(single_pass, number=number, repeat=5))/number
+print(f'Separate Calls = {t_sep*1e3:.1f} ms\n')
+print(f'Airspeed State = {t_one*1e3:.1f} ms\n')
+print(f'Speed Up = {t_sep/t_one:.2f}x\n')
@@ -0,0 +1,33 @@
+#%%
+# Import Dependencies
+import tracemalloc
+from timeit import repeat
+
+from numpy import empty, linspace
+
+from pystdatm import Workspace, density, pressure, temperature
+
+#%%
+# Fixed Size Arrays as in a Simulation Loop
+size = 10_000
+alt = linspace(-2000.0, 84852.0, size)
+out = empty(size)
+workspace = Workspace(size)
+
+#%%
+# Steady State Allocations with and without Reused Buffers
+steps = 1000
+for func in (temperature, pressure, density):
+    for kwargs in ({}, {'out': out, 'workspace': workspace}):
+        func(alt, **kwargs)
+        tracemalloc.start()
+        for _ in range(steps):
+            func(alt, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        number = 100
+        time = min(repeat(lambda: func(alt, **kwargs), number=number,
+                          repeat=5))/number
+        label = 'out and workspace' if kwargs else 'new arrays'
+        print(f'{func.__name__:>11s} with {label:>17s}: '
+              f'peak = {peak/1024:8.1f} KiB, time = {time*1e6:.1f} us')
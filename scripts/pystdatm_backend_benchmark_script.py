@@ -0,0 +1,30 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import empty, linspace
+
+from pystdatm import (Workspace, atmosphere_state, available_backends,
+                      pressure, set_backend)
+
+#%%
+# Altitudes Spanning All Layers
+alt = linspace(-2000.0, 84852.0, 1_000_000)
+out = empty(alt.size)
+workspace = Workspace(alt.size)
+
+#%%
+# Benchmark Each Available Backend
+number = 5
+for name in available_backends():
+    set_backend(name)
+    # The first call compiles the numba kernels.
+    pressure(alt, out=out, workspace=workspace)
+    atmosphere_state(alt)
+    t_pres = min(repeat(lambda: pressure(alt, out=out, workspace=workspace),
+                        number=number, repeat=5))/number
+    t_state = min(repeat(lambda: atmosphere_state(alt),
+                         number=number, repeat=5))/number
+    print(f'{name:s} Pressure = {t_pres*1e3:.1f} ms\n')
+    print(f'{name:s} Atmosphere State = {t_state*1e3:.1f} ms\n')
+set_backend('numpy')
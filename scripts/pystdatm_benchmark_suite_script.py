@@ -0,0 +1,45 @@
+#%%
+# Import Dependencies
+from argparse import ArgumentParser
+from pathlib import Path
+
+from pystdatm.benchmark import (SIZES, THRESHOLD, compare_benchmarks,
+                                load_benchmarks, run_benchmarks,
+                                save_benchmarks)
+
+#%%
+# Command Line Arguments
+BASELINE = Path(__file__).parent / 'pystdatm_benchmark_baseline.json'
+
+parser = ArgumentParser(description='Benchmark the pystdatm functions.')
+parser.add_argument('--output', default='pystdatm_benchmark_results.json',
+                    help='JSON file the results are saved to')
+parser.add_argument('--baseline', default=str(BASELINE),
+                    help='JSON file of the baseline results')
+parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                    help='slowdown ratio against the baseline that fails')
+parser.add_argument('--max-size', type=int, default=max(SIZES[1:]),
+                    help='largest array size benchmarked')
+parser.add_argument('--save-baseline', action='store_true',
+                    help='save the results as the new baseline')
+args = parser.parse_args()
+
+#%%
+# Run The Benchmarks
+sizes = tuple(size for size in SIZES if size is None or size <= args.max_size)
+results = run_benchmarks(sizes=sizes)
+save_benchmarks(results, args.output)
+for key, value in results['timings'].items():
+    print(f'{key:s} = {value*1e6:.3f} us')
+
+#%%
+# Compare Against The Baseline
+if args.save_baseline:
+    save_benchmarks(results, args.baseline)
+elif Path(args.baseline).exists():
+    regressions = compare_benchmarks(results, load_benchmarks(args.baseline),
+                                     args.threshold)
+    for key, ratio in regressions.items():
+        print(f'Slower than baseline: {key:s} = {ratio:.2f}x')
+    if regressions:
+        raise SystemExit(1)
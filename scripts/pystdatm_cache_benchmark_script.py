@@ -0,0 +1,29 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import linspace
+
+from pystdatm import (density, disable_cache, enable_cache, pressure,
+                      speed_of_sound)
+
+#%%
+# A Fixed Altitude Grid Evaluated Repeatedly
+alt = linspace(-2000.0, 84852.0, 100_000)
+
+def evaluate():
+    density(alt)
+    pressure(alt)
+    speed_of_sound(alt)
+
+#%%
+# Benchmark Without And With The Cache
+number = 20
+t_none = min(repeat(evaluate, number=number, repeat=5))/number
+cache = enable_cache()
+t_cache = min(repeat(evaluate, number=number, repeat=5))/number
+disable_cache()
+print(f'No Cache = {t_none*1e3:.2f} ms\n')
+print(f'Cache = {t_cache*1e3:.2f} ms\n')
+print(f'Speed Up = {t_none/t_cache:.2f}x\n')
+print(cache.stats())
@@ -0,0 +1,32 @@
+#%%
+# Import Dependencies
+from importlib import import_module, reload
+from pathlib import Path
+
+from pystdatm.derivation import (BASE_STATES, bake_base_states,
+                                 derive_base_states)
+
+#%%
+# Bake The Base States Into The Layer Modules
+# Each pass derives the base states from the layer modules as written, so
+# a change below propagates up one layer per pass until nothing changes.
+modules = [import_module(f'pystdatm.{module}') for module, *_ in BASE_STATES]
+changed = True
+while changed:
+    changed = False
+    for module, values in derive_base_states().items():
+        path = Path(import_module(f'pystdatm.{module}').__file__)
+        source = path.read_text()
+        baked = bake_base_states(source, values)
+        if baked != source:
+            path.write_text(baked)
+            changed = True
+            print(f'Updated {path.name:s}')
+    for module in modules:
+        reload(module)
+
+#%%
+# Print The Base States
+for module, values in derive_base_states().items():
+    for name, value in values.items():
+        print(f'{module:s}.{name:s} = {value!r}')
@@ -0,0 +1,32 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import linspace
+
+from pystdatm import atmosphere_state, atmosphere_state_and_gradient
+
+#%%
+# Altitudes Over All Layers With A Temperature Deviation
+alt = linspace(-2000.0, 84852.0, 1_000_000)
+dev = 10.0
+step = 1.0
+
+def finite_differences():
+    atmosphere_state(alt, dev)
+    atmosphere_state(alt + step, dev)
+    atmosphere_state(alt - step, dev)
+    atmosphere_state(alt, dev + step)
+    atmosphere_state(alt, dev - step)
+
+def closed_form():
+    atmosphere_state_and_gradient(alt, dev)
+
+#%%
+# Benchmark Finite Differences Against Closed Form Derivatives
+number = 5
+t_fd = min(repeat(finite_differences, number=number, repeat=5))/number
+t_cf = min(repeat(closed_form, number=number, repeat=5))/number
+print(f'Finite Differences = {t_fd*1e3:.1f} ms\n')
+print(f'Closed Form = {t_cf*1e3:.1f} ms\n')
+print(f'Speed Up = {t_fd/t_cf:.2f}x\n')
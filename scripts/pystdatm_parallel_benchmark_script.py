@@ -0,0 +1,30 @@
+#%%
+# Import Dependencies
+from os import cpu_count
+from timeit import repeat
+
+from numpy import empty, linspace
+
+from pystdatm import density, parallel_evaluate
+
+#%%
+# Altitudes Spanning All Layers
+alt = linspace(-2000.0, 84852.0, 10_000_000)
+out = empty(alt.size)
+
+#%%
+# Benchmark Scaling From One To All Threads
+number = 3
+t_serial = min(repeat(lambda: density(alt, out=out),
+                      number=number, repeat=3))/number
+print(f'Serial = {t_serial*1e3:.1f} ms\n')
+workers = 1
+while True:
+    t_par = min(repeat(lambda: parallel_evaluate(density, alt, out=out,
+                                                 workers=workers),
+                       number=number, repeat=3))/number
+    print(f'{workers:d} Threads = {t_par*1e3:.1f} ms, '
+          f'Speed Up = {t_serial/t_par:.2f}x\n')
+    if workers >= (cpu_count() or 1):
+        break
+    workers = min(2*workers, cpu_count() or 1)
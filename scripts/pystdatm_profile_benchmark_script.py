@@ -0,0 +1,37 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import linspace
+
+from pystdatm import density, profile
+
+#%%
+# Scalar And Array Altitudes
+alt = linspace(-2000.0, 84852.0, 1_000)
+
+def scalar_calls():
+    density(5000.0)
+
+def array_calls():
+    density(alt)
+
+def benchmark(func, number):
+    return min(repeat(func, number=number, repeat=7))/number
+
+#%%
+# Benchmark Before, During And After Profiling
+t_scalar_0 = benchmark(scalar_calls, 100_000)
+t_array_0 = benchmark(array_calls, 10_000)
+with profile() as prof:
+    t_scalar_1 = benchmark(scalar_calls, 100_000)
+    t_array_1 = benchmark(array_calls, 10_000)
+t_scalar_2 = benchmark(scalar_calls, 100_000)
+t_array_2 = benchmark(array_calls, 10_000)
+print(f'Scalar Never Profiled = {t_scalar_0*1e9:.0f} ns\n')
+print(f'Scalar Profiling = {t_scalar_1*1e9:.0f} ns\n')
+print(f'Scalar After Profiling = {t_scalar_2*1e9:.0f} ns\n')
+print(f'Array Never Profiled = {t_array_0*1e6:.2f} us\n')
+print(f'Array Profiling = {t_array_1*1e6:.2f} us\n')
+print(f'Array After Profiling = {t_array_2*1e6:.2f} us\n')
+print(prof.to_json())
@@ -0,0 +1,19 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import asarray
+
+from pystdatm import density, pressure, speed_of_sound, temperature, viscosity
+
+#%%
+# Per-Call Latency for a Single Altitude
+alt = 14000.0 # metres above sea level
+number = 100_000
+
+for func in (temperature, pressure, density, viscosity, speed_of_sound):
+    t_float = min(repeat(lambda: func(alt), number=number, repeat=5))/number
+    alt_0d = asarray(alt)
+    t_array = min(repeat(lambda: func(alt_0d), number=number, repeat=5))/number
+    print(f'{func.__name__:>16s}: float = {t_float*1e6:.2f} us, '
+          f'0-d array = {t_array*1e6:.2f} us')
@@ -0,0 +1,49 @@
+#%%
+# Import Dependencies
+from asyncio import gather, run, sleep
+from time import perf_counter
+
+from numpy import mean, percentile
+from numpy.random import default_rng
+
+from pystdatm import AsyncAtmosphere, density
+
+#%%
+# Stand In Clients Each Sending Single Altitude Requests In Turn
+num_client = 1000
+num_request = 20
+rng = default_rng(0)
+alts = rng.uniform(-2000.0, 84852.0, (num_client, num_request)).tolist()
+
+async def client(evaluate, altitudes, latencies):
+    for altitude in altitudes:
+        start = perf_counter()
+        await evaluate(altitude)
+        latencies.append(perf_counter() - start)
+
+async def serve(evaluate):
+    latencies = []
+    start = perf_counter()
+    await gather(*(client(evaluate, altitudes, latencies)
+                   for altitudes in alts))
+    return perf_counter() - start, latencies
+
+async def direct(altitude):
+    # Each request is evaluated in its own call, yielding to the others.
+    await sleep(0.0)
+    return density([altitude])
+
+async def batched(batch_window):
+    async with AsyncAtmosphere(density, batch_window=batch_window) as service:
+        return await serve(service.evaluate)
+
+def report(name, elapsed, latencies):
+    print(f'{name}: {num_client*num_request/elapsed:,.0f} requests/s, '
+          f'latency mean = {mean(latencies)*1e3:.2f} ms, '
+          f'p99 = {percentile(latencies, 99.0)*1e3:.2f} ms\n')
+
+#%%
+# Throughput And Latency Per Call And Over Batch Windows
+report('Per Call', *run(serve(direct)))
+for batch_window in (0.0, 0.0002, 0.001, 0.005):
+    report(f'Window {batch_window*1e3:g} ms', *run(batched(batch_window)))
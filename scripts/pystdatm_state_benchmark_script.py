@@ -0,0 +1,31 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import linspace
+
+from pystdatm import (atmosphere_state, density, pressure, speed_of_sound,
+                      temperature, viscosity)
+
+#%%
+# Altitudes Spanning All Layers
+alt = linspace(-2000.0, 84852.0, 1_000_000)
+
+def separate_calls():
+    temperature(alt)
+    pressure(alt)
+    density(alt)
+    viscosity(alt)
+    speed_of_sound(alt)
+
+def single_pass():
+    atmosphere_state(alt)
+
+#%%
+# Benchmark Separate Calls Against Single Pass
+number = 5
+t_sep = min(repeat(separate_calls, number=number, repeat=5))/number
+t_one = min(repeat(single_pass, number=number, repeat=5))/number
+print(f'Separate Calls = {t_sep*1e3:.1f} ms\n')
+print(f'Atmosphere State = {t_one*1e3:.1f} ms\n')
+print(f'Speed Up = {t_sep/t_one:.2f}x\n')
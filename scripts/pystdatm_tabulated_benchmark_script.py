@@ -0,0 +1,24 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import linspace
+from numpy.random import default_rng
+
+from pystdatm import TabulatedAtmosphere, density, pressure
+
+#%%
+# Build the Table
+tabatm = TabulatedAtmosphere(step=100.0)
+print(f'{tabatm} with {tabatm.coefficients.nbytes/1024:.0f} KiB of coefficients\n')
+
+#%%
+# Compare Exact and Tabulated Evaluation on Shuffled Altitudes
+alt = default_rng(0).permutation(linspace(-2000.0, 84852.0, 1_000_000))
+number = 5
+
+for exact, approx in ((pressure, tabatm.pressure), (density, tabatm.density)):
+    t_exact = min(repeat(lambda: exact(alt), number=number, repeat=5))/number
+    t_approx = min(repeat(lambda: approx(alt), number=number, repeat=5))/number
+    print(f'{exact.__name__:>9s}: exact = {t_exact*1e3:.1f} ms, '
+          f'tabulated = {t_approx*1e3:.1f} ms')
@@ -0,0 +1,35 @@
+#%%
+# Import Dependencies
+from timeit import repeat
+
+from numpy import empty, linspace
+
+from pystdatm import (AtmosphereState, AtmosphereTracker, atmosphere_state,
+                      layer_workspace)
+
+#%%
+# Vehicles Climbing Slowly Through All Layers
+num_vehicle = 10_000
+alt = linspace(-2000.0, 84000.0, num_vehicle)
+step = 0.1
+workspace = layer_workspace(alt.shape)
+out = AtmosphereState(*(empty(alt.shape) for _ in AtmosphereState._fields))
+tracker = AtmosphereTracker(alt)
+
+def public():
+    alt[:] += step
+    atmosphere_state(alt, out=out, workspace=workspace)
+
+def tracked():
+    alt[:] += step
+    tracker.state(alt, out=out)
+
+#%%
+# Benchmark The Public Function Against The Tracker Per Step
+number = 1000
+t_public = min(repeat(public, number=number, repeat=5))/number
+t_tracked = min(repeat(tracked, number=number, repeat=5))/number
+print(f'Public = {t_public*1e6:.1f} us per step\n')
+print(f'Tracker = {t_tracked*1e6:.1f} us per step\n')
+print(f'Speed Up = {t_public/t_tracked:.2f}x\n')
+print(f'Crossings = {tracker.crossings:d}\n')
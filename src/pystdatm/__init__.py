@@ -4,15 +4,26 @@ International Standard Atmosphere (ISA) properties
 at different altitudes.
 """
 
-from typing import TYPE_CHECKING
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-from numpy import asarray, full, logical_and, sqrt, where
+from numpy import (add, asarray, broadcast_shapes, broadcast_to, copyto,
+                   divide, less_equal, logical_and, multiply, sqrt, subtract)
 
-from .constants import (BETA_S, GAMMA, H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7,
-                        R_0, RHO_0, R, S)
+from .backend import ACTIVE, available_backends, get_backend, set_backend
+from .constants import (H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7, R_0, RHO_0,
+                        R)
+from .layers import (Workspace, layer_density, layer_dtype, layer_index,
+                     layer_output, layer_pressure, layer_speed_of_sound,
+                     layer_state, layer_temperature, layer_viscosity,
+                     layer_workspace)
 from .mesosphere import (density_mesosphere_5, density_mesosphere_6,
                          pressure_mesosphere_5, pressure_mesosphere_6,
                          temperature_mesosphere_5, temperature_mesosphere_6)
+from .scalar import (density_deviation_scalar, density_scalar,
+                     pressure_scalar, speed_of_sound_scalar, state_scalar,
+                     temperature_scalar, viscosity_scalar)
+from .state import AtmosphereState
 from .stratopause import (density_stratopause, pressure_stratopause,
                           temperature_stratopause)
 from .stratosphere import (density_stratosphere_2, density_stratosphere_3,
@@ -27,13 +38,163 @@ from .troposphere import (density_troposphere, pressure_troposphere,
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
-def geometric_altitude(altitude: 'NDArray') -> 'NDArray':
+    from .airspeed import (AirspeedState, airspeed_state,
+                           calibrated_airspeed_from_mach, dynamic_pressure,
+                           impact_pressure, mach_from_calibrated_airspeed,
+                           mach_from_true_airspeed, true_airspeed_from_mach)
+    from .atmosphere import ISA, Atmosphere
+    from .cache import (AtmosphereCache, disable_cache, enable_cache,
+                        get_cache)
+    from .gradient import (AtmosphereGradient, PropertyGradient,
+                           atmosphere_state_and_gradient, density_and_gradient,
+                           pressure_and_gradient, speed_of_sound_and_gradient,
+                           temperature_and_gradient, viscosity_and_gradient)
+    from .gravity import (latitude_geometric, latitude_geopotential,
+                          latitude_gravity, latitude_radius)
+    from .grid import AtmosphereGrid, grid_evaluate
+    from .inverse import (altitude_from_density, altitude_from_density_ratio,
+                          altitude_from_pressure)
+    from .parallel import parallel_evaluate
+    from .profiling import Profile, profile
+    from .service import AsyncAtmosphere
+    from .shared import (SharedBuffer, attach_buffer, buffer_array,
+                         buffer_evaluate, process_evaluate, shared_buffer)
+    from .streaming import stream_atmosphere, stream_chunks, stream_npy
+    from .tabulated import TabulatedAtmosphere
+    from .tracker import AtmosphereTracker
+    from .upper import (disable_upper_atmosphere, enable_upper_atmosphere,
+                        upper_enabled)
+
+# The optional subsystems are imported on first use of their names.
+LAZY_IMPORTS = {
+    'airspeed': ('AirspeedState', 'airspeed_state',
+                 'calibrated_airspeed_from_mach', 'dynamic_pressure',
+                 'impact_pressure', 'mach_from_calibrated_airspeed',
+                 'mach_from_true_airspeed', 'true_airspeed_from_mach'),
+    'atmosphere': ('Atmosphere', 'ISA'),
+    'cache': ('AtmosphereCache', 'disable_cache', 'enable_cache',
+              'get_cache'),
+    'gradient': ('AtmosphereGradient', 'PropertyGradient',
+                 'atmosphere_state_and_gradient', 'density_and_gradient',
+                 'pressure_and_gradient', 'speed_of_sound_and_gradient',
+                 'temperature_and_gradient', 'viscosity_and_gradient'),
+    'gravity': ('latitude_geometric', 'latitude_geopotential',
+                'latitude_gravity', 'latitude_radius'),
+    'grid': ('AtmosphereGrid', 'grid_evaluate'),
+    'inverse': ('altitude_from_density', 'altitude_from_density_ratio',
+                'altitude_from_pressure'),
+    'parallel': ('parallel_evaluate', ),
+    'profiling': ('Profile', 'profile'),
+    'service': ('AsyncAtmosphere', ),
+    'shared': ('SharedBuffer', 'attach_buffer', 'buffer_array',
+               'buffer_evaluate', 'process_evaluate', 'shared_buffer'),
+    'streaming': ('stream_atmosphere', 'stream_chunks', 'stream_npy'),
+    'tabulated': ('TabulatedAtmosphere', ),
+    'tracker': ('AtmosphereTracker', ),
+    'upper': ('disable_upper_atmosphere', 'enable_upper_atmosphere',
+              'upper_enabled'),
+}
+LAZY_NAMES = {name: module for module, names in LAZY_IMPORTS.items()
+              for name in names}
+
+def __getattr__(name: str) -> Any:
+    """
+    This function returns a name of an optional subsystem, importing
+    the subsystem on first use.
+    """
+    if name not in LAZY_NAMES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(f'.{LAZY_NAMES[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    """
+    This function returns the names of the package, including the
+    names of the optional subsystems not yet imported.
+    """
+    return sorted(set(globals()) | set(LAZY_NAMES))
+
+# Python scalars take the math based path in the scalar module.
+SCALAR_TYPES = (float, int)
+# The altitude types accepted by the property functions.
+ALTITUDE_TYPES = ('geopotential', 'geometric')
+
+def geometric_altitude(altitude: 'NDArray', out: 'NDArray | None' = None,
+                       workspace: Workspace | None = None,
+                       latitude: 'NDArray | None' = None) -> 'NDArray':
     """
     This function returns the geometric altitude
-    for the given input geopotential altitude.
+    for the given input geopotential altitude
+    and optional latitude in degrees.
+    """
+    if latitude is not None:
+        from .gravity import latitude_geometric
+        return latitude_geometric(altitude, latitude, out=out)
+    if out is None and isinstance(altitude, SCALAR_TYPES):
+        return R_0*altitude/(R_0 - altitude)
+    altitude = asarray(altitude)
+    shape = altitude.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    out = layer_output(shape, out, layer_dtype(altitude))
+    work = workspace.buffer(workspace.work[0], shape)
+    # The denominator is evaluated first, so out may alias the altitude.
+    subtract(R_0, altitude, out=work)
+    divide(multiply(R_0, altitude, out=out), work, out=out)
+    return out
+
+def geopotential_altitude(altitude: 'NDArray', out: 'NDArray | None' = None,
+                          workspace: Workspace | None = None,
+                          latitude: 'NDArray | None' = None) -> 'NDArray':
+    """
+    This function returns the geopotential altitude
+    for the given input geometric altitude
+    and optional latitude in degrees.
     """
+    if latitude is not None:
+        from .gravity import latitude_geopotential
+        return latitude_geopotential(altitude, latitude, out=out)
+    if out is None and isinstance(altitude, SCALAR_TYPES):
+        return R_0*altitude/(R_0 + altitude)
     altitude = asarray(altitude)
-    return R_0*altitude/(R_0 - altitude)
+    shape = altitude.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    out = layer_output(shape, out, layer_dtype(altitude))
+    work = workspace.buffer(workspace.work[0], shape)
+    # The denominator is evaluated first, so out may alias the altitude.
+    add(R_0, altitude, out=work)
+    divide(multiply(R_0, altitude, out=out), work, out=out)
+    return out
+
+def scalar_altitude(altitude: float, altitude_type: str) -> float:
+    """
+    This function returns the geopotential altitude for a given scalar
+    altitude of the altitude type.
+    """
+    if altitude_type == 'geopotential':
+        return altitude
+    if altitude_type == 'geometric':
+        return R_0*altitude/(R_0 + altitude)
+    raise ValueError(f'The altitude type must be one of {ALTITUDE_TYPES}.')
+
+def workspace_altitude(altitude: 'NDArray', altitude_type: str,
+                       workspace: Workspace) -> 'NDArray':
+    """
+    This function returns the geopotential altitude for a given
+    altitude of the altitude type, converted into the altitude buffer
+    of the workspace.
+    """
+    if altitude_type == 'geopotential':
+        return altitude
+    if altitude_type != 'geometric':
+        raise ValueError(f'The altitude type must be one of '
+                         f'{ALTITUDE_TYPES}.')
+    out = workspace.altitude_buffer(altitude.shape)
+    # h = R_0*z/(R_0 + z) without a temporary.
+    add(altitude, R_0, out=out)
+    divide(altitude, out, out=out)
+    out *= R_0
+    return out
 
 def check_layer(altitude: 'NDArray') -> 'NDArray':
     """
@@ -73,139 +234,269 @@ def filter_layer(altitude: 'NDArray', chks: tuple['NDArray']) -> 'NDArray':
     alt_6 = altitude[chk_6]
     return alt_0, alt_1, alt_2, alt_3, alt_4, alt_5, alt_6
 
-def temperature(altitude: 'NDArray') -> 'NDArray':
+def standard_day(deviation: 'NDArray') -> bool:
     """
-    This function returns the temperature for a given
-    geopotential altitude.
+    This function returns whether a temperature deviation is a scalar
+    zero, so that the standard day formulas apply throughout.
+    """
+    return isinstance(deviation, SCALAR_TYPES) and deviation == 0.0
+
+def deviation_altitude(altitude: 'NDArray', deviation: 'NDArray') -> 'NDArray':
+    """
+    This function returns the altitude array broadcast against
+    the temperature deviation.
     """
     altitude = asarray(altitude)
-    chks = check_layer(altitude)
-    chk_0, chk_1, chk_2, chk_3, chk_4, chk_5, chk_6 = chks
-    alts = filter_layer(altitude, chks)
-    alt_0, alt_1, alt_2, alt_3, alt_4, alt_5, alt_6 = alts
-    temp = full(altitude.shape, float('nan'))
-    temp[chk_0] = temperature_troposphere(alt_0)
-    temp[chk_1] = temperature_tropopause(alt_1)
-    temp[chk_2] = temperature_stratosphere_2(alt_2)
-    temp[chk_3] = temperature_stratosphere_3(alt_3)
-    temp[chk_4] = temperature_stratopause(alt_4)
-    temp[chk_5] = temperature_mesosphere_5(alt_5)
-    temp[chk_6] = temperature_mesosphere_6(alt_6)
+    if not isinstance(deviation, SCALAR_TYPES):
+        shape = broadcast_shapes(altitude.shape, asarray(deviation).shape)
+        if shape != altitude.shape:
+            altitude = broadcast_to(altitude, shape)
+    return altitude
+
+def deviation_temperature(altitude: 'NDArray', deviation: 'NDArray',
+                          out: 'NDArray | None', workspace: Workspace
+                          ) -> 'NDArray':
+    """
+    This function returns the temperature for a given geopotential
+    altitude and temperature deviation, NaN where it is not positive.
+    """
+    out = ACTIVE['backend'].temperature(altitude, out=out,
+                                        workspace=workspace)
+    return apply_deviation(out, deviation, workspace)
+
+def apply_deviation(temp: 'NDArray', deviation: 'NDArray',
+                    workspace: Workspace) -> 'NDArray':
+    """
+    This function adds a temperature deviation to the standard day
+    temperature in place, setting it to NaN where it is not positive.
+    """
+    if not standard_day(deviation):
+        mask = workspace.buffer(workspace.mask, temp.shape)
+        temp += deviation
+        less_equal(temp, 0.0, out=mask)
+        copyto(temp, float('nan'), where=mask)
     return temp
 
-def pressure(altitude: 'NDArray') -> 'NDArray':
+def temperature(altitude: 'NDArray', deviation: 'NDArray' = 0.0,
+                out: 'NDArray | None' = None,
+                workspace: Workspace | None = None,
+                altitude_type: str = 'geopotential') -> 'NDArray':
+    """
+    This function returns the temperature for a given
+    altitude of the altitude type and temperature deviation.
+    """
+    if (out is None and isinstance(altitude, SCALAR_TYPES) and
+            isinstance(deviation, SCALAR_TYPES)):
+        altitude = scalar_altitude(altitude, altitude_type)
+        return temperature_scalar(altitude, deviation)
+    altitude = deviation_altitude(altitude, deviation)
+    workspace = layer_workspace(altitude.shape, workspace,
+                                layer_dtype(altitude))
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    return deviation_temperature(altitude, deviation, out, workspace)
+
+def pressure(altitude: 'NDArray', out: 'NDArray | None' = None,
+             workspace: Workspace | None = None,
+             altitude_type: str = 'geopotential') -> 'NDArray':
     """
     This function returns the pressure for a given
-    geopotential altitude.
+    altitude of the altitude type.
     """
+    if out is None and isinstance(altitude, SCALAR_TYPES):
+        return pressure_scalar(scalar_altitude(altitude, altitude_type))
     altitude = asarray(altitude)
-    chks = check_layer(altitude)
-    chk_0, chk_1, chk_2, chk_3, chk_4, chk_5, chk_6 = chks
-    alts = filter_layer(altitude, chks)
-    alt_0, alt_1, alt_2, alt_3, alt_4, alt_5, alt_6 = alts
-    pres = full(altitude.shape, float('nan'))
-    pres[chk_0] = pressure_troposphere(alt_0)
-    pres[chk_1] = pressure_tropopause(alt_1)
-    pres[chk_2] = pressure_stratosphere_2(alt_2)
-    pres[chk_3] = pressure_stratosphere_3(alt_3)
-    pres[chk_4] = pressure_stratopause(alt_4)
-    pres[chk_5] = pressure_mesosphere_5(alt_5)
-    pres[chk_6] = pressure_mesosphere_6(alt_6)
-    return pres
+    workspace = layer_workspace(altitude.shape, workspace,
+                                layer_dtype(altitude))
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    return ACTIVE['backend'].pressure(altitude, out=out, workspace=workspace)
 
-def density(altitude: 'NDArray', deviation: float = 0.0) -> 'NDArray':
+def density(altitude: 'NDArray', deviation: 'NDArray' = 0.0,
+            out: 'NDArray | None' = None,
+            workspace: Workspace | None = None,
+            altitude_type: str = 'geopotential') -> 'NDArray':
     """
     This function returns the density for a given
-    geopotential altitude.
-    """
-    if deviation == 0.0:
-        altitude = asarray(altitude)
-        chks = check_layer(altitude)
-        chk_0, chk_1, chk_2, chk_3, chk_4, chk_5, chk_6 = chks
-        alts = filter_layer(altitude, chks)
-        alt_0, alt_1, alt_2, alt_3, alt_4, alt_5, alt_6 = alts
-        dens = full(altitude.shape, float('nan'))
-        dens[chk_0] = density_troposphere(alt_0)
-        dens[chk_1] = density_tropopause(alt_1)
-        dens[chk_2] = density_stratosphere_2(alt_2)
-        dens[chk_3] = density_stratosphere_3(alt_3)
-        dens[chk_4] = density_stratopause(alt_4)
-        dens[chk_5] = density_mesosphere_5(alt_5)
-        dens[chk_6] = density_mesosphere_6(alt_6)
-    else:
-        dens = density_deviation(altitude, deviation)
-    return dens
-
-def density_deviation(altitude: 'NDArray', deviation: float) -> 'NDArray':
+    altitude of the altitude type and temperature deviation.
+    """
+    if not standard_day(deviation):
+        return density_deviation(altitude, deviation, out=out,
+                                 workspace=workspace,
+                                 altitude_type=altitude_type)
+    if out is None and isinstance(altitude, SCALAR_TYPES):
+        return density_scalar(scalar_altitude(altitude, altitude_type))
+    altitude = asarray(altitude)
+    workspace = layer_workspace(altitude.shape, workspace,
+                                layer_dtype(altitude))
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    return ACTIVE['backend'].density(altitude, out=out, workspace=workspace)
+
+def density_deviation(altitude: 'NDArray', deviation: 'NDArray',
+                      out: 'NDArray | None' = None,
+                      workspace: Workspace | None = None,
+                      altitude_type: str = 'geopotential') -> 'NDArray':
     """
     This function returns the density for a given
-    geopotential altitude and temperature deviation.
+    altitude of the altitude type and temperature deviation.
     """
-    altitude = asarray(altitude)
-    temp = temperature(altitude) + deviation
-    temp = where(temp > 0.0, temp, float('nan'))
-    pres = pressure(altitude)
+    if (out is None and isinstance(altitude, SCALAR_TYPES) and
+            isinstance(deviation, SCALAR_TYPES)):
+        altitude = scalar_altitude(altitude, altitude_type)
+        return density_deviation_scalar(altitude, deviation)
+    altitude = deviation_altitude(altitude, deviation)
+    shape = altitude.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    temp = workspace.buffer(workspace.work[2], shape)
+    pres = layer_output(shape, out, layer_dtype(altitude))
+    # The temperature and pressure share a single pass over the layers.
+    ACTIVE['backend'].temperature_pressure(altitude, out=(temp, pres),
+                                           workspace=workspace)
+    apply_deviation(temp, deviation, workspace)
     # Calculate the density using the ideal gas law
     # rho = p/(R*T)
-    rho = pres/(R*temp)
-    return rho
+    temp *= R
+    pres /= temp
+    return pres
+
+def atmosphere_state(altitude: 'NDArray', deviation: 'NDArray' = 0.0,
+                     out: AtmosphereState | None = None,
+                     workspace: Workspace | None = None,
+                     altitude_type: str = 'geopotential') -> AtmosphereState:
+    """
+    This function returns the temperature, pressure, density,
+    viscosity and speed of sound for a given altitude of the
+    altitude type and temperature deviation evaluated in a single pass.
+    """
+    if (out is None and isinstance(altitude, SCALAR_TYPES) and
+            isinstance(deviation, SCALAR_TYPES)):
+        altitude = scalar_altitude(altitude, altitude_type)
+        return AtmosphereState(*state_scalar(altitude, deviation))
+    altitude = deviation_altitude(altitude, deviation)
+    shape = altitude.shape
+    dtype = layer_dtype(altitude)
+    workspace = layer_workspace(shape, workspace, dtype)
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    if out is None:
+        out = AtmosphereState(*(layer_output(shape, dtype=dtype)
+                                for _ in AtmosphereState._fields))
+    if standard_day(deviation):
+        return ACTIVE['backend'].state(altitude, out=out, workspace=workspace)
+    temp, pres, dens, visc, sos = out
+    ACTIVE['backend'].temperature_pressure(altitude, out=(temp, pres),
+                                           workspace=workspace)
+    apply_deviation(temp, deviation, workspace)
+    # The pressure is unchanged and the density follows the gas law.
+    multiply(temp, R, out=dens)
+    divide(pres, dens, out=dens)
+    viscosity_temperature(temp, out=visc, workspace=workspace)
+    speed_of_sound_temperature(temp, out=sos)
+    return out
 
-def density_ratio(altitude: 'NDArray') -> 'NDArray':
+def density_ratio(altitude: 'NDArray', deviation: 'NDArray' = 0.0,
+                  out: 'NDArray | None' = None,
+                  workspace: Workspace | None = None,
+                  altitude_type: str = 'geopotential') -> 'NDArray':
     """
     This function returns the density ratio for a given
-    geopotential altitude.
+    altitude of the altitude type and temperature deviation.
     """
-    altitude = asarray(altitude)
-    return density(altitude)/RHO_0
+    if (out is None and isinstance(altitude, SCALAR_TYPES) and
+            isinstance(deviation, SCALAR_TYPES)):
+        altitude = scalar_altitude(altitude, altitude_type)
+        if deviation == 0.0:
+            return density_scalar(altitude)/RHO_0
+        return density_deviation_scalar(altitude, deviation)/RHO_0
+    out = density(altitude, deviation, out=out, workspace=workspace,
+                  altitude_type=altitude_type)
+    out /= RHO_0
+    return out
 
-def speed_of_sound(altitude: 'NDArray') -> 'NDArray':
+def speed_of_sound(altitude: 'NDArray', deviation: 'NDArray' = 0.0,
+                   out: 'NDArray | None' = None,
+                   workspace: Workspace | None = None,
+                   altitude_type: str = 'geopotential') -> 'NDArray':
     """
     This function returns the speed of sound for a given
-    geopotential altitude.
+    altitude of the altitude type and temperature deviation.
     """
-    altitude = asarray(altitude)
-    return speed_of_sound_temperature(temperature(altitude))
+    if (out is None and isinstance(altitude, SCALAR_TYPES) and
+            isinstance(deviation, SCALAR_TYPES)):
+        altitude = scalar_altitude(altitude, altitude_type)
+        return speed_of_sound_scalar(altitude, deviation)
+    temp = temperature(altitude, deviation, out=out, workspace=workspace,
+                       altitude_type=altitude_type)
+    return speed_of_sound_temperature(temp, out=temp)
 
-def viscosity(altitude: 'NDArray') -> 'NDArray':
+def viscosity(altitude: 'NDArray', deviation: 'NDArray' = 0.0,
+              out: 'NDArray | None' = None,
+              workspace: Workspace | None = None,
+              altitude_type: str = 'geopotential') -> 'NDArray':
     """
     This function returns the viscosity for a given
-    geopotential altitude.
+    altitude of the altitude type and temperature deviation.
     """
-    altitude = asarray(altitude)
-    return viscosity_temperature(temperature(altitude))
+    if (out is None and isinstance(altitude, SCALAR_TYPES) and
+            isinstance(deviation, SCALAR_TYPES)):
+        altitude = scalar_altitude(altitude, altitude_type)
+        return viscosity_scalar(altitude, deviation)
+    altitude = deviation_altitude(altitude, deviation)
+    shape = altitude.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    temp = workspace.buffer(workspace.work[2], shape)
+    deviation_temperature(altitude, deviation, temp, workspace)
+    return viscosity_temperature(temp, out=out, workspace=workspace)
 
-def viscosity_temperature(temperature: 'NDArray') -> 'NDArray':
+def viscosity_temperature(temperature: 'NDArray',
+                          out: 'NDArray | None' = None,
+                          workspace: Workspace | None = None) -> 'NDArray':
     """
     This function returns the viscosity given input temperature.
     """
-    temperature = asarray(temperature)
-    return BETA_S*temperature**1.5/(temperature + S)
+    return ACTIVE['backend'].viscosity(temperature, out=out,
+                                       workspace=workspace)
 
-def speed_of_sound_temperature(temperature: 'NDArray') -> 'NDArray':
+def speed_of_sound_temperature(temperature: 'NDArray',
+                               out: 'NDArray | None' = None) -> 'NDArray':
     """
     This function returns the speed of sound given input temperature.
     """
-    temperature = asarray(temperature)
-    return sqrt(GAMMA*R*temperature)
+    return layer_speed_of_sound(temperature, out=out)
 
-def equivalent_airspeed(altitude: 'NDArray', vtas: 'NDArray') -> 'NDArray':
+def equivalent_airspeed(altitude: 'NDArray', vtas: 'NDArray',
+                        deviation: 'NDArray' = 0.0,
+                        out: 'NDArray | None' = None,
+                        workspace: Workspace | None = None,
+                        altitude_type: str = 'geopotential') -> 'NDArray':
     """
     This function returns the equivalent airspeed for a given
-    input altitude and true airspeed.
+    input altitude of the altitude type, true airspeed
+    and temperature deviation.
     """
-    altitude = asarray(altitude)
-    sigma = density_ratio(altitude)
-    vtas = asarray(vtas)
-    veas = vtas*sqrt(sigma)
+    altitude = deviation_altitude(altitude, deviation)
+    shape = altitude.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    sigma = workspace.buffer(workspace.work[3], shape)
+    density_ratio(altitude, deviation, out=sigma, workspace=workspace,
+                  altitude_type=altitude_type)
+    veas = multiply(vtas, sqrt(sigma, out=sigma), out=out)
     return veas
 
-def true_airspeed(altitude: 'NDArray', veas: 'NDArray') -> 'NDArray':
+def true_airspeed(altitude: 'NDArray', veas: 'NDArray',
+                  deviation: 'NDArray' = 0.0,
+                  out: 'NDArray | None' = None,
+                  workspace: Workspace | None = None,
+                  altitude_type: str = 'geopotential') -> 'NDArray':
     """
     This function returns the true airspeed for a given
-    input altitude and equivalent airspeed.
+    input altitude of the altitude type, equivalent airspeed
+    and temperature deviation.
     """
-    altitude = asarray(altitude)
-    sigma = density_ratio(altitude)
-    veas = asarray(veas)
-    vtas = veas/sqrt(sigma)
+    altitude = deviation_altitude(altitude, deviation)
+    shape = altitude.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    sigma = workspace.buffer(workspace.work[3], shape)
+    density_ratio(altitude, deviation, out=sigma, workspace=workspace,
+                  altitude_type=altitude_type)
+    vtas = divide(veas, sqrt(sigma, out=sigma), out=out)
     return vtas
@@ -0,0 +1,323 @@
+"""
+The airspeed module converts between true, equivalent and calibrated
+airspeed and Mach number and returns the dynamic and impact pressures
+for a given altitude and temperature deviation.
+
+The calibrated airspeed is the airspeed that gives the same impact
+pressure at sea level as the Mach number does at altitude. The ratio of
+the total pressure measured by a pitot tube to the static pressure
+follows the isentropic relation
+
+    p_t/p = (1 + (gamma - 1)/2*M^2)^(gamma/(gamma - 1))
+
+for subsonic flow and the Rayleigh pitot relation, the isentropic
+relation behind a normal shock, for supersonic flow. The Rayleigh pitot
+relation is inverted by Newton iteration on M^2. The subsonic relation
+is evaluated on the impact pressure ratio p_t/p - 1 with log1p and
+expm1 so that low airspeeds keep their relative precision.
+
+The Mach number and the airspeed conversions through it depend on the
+pressure alone, and the true airspeed on the temperature and so on the
+temperature deviation as well.
+"""
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from numpy import (abs, asarray, broadcast_shapes, broadcast_to, copyto,
+                   divide, expm1, finfo, greater, log1p, multiply, power,
+                   sqrt)
+
+from .backend import ACTIVE
+from .constants import GAMMA, P_0, RHO_0, T_0, R
+from .layers import Workspace, layer_dtype, layer_output, layer_workspace
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Speed of sound at sea level on the standard day.
+A_0 = (GAMMA*R*T_0)**0.5 # m/s
+# Exponent of the isentropic pressure ratio.
+EXPO = GAMMA/(GAMMA - 1.0)
+# Pitot pressure ratio at Mach 1.
+PITOT_SONIC = ((GAMMA + 1.0)/2.0)**EXPO
+# Coefficients of the Rayleigh pitot relation written as
+# p_t/p = PITOT_RAYLEIGH*M^2/(1 - PITOT_SHOCK/M^2)^(1/(gamma - 1)).
+PITOT_RAYLEIGH = PITOT_SONIC*((GAMMA + 1.0)/(2.0*GAMMA))**(EXPO - 1.0)
+PITOT_SHOCK = (GAMMA - 1.0)/(2.0*GAMMA)
+# Newton iterations for the supersonic inverse, which converges in five.
+PITOT_ITERATIONS = 16
+# Airspeed types accepted by airspeed_state.
+AIRSPEED_TYPES = ('true', 'equivalent', 'calibrated', 'mach')
+
+class AirspeedState(NamedTuple):
+    """
+    This class holds the true, equivalent and calibrated airspeeds,
+    the Mach number and the dynamic and impact pressures.
+    """
+    true_airspeed: 'NDArray'
+    equivalent_airspeed: 'NDArray'
+    calibrated_airspeed: 'NDArray'
+    mach: 'NDArray'
+    dynamic_pressure: 'NDArray'
+    impact_pressure: 'NDArray'
+
+def impact_ratio(mach: 'NDArray',
+                 out: 'NDArray | None' = None) -> 'NDArray':
+    """
+    This function returns the ratio of the impact pressure to the
+    static pressure for a given Mach number.
+    """
+    mach = asarray(mach)
+    out = layer_output(mach.shape, out, layer_dtype(mach))
+    supersonic = greater(mach, 1.0)
+    mach_sup = mach[supersonic]
+    multiply(mach, mach, out=out)
+    out *= (GAMMA - 1.0)/2.0
+    log1p(out, out=out)
+    out *= EXPO
+    expm1(out, out=out)
+    if mach_sup.size > 0:
+        msq = mach_sup*mach_sup
+        ratio = divide(-PITOT_SHOCK, msq)
+        ratio += 1.0
+        power(ratio, 1.0 - EXPO, out=ratio)
+        ratio *= msq
+        ratio *= PITOT_RAYLEIGH
+        ratio -= 1.0
+        out[supersonic] = ratio
+    return out
+
+def impact_mach(ratio: 'NDArray',
+                out: 'NDArray | None' = None) -> 'NDArray':
+    """
+    This function returns the Mach number for a given ratio of the
+    impact pressure to the static pressure.
+    """
+    ratio = asarray(ratio)
+    dtype = layer_dtype(ratio)
+    out = layer_output(ratio.shape, out, dtype)
+    supersonic = greater(ratio, PITOT_SONIC - 1.0)
+    ratio_sup = ratio[supersonic]
+    log1p(ratio, out=out)
+    out /= EXPO
+    expm1(out, out=out)
+    out *= 2.0/(GAMMA - 1.0)
+    sqrt(out, out=out)
+    if ratio_sup.size > 0:
+        # Newton iteration on f(x) = x - c*(1 - a/x)^n with x = M^2,
+        # starting from x = c above the root.
+        coef = (ratio_sup + 1.0)/PITOT_RAYLEIGH
+        msq = coef.copy()
+        tol = 4.0*finfo(dtype).eps
+        for _ in range(PITOT_ITERATIONS):
+            base = 1.0 - PITOT_SHOCK/msq
+            term = coef*power(base, EXPO - 2.0)
+            func = msq - term*base
+            grad = 1.0 - (EXPO - 1.0)*PITOT_SHOCK*term/(msq*msq)
+            step = func/grad
+            msq -= step
+            if not (abs(step) > tol*msq).any():
+                break
+        out[supersonic] = sqrt(msq)
+    return out
+
+def airspeed_altitude(altitude: 'NDArray', airspeed: 'NDArray',
+                      deviation: 'NDArray' = 0.0) -> 'NDArray':
+    """
+    This function returns the altitude array broadcast against the
+    airspeed and the temperature deviation.
+    """
+    altitude = asarray(altitude)
+    shape = broadcast_shapes(altitude.shape, asarray(airspeed).shape,
+                             asarray(deviation).shape)
+    if shape != altitude.shape:
+        altitude = broadcast_to(altitude, shape)
+    return altitude
+
+def mach_from_true_airspeed(altitude: 'NDArray', vtas: 'NDArray',
+                            deviation: 'NDArray' = 0.0,
+                            out: 'NDArray | None' = None,
+                            workspace: Workspace | None = None,
+                            altitude_type: str = 'geopotential'
+                            ) -> 'NDArray':
+    """
+    This function returns the Mach number for a given input altitude
+    of the altitude type, true airspeed and temperature deviation.
+    """
+    from . import speed_of_sound
+    altitude = airspeed_altitude(altitude, vtas, deviation)
+    shape = altitude.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    sound = workspace.buffer(workspace.work[3], shape)
+    speed_of_sound(altitude, deviation, out=sound, workspace=workspace,
+                   altitude_type=altitude_type)
+    return divide(vtas, sound, out=out)
+
+def true_airspeed_from_mach(altitude: 'NDArray', mach: 'NDArray',
+                            deviation: 'NDArray' = 0.0,
+                            out: 'NDArray | None' = None,
+                            workspace: Workspace | None = None,
+                            altitude_type: str = 'geopotential'
+                            ) -> 'NDArray':
+    """
+    This function returns the true airspeed for a given input altitude
+    of the altitude type, Mach number and temperature deviation.
+    """
+    from . import speed_of_sound
+    altitude = airspeed_altitude(altitude, mach, deviation)
+    shape = altitude.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    sound = workspace.buffer(workspace.work[3], shape)
+    speed_of_sound(altitude, deviation, out=sound, workspace=workspace,
+                   altitude_type=altitude_type)
+    return multiply(mach, sound, out=out)
+
+def impact_pressure(altitude: 'NDArray', mach: 'NDArray',
+                    out: 'NDArray | None' = None,
+                    workspace: Workspace | None = None,
+                    altitude_type: str = 'geopotential') -> 'NDArray':
+    """
+    This function returns the impact pressure, the pitot total pressure
+    less the static pressure, for a given input altitude of the altitude
+    type and Mach number.
+    """
+    from . import workspace_altitude
+    altitude = airspeed_altitude(altitude, mach)
+    shape = altitude.shape
+    dtype = layer_dtype(altitude)
+    workspace = layer_workspace(shape, workspace, dtype)
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    pres = workspace.buffer(workspace.work[3], shape)
+    ACTIVE['backend'].pressure(altitude, out=pres, workspace=workspace)
+    out = layer_output(shape, out, dtype)
+    copyto(out, mach)
+    impact_ratio(out, out=out)
+    out *= pres
+    return out
+
+def dynamic_pressure(altitude: 'NDArray', mach: 'NDArray',
+                     out: 'NDArray | None' = None,
+                     workspace: Workspace | None = None,
+                     altitude_type: str = 'geopotential') -> 'NDArray':
+    """
+    This function returns the dynamic pressure for a given
+    input altitude of the altitude type and Mach number.
+    """
+    from . import workspace_altitude
+    altitude = airspeed_altitude(altitude, mach)
+    shape = altitude.shape
+    dtype = layer_dtype(altitude)
+    workspace = layer_workspace(shape, workspace, dtype)
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    out = layer_output(shape, out, dtype)
+    ACTIVE['backend'].pressure(altitude, out=out, workspace=workspace)
+    out *= mach
+    out *= mach
+    out *= GAMMA/2.0
+    return out
+
+def calibrated_airspeed_from_mach(altitude: 'NDArray', mach: 'NDArray',
+                                  out: 'NDArray | None' = None,
+                                  workspace: Workspace | None = None,
+                                  altitude_type: str = 'geopotential'
+                                  ) -> 'NDArray':
+    """
+    This function returns the calibrated airspeed for a given
+    input altitude of the altitude type and Mach number.
+    """
+    out = impact_pressure(altitude, mach, out=out, workspace=workspace,
+                          altitude_type=altitude_type)
+    out /= P_0
+    impact_mach(out, out=out)
+    out *= A_0
+    return out
+
+def mach_from_calibrated_airspeed(altitude: 'NDArray', vcas: 'NDArray',
+                                  out: 'NDArray | None' = None,
+                                  workspace: Workspace | None = None,
+                                  altitude_type: str = 'geopotential'
+                                  ) -> 'NDArray':
+    """
+    This function returns the Mach number for a given
+    input altitude of the altitude type and calibrated airspeed.
+    """
+    from . import workspace_altitude
+    altitude = airspeed_altitude(altitude, vcas)
+    shape = altitude.shape
+    dtype = layer_dtype(altitude)
+    workspace = layer_workspace(shape, workspace, dtype)
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    pres = workspace.buffer(workspace.work[3], shape)
+    ACTIVE['backend'].pressure(altitude, out=pres, workspace=workspace)
+    out = layer_output(shape, out, dtype)
+    divide(vcas, A_0, out=out)
+    impact_ratio(out, out=out)
+    out *= P_0
+    out /= pres
+    return impact_mach(out, out=out)
+
+def airspeed_state(altitude: 'NDArray', airspeed: 'NDArray',
+                   airspeed_type: str = 'true', deviation: 'NDArray' = 0.0,
+                   out: AirspeedState | None = None,
+                   workspace: Workspace | None = None,
+                   altitude_type: str = 'geopotential') -> AirspeedState:
+    """
+    This function returns the true, equivalent and calibrated airspeeds,
+    Mach number and dynamic and impact pressures for a given input
+    altitude of the altitude type, airspeed of the airspeed type and
+    temperature deviation from a single evaluation of the atmosphere.
+    """
+    from . import (apply_deviation, speed_of_sound_temperature,
+                   workspace_altitude)
+    if airspeed_type not in AIRSPEED_TYPES:
+        raise ValueError(f'The airspeed type must be one of {AIRSPEED_TYPES}.')
+    altitude = airspeed_altitude(altitude, airspeed, deviation)
+    shape = altitude.shape
+    dtype = layer_dtype(altitude)
+    workspace = layer_workspace(shape, workspace, dtype)
+    altitude = workspace_altitude(altitude, altitude_type, workspace)
+    if out is None:
+        out = AirspeedState(*(layer_output(shape, dtype=dtype)
+                              for _ in AirspeedState._fields))
+    vtas, veas, vcas, mach, qdyn, qimp = out
+    temp = workspace.buffer(workspace.work[2], shape)
+    pres = workspace.buffer(workspace.work[3], shape)
+    ACTIVE['backend'].temperature_pressure(altitude, out=(temp, pres),
+                                           workspace=workspace)
+    apply_deviation(temp, deviation, workspace)
+    # The speed of sound is held in the dynamic pressure until the end
+    # and the square root of the density ratio in the temperature.
+    sound = speed_of_sound_temperature(temp, out=qdyn)
+    temp *= R*RHO_0
+    divide(pres, temp, out=temp)
+    sqrt(temp, out=temp)
+    if airspeed_type == 'true':
+        copyto(vtas, airspeed)
+        divide(vtas, sound, out=mach)
+    elif airspeed_type == 'equivalent':
+        copyto(veas, airspeed)
+        divide(veas, temp, out=vtas)
+        divide(vtas, sound, out=mach)
+    elif airspeed_type == 'mach':
+        copyto(mach, airspeed)
+        multiply(mach, sound, out=vtas)
+    else:
+        copyto(vcas, airspeed)
+        divide(vcas, A_0, out=qimp)
+        impact_ratio(qimp, out=qimp)
+        qimp *= P_0
+        divide(qimp, pres, out=mach)
+        impact_mach(mach, out=mach)
+        multiply(mach, sound, out=vtas)
+    if airspeed_type != 'equivalent':
+        multiply(vtas, temp, out=veas)
+    if airspeed_type != 'calibrated':
+        impact_ratio(mach, out=qimp)
+        qimp *= pres
+        divide(qimp, P_0, out=vcas)
+        impact_mach(vcas, out=vcas)
+        vcas *= A_0
+    multiply(mach, mach, out=qdyn)
+    qdyn *= pres
+    qdyn *= GAMMA/2.0
+    return out
@@ -0,0 +1,204 @@
+"""
+The atmosphere module holds the Atmosphere class, a model of layers of
+constant temperature lapse rate in hydrostatic equilibrium given by a
+compact table of the layer breaks and lapse rates, such as the standard
+atmosphere, model hot and cold days or the atmosphere of another planet.
+
+The base temperature, pressure and density of each layer are derived
+from those at the reference altitude of the first layer, in the same
+operations as the layer modules of the standard atmosphere, and held in
+the coefficient tables of the layers module, cast once to each working
+dtype. An atmosphere is then evaluated through the same layer dispatch
+as the public functions and at the same speed.
+
+ISA is the instance of the standard atmosphere. Its derived tables are
+those of the layers module, which the public functions evaluate.
+"""
+
+from typing import TYPE_CHECKING
+
+from numpy import (add, array, asarray, dtype, exp, float64, inf, multiply,
+                   nan, nextafter, power, sqrt)
+
+from .constants import (BETA_S, G_0, GAMMA, H_0, H_1, H_2, H_3, H_4, H_5, H_6,
+                        H_7, P_0, RHO_0, T_0, S, R)
+from .layers import (LAYER_TABLES, LayerTables, Workspace, cast_tables,
+                     layer_density, layer_dtype, layer_index, layer_output,
+                     layer_pressure, layer_state, layer_temperature,
+                     layer_workspace)
+from .mesosphere import L_5, L_6
+from .state import AtmosphereState
+from .stratosphere import L_2, L_3
+from .troposphere import L_0
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike, NDArray
+
+# The dtype the tables of an atmosphere are derived in.
+FLOAT64 = dtype(float64)
+
+def atmosphere_tables(breaks: tuple[float, ...],
+                      lapse_rates: tuple[float, ...], temperature_0: float,
+                      pressure_0: float, density_0: float,
+                      base_altitude: float, gas_constant: float,
+                      gravity: float) -> LayerTables:
+    """
+    This function returns the float64 layer tables of the layers between
+    the breaks with the given lapse rates and base state of the first
+    layer at the base altitude.
+    """
+    bases = [(base_altitude, temperature_0, pressure_0, density_0)]
+    lambdas, deltas = [], []
+    for lapse, top in zip(lapse_rates, breaks[1:]):
+        alt, temp, pres, dens = bases[-1]
+        if lapse == 0.0:
+            delta = -gravity/(gas_constant*temp)
+            decay = float(exp(delta*(top - alt)))
+            bases.append((top, temp, pres*decay, dens*decay))
+            lambdas.append(0.0)
+            deltas.append(delta)
+        else:
+            lam = -gravity/(lapse*gas_constant)
+            top_temp = temp + lapse*(top - alt)
+            theta = top_temp/temp
+            bases.append((top, top_temp, pres*theta**lam,
+                          dens*theta**(lam - 1.0)))
+            lambdas.append(lam)
+            deltas.append(0.0)
+    # The base state at the top break only bounds the last layer.
+    h, t, p, rho = ([nan, *values, nan] for values in zip(*bases[:-1]))
+    l = array([nan, *lapse_rates, nan])
+    lambda_p = array([nan, *lambdas, nan])
+    lambda_rho = array([nan, *(lam - 1.0 if lam else 0.0 for lam in lambdas),
+                        nan])
+    return LayerTables(array([nextafter(breaks[0], -inf), *breaks[1:]]),
+                       array(h), array(t), array(p), array(rho), l,
+                       l/array(t), lambda_p, lambda_rho,
+                       array([nan, *deltas, nan]))
+
+class Atmosphere():
+    """
+    This class holds an atmosphere of layers of constant temperature
+    lapse rate between the layer breaks, from the bottom of the first
+    layer to the top of the last, with its gas properties.
+    """
+    __slots__ = ('name', 'breaks', 'lapse_rates', 'base_altitude',
+                 'gas_constant', 'gravity', 'gamma', 'beta_s', 'sutherland',
+                 'tables')
+
+    def __init__(self, breaks: tuple[float, ...],
+                 lapse_rates: tuple[float, ...], temperature_0: float = T_0,
+                 pressure_0: float = P_0, density_0: float | None = None,
+                 base_altitude: float = 0.0, gas_constant: float = R,
+                 gravity: float = G_0, gamma: float = GAMMA,
+                 beta_s: float = BETA_S, sutherland: float = S,
+                 name: str = 'custom') -> None:
+        self.breaks = tuple(float(brk) for brk in breaks)
+        self.lapse_rates = tuple(float(lapse) for lapse in lapse_rates)
+        if len(self.breaks) != len(self.lapse_rates) + 1:
+            raise ValueError('There must be one more break than lapse rate.')
+        if any(lower >= upper for lower, upper
+               in zip(self.breaks[:-1], self.breaks[1:])):
+            raise ValueError('The breaks must be increasing.')
+        if not self.breaks[0] <= base_altitude <= self.breaks[1]:
+            raise ValueError('The base altitude must be in the first layer.')
+        if density_0 is None:
+            density_0 = pressure_0/(gas_constant*temperature_0)
+        self.name = name
+        self.base_altitude = float(base_altitude)
+        self.gas_constant = gas_constant
+        self.gravity = gravity
+        self.gamma = gamma
+        self.beta_s = beta_s
+        self.sutherland = sutherland
+        tables = atmosphere_tables(self.breaks, self.lapse_rates,
+                                   temperature_0, pressure_0, density_0,
+                                   self.base_altitude, gas_constant, gravity)
+        # The tables of the other dtypes are cast on first use.
+        self.tables = {FLOAT64: tables}
+
+    def layer_tables(self, dtype: 'DTypeLike') -> LayerTables:
+        """
+        This function returns the layer tables cast to the given dtype.
+        """
+        if dtype not in self.tables:
+            self.tables[dtype] = cast_tables(dtype, self.tables[FLOAT64])
+        return self.tables[dtype]
+
+    def evaluate(self, altitude: 'NDArray', workspace: Workspace | None
+                 ) -> tuple['NDArray', Workspace, LayerTables, 'NDArray']:
+        """
+        This function returns the altitude array, workspace, tables and
+        layer ids for a given altitude.
+        """
+        altitude = asarray(altitude)
+        dtype = layer_dtype(altitude)
+        workspace = layer_workspace(altitude.shape, workspace, dtype)
+        tables = self.layer_tables(dtype)
+        index = layer_index(altitude, workspace=workspace, tables=tables)
+        return altitude, workspace, tables, index
+
+    def temperature(self, altitude: 'NDArray', out: 'NDArray | None' = None,
+                    workspace: Workspace | None = None) -> 'NDArray':
+        """
+        This function returns the temperature for a given altitude.
+        """
+        altitude, workspace, tables, index = self.evaluate(altitude,
+                                                           workspace)
+        return layer_temperature(altitude, index, out=out,
+                                 workspace=workspace, tables=tables)
+
+    def pressure(self, altitude: 'NDArray', out: 'NDArray | None' = None,
+                 workspace: Workspace | None = None) -> 'NDArray':
+        """
+        This function returns the pressure for a given altitude.
+        """
+        altitude, workspace, tables, index = self.evaluate(altitude,
+                                                           workspace)
+        return layer_pressure(altitude, index, out=out,
+                              workspace=workspace, tables=tables)
+
+    def density(self, altitude: 'NDArray', out: 'NDArray | None' = None,
+                workspace: Workspace | None = None) -> 'NDArray':
+        """
+        This function returns the density for a given altitude.
+        """
+        altitude, workspace, tables, index = self.evaluate(altitude,
+                                                           workspace)
+        return layer_density(altitude, index, out=out,
+                             workspace=workspace, tables=tables)
+
+    def state(self, altitude: 'NDArray', out: AtmosphereState | None = None,
+              workspace: Workspace | None = None) -> AtmosphereState:
+        """
+        This function returns the temperature, pressure, density,
+        viscosity and speed of sound for a given altitude.
+        """
+        altitude, workspace, tables, index = self.evaluate(altitude,
+                                                           workspace)
+        if out is None:
+            out = AtmosphereState(*(layer_output(altitude.shape,
+                                                 dtype=layer_dtype(altitude))
+                                    for _ in AtmosphereState._fields))
+        temp, _, _, visc, sos = out
+        layer_state(altitude, index, out=out[:3], workspace=workspace,
+                    tables=tables)
+        work = workspace.buffer(workspace.work[0], altitude.shape)
+        # mu = beta_s*T**1.5/(T + S)
+        power(temp, 1.5, out=visc)
+        visc *= self.beta_s
+        visc /= add(temp, self.sutherland, out=work)
+        # a = sqrt(gamma*R*T)
+        multiply(temp, self.gamma*self.gas_constant, out=sos)
+        sqrt(sos, out=sos)
+        return out
+
+    def __repr__(self) -> str:
+        return (f'Atmosphere(name={self.name!r}, '
+                f'layers={len(self.lapse_rates):d})')
+
+# The standard atmosphere, which shares the tables of the layers module.
+ISA = Atmosphere((H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7),
+                 (L_0, 0.0, L_2, L_3, 0.0, L_5, L_6),
+                 density_0=RHO_0, name='ISA')
+ISA.tables = LAYER_TABLES
@@ -0,0 +1,195 @@
+"""
+The backend module selects the engine that evaluates the layers of
+altitude arrays for the public functions.
+
+The numpy backend is the layers module and is always available. The
+numba and numba_parallel backends evaluate every altitude in a single
+compiled loop with the kernels module, the latter spread over all
+cores, and are only used when numba is installed. Selecting a numba
+backend without numba quietly keeps the numpy backend.
+
+The backend is selected at import time from the PYSTDATM_BACKEND
+environment variable and afterwards with set_backend.
+
+Optional features, such as the cache and the upper atmosphere, wrap the
+selected backend. The wrappers are held in order and the active backend
+is rebuilt from the selected backend whenever one is added or removed,
+so that they can be enabled and disabled in any order. Selecting a
+backend with set_backend removes the wrappers.
+"""
+
+from os import environ
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from .layers import (Workspace, layer_density, layer_index, layer_pressure,
+                     layer_speed_of_sound, layer_state, layer_temperature,
+                     layer_viscosity)
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .state import AtmosphereState
+
+# The names of the backends that can be selected.
+BACKENDS = ('numpy', 'numba', 'numba_parallel')
+
+class Backend(NamedTuple):
+    """
+    This class holds the layer evaluation functions of a backend, each
+    taking an altitude array, or a temperature array for the viscosity,
+    an output and a workspace.
+    """
+    name: str
+    temperature: Callable[..., 'NDArray']
+    pressure: Callable[..., 'NDArray']
+    density: Callable[..., 'NDArray']
+    temperature_pressure: Callable[..., tuple['NDArray', 'NDArray']]
+    viscosity: Callable[..., 'NDArray']
+    state: Callable[..., 'AtmosphereState']
+
+def numpy_temperature(altitude: 'NDArray', out: 'NDArray',
+                      workspace: Workspace) -> 'NDArray':
+    """
+    This function returns the temperature for a given
+    geopotential altitude using the layers module.
+    """
+    index = layer_index(altitude, workspace=workspace)
+    return layer_temperature(altitude, index, out=out, workspace=workspace)
+
+def numpy_pressure(altitude: 'NDArray', out: 'NDArray',
+                   workspace: Workspace) -> 'NDArray':
+    """
+    This function returns the pressure for a given
+    geopotential altitude using the layers module.
+    """
+    index = layer_index(altitude, workspace=workspace)
+    return layer_pressure(altitude, index, out=out, workspace=workspace)
+
+def numpy_density(altitude: 'NDArray', out: 'NDArray',
+                  workspace: Workspace) -> 'NDArray':
+    """
+    This function returns the density for a given
+    geopotential altitude using the layers module.
+    """
+    index = layer_index(altitude, workspace=workspace)
+    return layer_density(altitude, index, out=out, workspace=workspace)
+
+def numpy_temperature_pressure(altitude: 'NDArray',
+                               out: tuple['NDArray', 'NDArray'],
+                               workspace: Workspace
+                               ) -> tuple['NDArray', 'NDArray']:
+    """
+    This function returns the temperature and pressure for a given
+    geopotential altitude sharing the layer ids using the layers module.
+    """
+    index = layer_index(altitude, workspace=workspace)
+    temp = layer_temperature(altitude, index, out=out[0], workspace=workspace)
+    pres = layer_pressure(altitude, index, out=out[1], workspace=workspace)
+    return temp, pres
+
+def numpy_state(altitude: 'NDArray', out: 'AtmosphereState',
+                workspace: Workspace) -> 'AtmosphereState':
+    """
+    This function returns all the properties for a given
+    geopotential altitude using the layers module.
+    """
+    index = layer_index(altitude, workspace=workspace)
+    temp, _, _ = layer_state(altitude, index, out=out[:3],
+                             workspace=workspace)
+    layer_viscosity(temp, out=out[3], workspace=workspace)
+    layer_speed_of_sound(temp, out=out[4])
+    return out
+
+NUMPY_BACKEND = Backend('numpy', numpy_temperature, numpy_pressure,
+                        numpy_density, numpy_temperature_pressure,
+                        layer_viscosity, numpy_state)
+
+# The active backend, the selected backend it is built from, the
+# wrappers applied over it in order and the backends they built, the
+# numba backends are built on first selection.
+ACTIVE: dict[str, Any] = {'backend': NUMPY_BACKEND, 'selected': NUMPY_BACKEND,
+                          'wrappers': {}, 'built': {}}
+
+def rebuild_backend() -> Backend:
+    """
+    This function rebuilds the active backend by applying the wrappers in
+    order over the selected backend and returns it.
+    """
+    backend = ACTIVE['selected']
+    built = {}
+    for name, wrapper in ACTIVE['wrappers'].items():
+        # A wrapper over an unchanged backend keeps the backend it built,
+        # so that adding a wrapper above it does not reset its state.
+        previous = ACTIVE['built'].get(name)
+        if (previous is None or previous[0] is not wrapper
+                or previous[1] is not backend):
+            previous = (wrapper, backend, wrapper(backend))
+        built[name] = previous
+        backend = previous[2]
+    ACTIVE['built'] = built
+    ACTIVE['backend'] = backend
+    return backend
+
+def add_wrapper(name: str, wrapper: Callable[[Backend], Backend]
+                ) -> Backend:
+    """
+    This function applies a named wrapper over the wrappers in use, in
+    place of any wrapper of the same name, and returns the new active
+    backend.
+    """
+    ACTIVE['wrappers'].pop(name, None)
+    ACTIVE['wrappers'][name] = wrapper
+    return rebuild_backend()
+
+def remove_wrapper(name: str) -> Backend:
+    """
+    This function removes a named wrapper wherever it is applied and
+    returns the new active backend.
+    """
+    if ACTIVE['wrappers'].pop(name, None) is not None:
+        rebuild_backend()
+    return ACTIVE['backend']
+
+def has_wrapper(name: str) -> bool:
+    """
+    This function returns whether a named wrapper is applied.
+    """
+    return name in ACTIVE['wrappers']
+
+def available_backends() -> tuple[str, ...]:
+    """
+    This function returns the names of the backends that can be used.
+    """
+    from importlib.util import find_spec
+    if find_spec('numba') is None:
+        return BACKENDS[:1]
+    return BACKENDS
+
+def set_backend(name: str) -> str:
+    """
+    This function selects the backend used by the public functions and
+    returns the name of the backend in use, which is numpy when the
+    requested backend is not available.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f'The backend must be one of {BACKENDS}.')
+    if name not in available_backends():
+        name = 'numpy'
+    if name == 'numpy':
+        ACTIVE['selected'] = NUMPY_BACKEND
+    else:
+        from .kernels import numba_backend
+        ACTIVE['selected'] = numba_backend(name == 'numba_parallel')
+    ACTIVE['wrappers'].clear()
+    rebuild_backend()
+    return name
+
+def get_backend() -> str:
+    """
+    This function returns the name of the backend in use.
+    """
+    return ACTIVE['backend'].name
+
+# The numpy backend is active until another is selected.
+if 'PYSTDATM_BACKEND' in environ:
+    set_backend(environ['PYSTDATM_BACKEND'])
@@ -0,0 +1,122 @@
+"""
+The benchmark module times the public functions on scalar and array
+inputs of several sizes and altitude distributions, and compares the
+timings against a stored baseline to detect slowdowns.
+
+The mixed distribution draws altitudes over all layers in random order,
+the worst case for the layer evaluation, and the single distribution
+draws them within the troposphere only. Each timing is the best time
+per call over a number of repeats, stored in a JSON file with the
+versions it was measured with.
+"""
+
+from importlib import import_module
+from json import dump, load
+from platform import python_version
+from timeit import Timer
+from typing import Any, Callable
+
+from numpy import __version__ as numpy_version
+from numpy import full
+from numpy.random import default_rng
+
+from .backend import get_backend
+from .constants import H_0, H_1, H_7
+
+# Input sizes benchmarked, None is a Python float.
+SIZES = (None, 10, 10_000, 10_000_000)
+# Altitude distributions benchmarked.
+DISTRIBUTIONS = ('mixed', 'single')
+# Public functions benchmarked.
+FUNCTIONS = ('temperature', 'pressure', 'density', 'density_deviation',
+             'viscosity', 'speed_of_sound', 'equivalent_airspeed',
+             'true_airspeed')
+# Slowdown ratio against the baseline above which a timing fails.
+THRESHOLD = 1.25
+
+def benchmark_altitude(size: int | None, distribution: str) -> Any:
+    """
+    This function returns the altitudes for a given size and
+    distribution, a single altitude for a size of None.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f'The distribution must be one of {DISTRIBUTIONS}.')
+    upper = H_7 if distribution == 'mixed' else H_1
+    rng = default_rng(0)
+    if size is None:
+        return float(rng.uniform(H_0, upper))
+    return rng.uniform(H_0, upper, size)
+
+def benchmark_call(name: str, altitude: Any) -> Callable[[], Any]:
+    """
+    This function returns a call of the named public function
+    on the given altitudes.
+    """
+    func = getattr(import_module(__package__), name)
+    if name == 'density_deviation':
+        return lambda: func(altitude, 10.0)
+    if name in ('equivalent_airspeed', 'true_airspeed'):
+        if isinstance(altitude, float):
+            speed = 100.0
+        else:
+            speed = full(altitude.size, 100.0)
+        return lambda: func(altitude, speed)
+    return lambda: func(altitude)
+
+def benchmark_key(name: str, distribution: str, size: int | None) -> str:
+    """
+    This function returns the key of a timing in the results.
+    """
+    return f"{name}/{distribution}/{'scalar' if size is None else size}"
+
+def run_benchmarks(functions: tuple[str, ...] = FUNCTIONS,
+                   sizes: tuple[int | None, ...] = SIZES,
+                   distributions: tuple[str, ...] = DISTRIBUTIONS,
+                   repeat: int = 5,
+                   number: int | None = None) -> dict[str, Any]:
+    """
+    This function returns the best time per call in seconds of each
+    function, distribution and size together with the versions used.
+    The calls per repeat are chosen to take at least 0.2 s unless a
+    number is given.
+    """
+    timings = {}
+    for distribution in distributions:
+        for size in sizes:
+            altitude = benchmark_altitude(size, distribution)
+            for name in functions:
+                timer = Timer(benchmark_call(name, altitude))
+                calls = number or timer.autorange()[0]
+                best = min(timer.repeat(repeat=repeat, number=calls))
+                timings[benchmark_key(name, distribution, size)] = best/calls
+    metadata = {'python': python_version(), 'numpy': numpy_version,
+                'backend': get_backend()}
+    return {'metadata': metadata, 'timings': timings}
+
+def save_benchmarks(results: dict[str, Any], path: str) -> None:
+    """
+    This function saves benchmark results to a JSON file.
+    """
+    with open(path, 'w') as file:
+        dump(results, file, indent=2)
+
+def load_benchmarks(path: str) -> dict[str, Any]:
+    """
+    This function loads benchmark results from a JSON file.
+    """
+    with open(path) as file:
+        return load(file)
+
+def compare_benchmarks(results: dict[str, Any], baseline: dict[str, Any],
+                       threshold: float = THRESHOLD) -> dict[str, float]:
+    """
+    This function returns the slowdown ratio against the baseline of
+    every timing in both that is slower than the threshold allows.
+    """
+    regressions = {}
+    for key, value in results['timings'].items():
+        if key in baseline['timings']:
+            ratio = value/baseline['timings'][key]
+            if ratio > threshold:
+                regressions[key] = ratio
+    return regressions
@@ -0,0 +1,213 @@
+"""
+The cache module provides an opt-in cache of the atmosphere state of
+altitude arrays that are evaluated repeatedly, such as fixed grids in
+an optimisation loop.
+
+While the cache is enabled the public functions evaluate the layers
+through a backend that looks up the altitude array by a hash of its
+contents, dtype and shape. On a miss the full state is evaluated once
+and stored, so that temperature, pressure, density, atmosphere_state
+and the functions built on them, such as speed_of_sound, density_ratio
+and density_deviation for any deviation, are all served from the same
+entry. Entries are evicted least recently used first to keep the stored
+arrays within a byte budget.
+
+Results are copied out of the cache, so they may be modified freely.
+The cache wraps the backend in use whatever other features are enabled,
+and is cleared when the backend below it changes. Disabling the cache
+removes its wrapper, and selecting a backend with set_backend replaces
+the cache.
+"""
+
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable
+
+from numpy import ascontiguousarray, copyto
+
+from .backend import Backend, add_wrapper, has_wrapper, remove_wrapper
+from .layers import layer_dtype, layer_output
+from .state import AtmosphereState
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .layers import Workspace
+
+# Default byte budget of the cached arrays.
+MAX_BYTES = 256*1024**2
+
+class AtmosphereCache():
+    """
+    This class holds the cached atmosphere states of altitude arrays
+    within a byte budget together with the hit and miss counts.
+    """
+    max_bytes: int
+    entries: 'OrderedDict[tuple, AtmosphereState]'
+    nbytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, max_bytes: int = MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError('The byte budget must not be negative.')
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+
+    def key(self, altitude: 'NDArray') -> tuple:
+        """
+        This function returns the cache key of an altitude array.
+        """
+        data = ascontiguousarray(altitude).reshape(-1)
+        digest = sha1(memoryview(data).cast('B'),
+                      usedforsecurity=False).digest()
+        return digest, altitude.dtype.str, altitude.shape
+
+    def lookup(self, altitude: 'NDArray', backend: Backend,
+               workspace: 'Workspace | None' = None) -> AtmosphereState:
+        """
+        This function returns the cached state of an altitude array,
+        evaluating it with the backend and storing it on a miss.
+        """
+        key = self.key(altitude)
+        with self.lock:
+            state = self.entries.get(key)
+            if state is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return state
+            self.misses += 1
+        dtype = layer_dtype(altitude)
+        state = AtmosphereState(*(layer_output(altitude.shape, dtype=dtype)
+                                  for _ in AtmosphereState._fields))
+        backend.state(altitude, out=state, workspace=workspace)
+        for value in state:
+            value.flags.writeable = False
+        self.store(key, state)
+        return state
+
+    def store(self, key: tuple, state: AtmosphereState) -> None:
+        """
+        This function stores a state, evicting the least recently used
+        states until the cached arrays fit within the byte budget.
+        """
+        nbytes = sum(value.nbytes for value in state)
+        if nbytes > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            while self.nbytes + nbytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= sum(value.nbytes for value in evicted)
+                self.evictions += 1
+            self.entries[key] = state
+            self.nbytes += nbytes
+
+    def clear(self) -> None:
+        """
+        This function removes all the cached states.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        This function returns the hit, miss and eviction counts and the
+        number and size of the cached states.
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self.entries), 'bytes': self.nbytes}
+
+    def __repr__(self) -> str:
+        return (f'AtmosphereCache(max_bytes={self.max_bytes:d}, '
+                f'entries={len(self.entries):d})')
+
+def cache_backend(backend: Backend, cache: AtmosphereCache) -> Backend:
+    """
+    This function returns a backend that serves the layer evaluations
+    of the given backend from a cache.
+    """
+    def field(index: int) -> Any:
+        def evaluate(altitude: 'NDArray', out: 'NDArray | None' = None,
+                     workspace: 'Workspace | None' = None) -> 'NDArray':
+            state = cache.lookup(altitude, backend, workspace)
+            out = layer_output(altitude.shape, out, state[index].dtype)
+            copyto(out, state[index])
+            return out
+        return evaluate
+
+    def temperature_pressure(altitude: 'NDArray',
+                             out: tuple['NDArray', 'NDArray'] | None = None,
+                             workspace: 'Workspace | None' = None
+                             ) -> tuple['NDArray', 'NDArray']:
+        # A single lookup serves both fields.
+        cached = cache.lookup(altitude, backend, workspace)
+        if out is None:
+            return cached[0].copy(), cached[1].copy()
+        for value, target in zip(cached[:2], out):
+            copyto(target, value)
+        return tuple(out)
+
+    def state(altitude: 'NDArray', out: AtmosphereState | None = None,
+              workspace: 'Workspace | None' = None) -> AtmosphereState:
+        cached = cache.lookup(altitude, backend, workspace)
+        if out is None:
+            return AtmosphereState(*(value.copy() for value in cached))
+        for value, target in zip(cached, out):
+            copyto(target, value)
+        return out
+
+    return Backend(backend.name, field(0), field(1), field(2),
+                   temperature_pressure, backend.viscosity, state)
+
+# The cache in use and the backend it was last applied over.
+CACHE: dict[str, Any] = {'cache': None, 'backend': None}
+
+def cache_wrapper(cache: AtmosphereCache) -> Callable[[Backend], Backend]:
+    """
+    This function returns the backend wrapper serving the given cache.
+    """
+    def wrapper(backend: Backend) -> Backend:
+        # The cached states are those of the backend it was applied over.
+        if backend is not CACHE['backend']:
+            cache.clear()
+            CACHE['backend'] = backend
+        return cache_backend(backend, cache)
+    return wrapper
+
+def enable_cache(max_bytes: int = MAX_BYTES) -> AtmosphereCache:
+    """
+    This function enables a new cache with the given byte budget for
+    the public functions and returns it.
+    """
+    disable_cache()
+    cache = AtmosphereCache(max_bytes)
+    CACHE['cache'] = cache
+    add_wrapper('cache', cache_wrapper(cache))
+    return cache
+
+def disable_cache() -> None:
+    """
+    This function disables the cache of the public functions.
+    """
+    remove_wrapper('cache')
+    CACHE.update(cache=None, backend=None)
+
+def get_cache() -> AtmosphereCache | None:
+    """
+    This function returns the cache in use or None when disabled.
+    """
+    if not has_wrapper('cache'):
+        return None
+    return CACHE['cache']
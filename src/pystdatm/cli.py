@@ -0,0 +1,269 @@
+"""
+The cli module holds the pystdatm console command, which writes dense
+tables of the atmosphere properties over altitude ranges and
+temperature deviations.
+
+The rows run over the altitudes of each range in turn, and over the
+deviations for each altitude. The table is evaluated and written in
+chunks of altitudes through reused buffers, so the memory used depends
+on the chunk size and not on the size of the table. The altitudes are
+computed as start + step*i for the row i of each range, so the values
+do not depend on the chunk size and the same arguments always write
+the same table.
+
+The .npy output is a directory of one memory-mappable .npy file per
+column with a metadata.json file of the arguments. The CSV output is a
+single file with a header row and the values written to the given
+number of significant digits. The Parquet output requires pyarrow and
+writes each chunk as a row group.
+"""
+
+from argparse import ArgumentParser, Namespace
+from importlib.util import find_spec
+from json import dump
+from math import floor
+from pathlib import Path
+from platform import python_version
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+
+from numpy import __version__ as numpy_version
+from numpy import arange, empty, float32, float64
+
+from .backend import get_backend
+from .layers import Workspace
+from .parallel import CHUNK_SIZE
+from .streaming import ALTITUDE_COLUMNS
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike, NDArray
+
+# Output formats and the dtypes tables are evaluated in.
+FORMATS = ('npy', 'csv', 'parquet')
+DTYPES = {'float64': float64, 'float32': float32}
+# Columns of the table that are not properties.
+INDEX_COLUMNS = ('altitude', 'deviation')
+
+def range_size(start: float, stop: float, step: float) -> int:
+    """
+    This function returns the number of altitudes in a range, including
+    the stop altitude when it falls on a step.
+    """
+    if step <= 0.0:
+        raise ValueError('The altitude step must be positive.')
+    if stop < start:
+        raise ValueError('The altitude stop must not be below the start.')
+    # The tolerance keeps a stop a rounding error short of a step.
+    return floor((stop - start)/step*(1.0 + 1e-12)) + 1
+
+def table_altitudes(ranges: Sequence[tuple[float, float, float]],
+                    chunk_size: int = CHUNK_SIZE,
+                    dtype: 'DTypeLike' = float64) -> Iterator['NDArray']:
+    """
+    This function yields the altitudes of the ranges in chunks of no
+    more than chunk_size altitudes.
+    """
+    if chunk_size < 1:
+        raise ValueError('The chunk size must be positive.')
+    for start, stop, step in ranges:
+        size = range_size(start, stop, step)
+        for first in range(0, size, chunk_size):
+            index = arange(first, min(first + chunk_size, size))
+            altitude = index*step
+            altitude += start
+            yield altitude.astype(dtype, copy=False)
+
+def table_size(ranges: Sequence[tuple[float, float, float]],
+               deviations: Sequence[float]) -> int:
+    """
+    This function returns the number of rows of a table.
+    """
+    return sum(range_size(*rng) for rng in ranges)*len(deviations)
+
+def table_chunks(ranges: Sequence[tuple[float, float, float]],
+                 deviations: Sequence[float] = (0.0, ),
+                 columns: Sequence[str] = ALTITUDE_COLUMNS,
+                 altitude_type: str = 'geopotential',
+                 chunk_size: int = CHUNK_SIZE,
+                 dtype: 'DTypeLike' = float64
+                 ) -> Iterator[dict[str, 'NDArray']]:
+    """
+    This function yields the columns of a table in chunks of rows. The
+    columns yielded for a chunk are overwritten by the next chunk.
+    """
+    from . import (density, density_ratio, pressure, speed_of_sound,
+                   temperature, viscosity)
+    functions = {'temperature': temperature, 'density': density,
+                 'density_ratio': density_ratio, 'viscosity': viscosity,
+                 'speed_of_sound': speed_of_sound}
+    for column in columns:
+        if column not in ALTITUDE_COLUMNS:
+            raise ValueError(f'The column {column} is not one of '
+                             f'{ALTITUDE_COLUMNS}.')
+    num_dev = len(deviations)
+    rows = chunk_size*num_dev
+    workspace = Workspace(rows, dtype)
+    buffers = {column: empty(rows, dtype=dtype)
+               for column in INDEX_COLUMNS + tuple(columns)}
+    pattern = empty(rows, dtype=dtype)
+    pattern.reshape(-1, num_dev)[:] = deviations
+    for altitude in table_altitudes(ranges, chunk_size, dtype):
+        shape = (altitude.size*num_dev, )
+        result = {column: workspace.buffer(buffers[column], shape)
+                  for column in buffers}
+        alt = result['altitude']
+        alt.reshape(-1, num_dev)[:] = altitude[:, None]
+        dev = result['deviation']
+        dev[:] = pattern[:shape[0]]
+        # A single deviation keeps the scalar deviation paths.
+        deviation = float(deviations[0]) if num_dev == 1 else dev
+        for column in columns:
+            out = result[column]
+            if column == 'pressure':
+                pressure(alt, out=out, workspace=workspace,
+                         altitude_type=altitude_type)
+            else:
+                functions[column](alt, deviation, out=out,
+                                  workspace=workspace,
+                                  altitude_type=altitude_type)
+        yield result
+
+def write_npy(path: str, chunks: Iterator[dict[str, 'NDArray']],
+              size: int, dtype: 'DTypeLike',
+              metadata: dict[str, Any]) -> None:
+    """
+    This function writes the chunks of a table to a directory of one
+    .npy file per column and a metadata.json file.
+    """
+    from numpy.lib.format import open_memmap
+    folder = Path(path)
+    folder.mkdir(parents=True, exist_ok=True)
+    with open(folder / 'metadata.json', 'w') as file:
+        dump(metadata, file, indent=2)
+    outs = {}
+    start = 0
+    for result in chunks:
+        if not outs:
+            outs = {column: open_memmap(folder / f'{column}.npy',
+                                        mode='w+', shape=(size, ),
+                                        dtype=dtype)
+                    for column in result}
+        stop = start + next(iter(result.values())).size
+        for column, values in result.items():
+            outs[column][start:stop] = values
+        start = stop
+    for out in outs.values():
+        out.flush()
+
+def write_csv(path: str, chunks: Iterator[dict[str, 'NDArray']],
+              digits: int = 17) -> None:
+    """
+    This function writes the chunks of a table to a CSV file with a
+    header row and values of the given number of significant digits.
+    """
+    with open(path, 'w', newline='') as file:
+        line = None
+        for result in chunks:
+            rows = result['altitude'].size
+            if line is None:
+                file.write(','.join(result) + '\n')
+                line = ','.join([f'%.{digits:d}g']*len(result)) + '\n'
+                values = empty((rows, len(result)))
+            elif values.shape[0] < rows:
+                values = empty((rows, len(result)))
+            # The rows are interleaved so that a single formatting
+            # operation writes the whole chunk.
+            for index, column in enumerate(result.values()):
+                values[:rows, index] = column
+            file.write((line*rows) % tuple(values[:rows].ravel().tolist()))
+
+def write_parquet(path: str, chunks: Iterator[dict[str, 'NDArray']],
+                  metadata: dict[str, Any]) -> None:
+    """
+    This function writes the chunks of a table to a Parquet file with
+    one row group per chunk.
+    """
+    if find_spec('pyarrow') is None:
+        raise ImportError('Parquet output requires pyarrow.')
+    from json import dumps
+
+    from pyarrow import Table
+    from pyarrow.parquet import ParquetWriter
+    writer = None
+    try:
+        for result in chunks:
+            table = Table.from_pydict(result)
+            if writer is None:
+                schema = table.schema.with_metadata(
+                    {'pystdatm': dumps(metadata)})
+                writer = ParquetWriter(path, schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+def parse_args(argv: Sequence[str] | None = None) -> Namespace:
+    """
+    This function returns the parsed command line arguments.
+    """
+    parser = ArgumentParser(
+        prog='pystdatm',
+        description='Write tables of the standard atmosphere properties.')
+    parser.add_argument('output', help='output .npy directory, CSV or '
+                        'Parquet file')
+    parser.add_argument('--altitude', nargs=3, type=float, action='append',
+                        metavar=('START', 'STOP', 'STEP'), required=True,
+                        help='altitude range in m, repeat for more ranges')
+    parser.add_argument('--deviation', nargs='+', type=float,
+                        default=[0.0], help='temperature deviations in K')
+    parser.add_argument('--properties', nargs='+', choices=ALTITUDE_COLUMNS,
+                        default=list(ALTITUDE_COLUMNS),
+                        help='properties written to the table')
+    parser.add_argument('--altitude-type', default='geopotential',
+                        choices=('geopotential', 'geometric'),
+                        help='type of the altitude ranges')
+    parser.add_argument('--format', choices=FORMATS, default=None,
+                        help='output format, by default from the output '
+                        'suffix, .npy directory otherwise')
+    parser.add_argument('--dtype', choices=tuple(DTYPES), default='float64',
+                        help='dtype the table is evaluated in')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='altitudes evaluated per chunk')
+    parser.add_argument('--digits', type=int, default=17,
+                        help='significant digits of the CSV values')
+    args = parser.parse_args(argv)
+    if args.format is None:
+        suffix = Path(args.output).suffix.lower()
+        args.format = {'.csv': 'csv', '.parquet': 'parquet'}.get(suffix,
+                                                                 'npy')
+    if args.format == 'parquet' and find_spec('pyarrow') is None:
+        parser.error('Parquet output requires pyarrow.')
+    try:
+        for rng in args.altitude:
+            range_size(*rng)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.chunk_size < 1:
+        parser.error('The chunk size must be positive.')
+    return args
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    This function runs the pystdatm command and returns its exit code.
+    """
+    args = parse_args(argv)
+    ranges = [tuple(rng) for rng in args.altitude]
+    dtype = DTYPES[args.dtype]
+    chunks = table_chunks(ranges, args.deviation, args.properties,
+                          args.altitude_type, args.chunk_size, dtype)
+    metadata = {'python': python_version(), 'numpy': numpy_version,
+                'backend': get_backend(), 'altitude': ranges,
+                'deviation': args.deviation, 'properties': args.properties,
+                'altitude_type': args.altitude_type, 'dtype': args.dtype,
+                'rows': table_size(ranges, args.deviation)}
+    if args.format == 'npy':
+        write_npy(args.output, chunks, metadata['rows'], dtype, metadata)
+    elif args.format == 'csv':
+        write_csv(args.output, chunks, args.digits)
+    else:
+        write_parquet(args.output, chunks, metadata)
+    return 0
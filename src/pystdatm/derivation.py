@@ -0,0 +1,51 @@
+"""
+The derivation module derives the base temperature, pressure and
+density of each layer from the formulas of the layer below at the
+altitude of the layer break.
+
+The layer modules hold the base states as literal values so that
+importing the package evaluates no formulas. The generator script
+scripts/pystdatm_constants_script.py writes the derived values into the
+layer modules and the tests check that the literals match the values
+derived from them.
+"""
+
+from importlib import import_module
+from re import MULTILINE, sub
+
+# The layer module of each base state, the suffix of its names and the
+# module and name of the formulas of the layer below.
+BASE_STATES = (('tropopause', '1', 'troposphere', 'troposphere'),
+               ('stratosphere', '2', 'tropopause', 'tropopause'),
+               ('stratosphere', '3', 'stratosphere', 'stratosphere_2'),
+               ('stratopause', '4', 'stratosphere', 'stratosphere_3'),
+               ('mesosphere', '5', 'stratopause', 'stratopause'),
+               ('mesosphere', '6', 'mesosphere', 'mesosphere_5'))
+# The prefix of the names of each property of a base state.
+PREFIXES = {'temperature': 'T', 'pressure': 'P', 'density': 'RHO'}
+
+def derive_base_states() -> dict[str, dict[str, float]]:
+    """
+    This function returns the base states derived from the layer
+    below for each layer module.
+    """
+    constants = import_module('.constants', __package__)
+    states: dict[str, dict[str, float]] = {}
+    for module, suffix, below, layer in BASE_STATES:
+        altitude = getattr(constants, f'H_{suffix}')
+        formulas = import_module(f'.{below}', __package__)
+        values = states.setdefault(module, {})
+        for name, prefix in PREFIXES.items():
+            func = getattr(formulas, f'{name}_{layer}')
+            values[f'{prefix}_{suffix}'] = float(func(altitude))
+    return states
+
+def bake_base_states(source: str, values: dict[str, float]) -> str:
+    """
+    This function returns the source of a layer module with the
+    literal values of its base states replaced by the given values.
+    """
+    for name, value in values.items():
+        source = sub(rf'^({name}(?:: float)? = )\S+', rf'\g<1>{value!r}',
+                     source, flags=MULTILINE)
+    return source
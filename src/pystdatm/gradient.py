@@ -0,0 +1,216 @@
+"""
+The gradient module evaluates the atmosphere properties together with
+their derivatives with respect to the geopotential altitude and the
+temperature deviation in closed form, in the same pass over the layers
+as the values.
+
+Within a layer the temperature T = T_s + dT has the slope dT/dh = L of
+the layer, zero in the isothermal layers, and the pressure satisfies the
+hydrostatic equation of the standard day temperature T_s
+
+    dp/dh = -g_0*p/(R*T_s)
+
+in both the gradient and the isothermal layers. The pressure does not
+depend on the deviation and the density rho = p/(R*T) follows from the
+gas law, so that
+
+    drho/dh = -rho*(g_0/(R*T_s) + L/T)
+    drho/ddT = -rho/T
+
+and the viscosity and speed of sound follow from their derivatives with
+respect to the temperature. At a layer break the derivatives are those
+of the layer below, the layer the break belongs to. The derivatives are
+NaN where the properties are, outside of the layers up to H_7.
+"""
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from numpy import add, copyto, divide, less_equal, multiply
+
+from .constants import G_0, S, R
+from .layers import (LAYER_TABLES, layer_dtype, layer_index, layer_pressure,
+                     layer_speed_of_sound, layer_temperature, layer_viscosity,
+                     layer_workspace)
+from .state import AtmosphereState
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+class PropertyGradient(NamedTuple):
+    """
+    This class holds a property and its derivatives with respect to
+    the geopotential altitude and the temperature deviation.
+    """
+    value: 'NDArray'
+    altitude: 'NDArray'
+    deviation: 'NDArray'
+
+class AtmosphereGradient(NamedTuple):
+    """
+    This class holds the atmosphere state and its derivatives with
+    respect to the geopotential altitude and the temperature deviation.
+    """
+    state: AtmosphereState
+    altitude: AtmosphereState
+    deviation: AtmosphereState
+
+class GradientTerms(NamedTuple):
+    """
+    This class holds the terms shared by the derivatives: the standard
+    day and deviated temperatures, the pressure and the lapse rate.
+    """
+    standard: 'NDArray'
+    temperature: 'NDArray'
+    pressure: 'NDArray | None'
+    lapse: 'NDArray'
+
+def gradient_terms(altitude: 'NDArray', deviation: 'NDArray' = 0.0,
+                   pressure: bool = True) -> GradientTerms:
+    """
+    This function returns the terms shared by the derivatives for a
+    given geopotential altitude and temperature deviation.
+    """
+    from . import deviation_altitude, standard_day
+    altitude = deviation_altitude(altitude, deviation)
+    shape = altitude.shape
+    dtype = layer_dtype(altitude)
+    workspace = layer_workspace(shape, dtype=dtype)
+    index = layer_index(altitude, workspace=workspace)
+    standard = layer_temperature(altitude, index, workspace=workspace)
+    lapse = LAYER_TABLES[dtype].l.take(index, mode='clip')
+    pres = None
+    if pressure:
+        pres = layer_pressure(altitude, index, workspace=workspace)
+    if standard_day(deviation):
+        return GradientTerms(standard, standard, pres, lapse)
+    temp = add(standard, deviation, dtype=dtype)
+    copyto(temp, float('nan'), where=less_equal(temp, 0.0))
+    return GradientTerms(standard, temp, pres, lapse)
+
+def unit_derivative(temp: 'NDArray', value: float) -> 'NDArray':
+    """
+    This function returns a constant derivative, NaN where the
+    temperature is.
+    """
+    out = multiply(temp, 0.0)
+    out += value
+    return out
+
+def temperature_and_gradient(altitude: 'NDArray', deviation: 'NDArray' = 0.0
+                             ) -> PropertyGradient:
+    """
+    This function returns the temperature and its derivatives for a
+    given geopotential altitude and temperature deviation.
+    """
+    terms = gradient_terms(altitude, deviation, pressure=False)
+    return temperature_gradient(terms)
+
+def temperature_gradient(terms: GradientTerms) -> PropertyGradient:
+    """
+    This function returns the temperature and its derivatives given the
+    shared terms.
+    """
+    temp = terms.temperature
+    dtdh = unit_derivative(temp, 1.0)
+    dtdh *= terms.lapse
+    return PropertyGradient(temp, dtdh, unit_derivative(temp, 1.0))
+
+def pressure_and_gradient(altitude: 'NDArray') -> PropertyGradient:
+    """
+    This function returns the pressure and its derivatives for a
+    given geopotential altitude.
+    """
+    terms = gradient_terms(altitude)
+    return pressure_gradient(terms)
+
+def pressure_gradient(terms: GradientTerms) -> PropertyGradient:
+    """
+    This function returns the pressure and its derivatives given the
+    shared terms.
+    """
+    pres = terms.pressure
+    dpdh = divide(pres, terms.standard)
+    dpdh *= -G_0/R
+    return PropertyGradient(pres, dpdh, unit_derivative(pres, 0.0))
+
+def density_and_gradient(altitude: 'NDArray', deviation: 'NDArray' = 0.0
+                         ) -> PropertyGradient:
+    """
+    This function returns the density and its derivatives for a
+    given geopotential altitude and temperature deviation.
+    """
+    terms = gradient_terms(altitude, deviation)
+    return density_gradient(terms)
+
+def density_gradient(terms: GradientTerms) -> PropertyGradient:
+    """
+    This function returns the density and its derivatives given the
+    shared terms.
+    """
+    temp = terms.temperature
+    dens = divide(terms.pressure, multiply(temp, R))
+    drhoddev = divide(dens, temp)
+    drhoddev *= -1.0
+    drhodh = divide(-G_0/R, terms.standard)
+    drhodh -= divide(terms.lapse, temp)
+    drhodh *= dens
+    return PropertyGradient(dens, drhodh, drhoddev)
+
+def viscosity_and_gradient(altitude: 'NDArray', deviation: 'NDArray' = 0.0
+                           ) -> PropertyGradient:
+    """
+    This function returns the viscosity and its derivatives for a
+    given geopotential altitude and temperature deviation.
+    """
+    terms = gradient_terms(altitude, deviation, pressure=False)
+    return viscosity_gradient(terms)
+
+def viscosity_gradient(terms: GradientTerms) -> PropertyGradient:
+    """
+    This function returns the viscosity and its derivatives given the
+    shared terms.
+    """
+    temp = terms.temperature
+    visc = layer_viscosity(temp)
+    # dmu/dT = mu*(1.5/T - 1/(T + S))
+    dmudt = divide(1.5, temp)
+    dmudt -= divide(1.0, add(temp, S))
+    dmudt *= visc
+    return PropertyGradient(visc, multiply(dmudt, terms.lapse), dmudt)
+
+def speed_of_sound_and_gradient(altitude: 'NDArray',
+                                deviation: 'NDArray' = 0.0
+                                ) -> PropertyGradient:
+    """
+    This function returns the speed of sound and its derivatives for a
+    given geopotential altitude and temperature deviation.
+    """
+    terms = gradient_terms(altitude, deviation, pressure=False)
+    return speed_of_sound_gradient(terms)
+
+def speed_of_sound_gradient(terms: GradientTerms) -> PropertyGradient:
+    """
+    This function returns the speed of sound and its derivatives given
+    the shared terms.
+    """
+    temp = terms.temperature
+    sos = layer_speed_of_sound(temp)
+    # da/dT = a/(2*T)
+    dadt = divide(sos, temp)
+    dadt *= 0.5
+    return PropertyGradient(sos, multiply(dadt, terms.lapse), dadt)
+
+def atmosphere_state_and_gradient(altitude: 'NDArray',
+                                  deviation: 'NDArray' = 0.0
+                                  ) -> AtmosphereGradient:
+    """
+    This function returns the atmosphere state and its derivatives for
+    a given geopotential altitude and temperature deviation evaluated in
+    a single pass.
+    """
+    terms = gradient_terms(altitude, deviation)
+    grads = (temperature_gradient(terms), pressure_gradient(terms),
+             density_gradient(terms), viscosity_gradient(terms),
+             speed_of_sound_gradient(terms))
+    return AtmosphereGradient(*(AtmosphereState(*values)
+                                for values in zip(*grads)))
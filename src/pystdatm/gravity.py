@@ -0,0 +1,83 @@
+"""
+The gravity module holds the latitude dependent surface gravity and
+effective earth radius of Lambert's equation
+
+    g = 9.80616*(1 - 0.0026373*cos(2*phi) + 0.0000059*cos(2*phi)**2)
+    r = 2*g/(3.085462e-6 + 2.27e-9*cos(2*phi) - 2e-12*cos(4*phi))
+
+and the conversions between the geometric altitude z and the
+geopotential altitude h at a latitude phi in degrees
+
+    h = g/g_0*r*z/(r + z)
+
+which reduce to those of the standard gravity G_0 and radius R_0 of the
+standard atmosphere at a latitude of about 45.54 degrees.
+"""
+
+from typing import TYPE_CHECKING
+
+from numpy import add, asarray, cos, divide, multiply, radians, subtract
+
+from .constants import G_0
+from .layers import layer_output
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Coefficients of Lambert's equation for the surface gravity.
+LAMBERT_G = 9.80616 # m/s^2
+LAMBERT_G_2 = -2.6373e-3
+LAMBERT_G_22 = 5.9e-6
+# Coefficients of the vertical gradient of the gravity in 1/s^2.
+LAMBERT_R_0 = 3.085462e-6
+LAMBERT_R_2 = 2.27e-9
+LAMBERT_R_4 = -2.0e-12
+
+def latitude_gravity(latitude: 'NDArray') -> 'NDArray':
+    """
+    This function returns the surface gravity for a given latitude
+    in degrees.
+    """
+    cos_2 = cos(2.0*radians(latitude))
+    return LAMBERT_G*(1.0 + LAMBERT_G_2*cos_2 + LAMBERT_G_22*cos_2**2)
+
+def latitude_radius(latitude: 'NDArray') -> 'NDArray':
+    """
+    This function returns the effective earth radius for a given
+    latitude in degrees.
+    """
+    phi = radians(latitude)
+    return 2.0*latitude_gravity(latitude)/(
+        LAMBERT_R_0 + LAMBERT_R_2*cos(2.0*phi) + LAMBERT_R_4*cos(4.0*phi))
+
+def latitude_geopotential(altitude: 'NDArray', latitude: 'NDArray',
+                          out: 'NDArray | None' = None) -> 'NDArray':
+    """
+    This function returns the geopotential altitude for a given
+    geometric altitude and latitude in degrees.
+    """
+    altitude = asarray(altitude)
+    radius = latitude_radius(latitude)
+    # h = g/g_0*r*z/(r + z), with the denominator evaluated first so
+    # that out may alias the altitude.
+    denom = asarray(add(radius, altitude))
+    result = layer_output(denom.shape, out, denom.dtype)
+    divide(altitude, denom, out=result)
+    result *= radius*latitude_gravity(latitude)/G_0
+    return result if out is not None else result[()]
+
+def latitude_geometric(altitude: 'NDArray', latitude: 'NDArray',
+                       out: 'NDArray | None' = None) -> 'NDArray':
+    """
+    This function returns the geometric altitude for a given
+    geopotential altitude and latitude in degrees.
+    """
+    altitude = asarray(altitude)
+    radius = latitude_radius(latitude)
+    # z = r*h'/(r - h') with h' = h*g_0/g
+    scaled = asarray(multiply(altitude, G_0/latitude_gravity(latitude)))
+    denom = subtract(radius, scaled)
+    result = layer_output(scaled.shape, out, scaled.dtype)
+    divide(scaled, denom, out=result)
+    result *= radius
+    return result if out is not None else result[()]
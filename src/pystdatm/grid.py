@@ -0,0 +1,116 @@
+"""
+The grid module evaluates the atmosphere and the airspeeds over the
+grid spanned by an altitude axis and optional airspeed and temperature
+deviation axes, such as the grids of aircraft performance decks.
+
+The layers are evaluated once for each unique altitude and the
+properties that depend on the temperature deviation once for each
+unique altitude and deviation. The atmosphere properties are returned
+as broadcast views of these arrays over the whole grid, so only the
+airspeeds take memory in proportion to the size of the grid.
+"""
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from numpy import (add, asarray, broadcast_to, copyto, divide, expand_dims,
+                   less_equal, multiply, sqrt, unique)
+
+from .constants import RHO_0, R
+from .state import AtmosphereState
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# The airspeed types accepted for the airspeed axis.
+SPEED_TYPES = ('true', 'equivalent', 'mach')
+
+class AtmosphereGrid(NamedTuple):
+    """
+    This class holds the coordinates of the grid axes in dimension
+    order and the properties evaluated over the grid.
+    """
+    axes: dict[str, 'NDArray']
+    data: dict[str, 'NDArray']
+
+    @property
+    def dims(self) -> tuple[str, ...]:
+        """
+        This function returns the names of the grid dimensions.
+        """
+        return tuple(self.axes)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """
+        This function returns the shape of the grid.
+        """
+        return tuple(axis.size for axis in self.axes.values())
+
+def grid_axis(values: 'NDArray', name: str) -> 'NDArray':
+    """
+    This function returns the coordinates of a grid axis as a
+    one dimensional array.
+    """
+    values = asarray(values)
+    if values.ndim != 1:
+        raise ValueError(f'The {name} axis must be one dimensional.')
+    return values
+
+def grid_evaluate(altitude: 'NDArray', speed: 'NDArray | None' = None,
+                  deviation: 'NDArray | None' = None,
+                  speed_type: str = 'true') -> AtmosphereGrid:
+    """
+    This function returns the atmosphere properties over the grid of an
+    altitude axis and optional airspeed and temperature deviation axes,
+    and the true and equivalent airspeeds and Mach numbers given an
+    airspeed axis of the speed type.
+    """
+    from . import (atmosphere_state, speed_of_sound_temperature,
+                   viscosity_temperature)
+    if speed_type not in SPEED_TYPES:
+        raise ValueError(f'The speed type must be one of {SPEED_TYPES}.')
+    axes = {'altitude': grid_axis(altitude, 'altitude')}
+    if speed is not None:
+        axes['speed'] = grid_axis(speed, 'speed')
+    if deviation is not None:
+        axes['deviation'] = grid_axis(deviation, 'deviation')
+    shape = tuple(axis.size for axis in axes.values())
+    # The layers are evaluated once for each unique altitude.
+    altitudes, inverse = unique(axes['altitude'], return_inverse=True)
+    state = AtmosphereState(*(value[inverse] for value
+                              in atmosphere_state(altitudes)))
+    if deviation is not None:
+        temp = add.outer(state.temperature, axes['deviation'])
+        copyto(temp, float('nan'), where=less_equal(temp, 0.0))
+        pres = state.pressure[:, None]
+        dens = divide(pres, multiply(temp, R))
+        state = AtmosphereState(temp, pres, dens, viscosity_temperature(temp),
+                                speed_of_sound_temperature(temp))
+    values = state._asdict()
+    values['density_ratio'] = divide(state.density, RHO_0)
+    if speed is not None:
+        # The airspeed dimension lies between the altitude and deviation.
+        values = {name: expand_dims(value, 1)
+                  for name, value in values.items()}
+    data = {name: broadcast_to(value, shape)
+            for name, value in values.items()}
+    if speed is not None:
+        speeds = axes['speed'] if deviation is None else axes['speed'][:, None]
+        sigma = sqrt(values['density_ratio'])
+        sound = values['speed_of_sound']
+        if speed_type == 'true':
+            vtas = broadcast_to(speeds, shape)
+            veas = multiply(vtas, sigma)
+            mach = divide(vtas, sound)
+        elif speed_type == 'equivalent':
+            veas = broadcast_to(speeds, shape)
+            vtas = divide(veas, sigma)
+            mach = divide(vtas, sound)
+        else:
+            mach = broadcast_to(speeds, shape)
+            vtas = multiply(mach, sound)
+            veas = multiply(vtas, sigma)
+        data['true_airspeed'] = vtas
+        data['equivalent_airspeed'] = veas
+        data['mach'] = mach
+    return AtmosphereGrid(axes, data)
@@ -0,0 +1,167 @@
+"""
+The inverse module returns the geopotential altitude for a given
+pressure or density by closed form inversion of the layer formulas.
+
+The layer is found from the pressures and densities at the layer
+boundaries in the same way the layers module finds it from altitude.
+Within a layer the altitude follows
+
+    h = h_b + c_iso*y + c_grad*expm1(k*y), y = log(p/p_b)
+
+where c_iso = 1/delta for isothermal layers and c_grad = T_b/L with
+k = 1/lambda for gradient layers, the other terms being zero.
+"""
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from numpy import (array, asarray, copyto, divide, errstate, expm1, inf, less,
+                   log, multiply, nan, nextafter, uint8, zeros_like)
+
+from .constants import H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7, RHO_0
+from .layers import (LAYER_DELTA, LAYER_DTYPES, LAYER_K, LAYER_LAMBDA_P,
+                     LAYER_LAMBDA_RHO, LAYER_TABLES, Workspace, layer_density,
+                     layer_dtype, layer_index, layer_output, layer_pressure,
+                     layer_workspace)
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike, NDArray
+
+BOUNDARIES = array([H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7])
+
+def inverse_breaks(values: 'NDArray') -> 'NDArray':
+    """
+    This function returns the breakpoints of a property decreasing with
+    altitude so that the value at H_0 itself lands in layer 1.
+    """
+    values = values.copy()
+    values[0] = nextafter(values[0], values.dtype.type(inf))
+    return values
+
+def inverse_coefficient(numerator: 'NDArray',
+                        denominator: 'NDArray') -> 'NDArray':
+    """
+    This function returns a coefficient table that is zero
+    where the denominator is zero.
+    """
+    with errstate(divide='ignore'):
+        coef = divide(numerator, denominator,
+                      out=zeros_like(denominator),
+                      where=denominator != 0.0)
+    coef[[0, -1]] = nan
+    return coef
+
+class InverseTables(NamedTuple):
+    """
+    This class holds the boundary values and inversion coefficient
+    tables cast to a working dtype.
+    """
+    pressure_breaks: 'NDArray'
+    density_breaks: 'NDArray'
+    c_iso: 'NDArray'
+    c_grad: 'NDArray'
+    k_p: 'NDArray'
+    k_rho: 'NDArray'
+
+def cast_inverse_tables(dtype: 'DTypeLike') -> InverseTables:
+    """
+    This function returns the inverse tables cast to the given dtype.
+    """
+    index = layer_index(BOUNDARIES)
+    pres = layer_pressure(BOUNDARIES, index).astype(dtype)
+    dens = layer_density(BOUNDARIES, index).astype(dtype)
+    return InverseTables(
+        # Pressure and density at the layer boundaries.
+        inverse_breaks(pres), inverse_breaks(dens),
+        # Coefficients of the isothermal layers.
+        inverse_coefficient(1.0, LAYER_DELTA).astype(dtype),
+        # Coefficients of the gradient layers.
+        inverse_coefficient(1.0, LAYER_K).astype(dtype),
+        inverse_coefficient(1.0, LAYER_LAMBDA_P).astype(dtype),
+        inverse_coefficient(1.0, LAYER_LAMBDA_RHO).astype(dtype))
+
+INVERSE_TABLES = {key: cast_inverse_tables(key) for key in LAYER_DTYPES}
+
+def inverse_index(value: 'NDArray', breaks: 'NDArray',
+                  workspace: Workspace | None = None) -> 'NDArray':
+    """
+    This function returns the layer id for a given value of a property
+    decreasing with altitude.
+    """
+    value = asarray(value)
+    shape = value.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(value))
+    index = workspace.buffer(workspace.index, shape)
+    count = workspace.buffer(workspace.count, shape)
+    mask = workspace.buffer(workspace.mask, shape)
+    less(value, breaks[0], out=mask)
+    copyto(count, mask)
+    for brk in breaks[1:]:
+        less(value, brk, out=mask)
+        count += mask.view(uint8)
+    copyto(index, count)
+    return index
+
+def inverse_layer(value: 'NDArray', breaks: str, base: str, expo: str,
+                  out: 'NDArray | None' = None,
+                  workspace: Workspace | None = None) -> 'NDArray':
+    """
+    This function returns the geopotential altitude for a given value
+    of pressure or density from the named breakpoint, base value and
+    exponent tables.
+    """
+    value = asarray(value)
+    shape = value.shape
+    dtype = layer_dtype(value)
+    tables = LAYER_TABLES[dtype]
+    inverse_tables = INVERSE_TABLES[dtype]
+    workspace = layer_workspace(shape, workspace, dtype)
+    out = layer_output(shape, out, dtype)
+    logv = workspace.buffer(workspace.work[0], shape)
+    work = workspace.buffer(workspace.work[1], shape)
+    index = inverse_index(value, getattr(inverse_tables, breaks),
+                          workspace=workspace)
+    getattr(tables, base).take(index, out=logv, mode='clip')
+    divide(value, logv, out=logv)
+    log(logv, out=logv)
+    getattr(inverse_tables, expo).take(index, out=out, mode='clip')
+    out *= logv
+    expm1(out, out=out)
+    out *= inverse_tables.c_grad.take(index, out=work, mode='clip')
+    logv *= inverse_tables.c_iso.take(index, out=work, mode='clip')
+    out += logv
+    out += tables.h.take(index, out=work, mode='clip')
+    return out
+
+def altitude_from_pressure(pressure: 'NDArray', out: 'NDArray | None' = None,
+                           workspace: Workspace | None = None) -> 'NDArray':
+    """
+    This function returns the geopotential altitude
+    for a given pressure.
+    """
+    return inverse_layer(pressure, 'pressure_breaks', 'p', 'k_p',
+                         out=out, workspace=workspace)
+
+def altitude_from_density(density: 'NDArray', out: 'NDArray | None' = None,
+                          workspace: Workspace | None = None) -> 'NDArray':
+    """
+    This function returns the geopotential altitude
+    for a given density.
+    """
+    return inverse_layer(density, 'density_breaks', 'rho', 'k_rho',
+                         out=out, workspace=workspace)
+
+def altitude_from_density_ratio(density_ratio: 'NDArray',
+                                out: 'NDArray | None' = None,
+                                workspace: Workspace | None = None
+                                ) -> 'NDArray':
+    """
+    This function returns the geopotential altitude
+    for a given density ratio.
+    """
+    density_ratio = asarray(density_ratio)
+    shape = density_ratio.shape
+    dtype = layer_dtype(density_ratio)
+    workspace = layer_workspace(shape, workspace, dtype)
+    dens = workspace.buffer(workspace.work[2], shape)
+    multiply(density_ratio, RHO_0, out=dens)
+    return altitude_from_density(dens, out=out, workspace=workspace)
@@ -0,0 +1,222 @@
+"""
+The kernels module compiles the layer formulas with numba into loops
+that find the layer and evaluate the properties of one altitude at a
+time, so that no intermediate arrays are stored.
+
+The loops repeat the operations of the layers module in the same order
+and the same working dtype, so the results match the numpy backend to
+within the last bit of the exp, log1p and power implementations. The
+parallel loops split the altitudes between all cores with prange.
+
+This module requires numba and is only imported by the backend module
+when a numba backend is selected.
+"""
+
+from math import exp, log1p, sqrt
+from typing import TYPE_CHECKING, Callable
+
+from numba import njit, prange
+from numpy import asarray, ascontiguousarray, copyto, empty
+
+from .backend import Backend
+from .constants import BETA_S, GAMMA, R, S
+from .layers import LAYER_TABLES, layer_dtype, layer_output
+from .state import AtmosphereState
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .layers import Workspace
+
+@njit(nogil=True)
+def kernel_index(alt: float, breaks: 'NDArray') -> int:
+    """
+    This function returns the layer id of a single altitude.
+    """
+    # NaN compares false everywhere and so maps to id 0.
+    index = 0
+    for brk in breaks:
+        if alt > brk:
+            index += 1
+    return index
+
+def temperature_loop(altitude: 'NDArray', breaks: 'NDArray', h: 'NDArray',
+                     t: 'NDArray', l: 'NDArray', out: 'NDArray') -> None:
+    """
+    This function evaluates the temperature of each altitude into out.
+    """
+    for i in prange(altitude.size):
+        j = kernel_index(altitude[i], breaks)
+        out[i] = (altitude[i] - h[j])*l[j] + t[j]
+
+def power_loop(altitude: 'NDArray', breaks: 'NDArray', h: 'NDArray',
+               k: 'NDArray', base: 'NDArray', expo: 'NDArray',
+               delta: 'NDArray', out: 'NDArray') -> None:
+    """
+    This function evaluates the pressure or density of each altitude
+    from the given base value and exponent tables into out.
+    """
+    for i in prange(altitude.size):
+        j = kernel_index(altitude[i], breaks)
+        dalt = altitude[i] - h[j]
+        value = log1p(k[j]*dalt)*expo[j] + delta[j]*dalt
+        out[i] = exp(value)*base[j]
+
+def temperature_pressure_loop(altitude: 'NDArray', breaks: 'NDArray',
+                              h: 'NDArray', t: 'NDArray', l: 'NDArray',
+                              k: 'NDArray', p: 'NDArray', lambda_p: 'NDArray',
+                              delta: 'NDArray', temp: 'NDArray',
+                              pres: 'NDArray') -> None:
+    """
+    This function evaluates the temperature and pressure of each
+    altitude into temp and pres.
+    """
+    for i in prange(altitude.size):
+        j = kernel_index(altitude[i], breaks)
+        dalt = altitude[i] - h[j]
+        temp[i] = dalt*l[j] + t[j]
+        value = log1p(k[j]*dalt)*lambda_p[j] + delta[j]*dalt
+        pres[i] = exp(value)*p[j]
+
+def viscosity_loop(temperature: 'NDArray', beta_s: float, s: float,
+                   expo: float, out: 'NDArray') -> None:
+    """
+    This function evaluates the viscosity of each temperature into out.
+    """
+    for i in prange(temperature.size):
+        temp_i = temperature[i]
+        out[i] = temp_i**expo*beta_s/(temp_i + s)
+
+def state_loop(altitude: 'NDArray', breaks: 'NDArray', h: 'NDArray',
+               t: 'NDArray', p: 'NDArray', rho: 'NDArray', l: 'NDArray',
+               k: 'NDArray', lambda_p: 'NDArray', lambda_rho: 'NDArray',
+               delta: 'NDArray', beta_s: float, s: float, gamma_r: float,
+               expo: float, temp: 'NDArray', pres: 'NDArray',
+               dens: 'NDArray', visc: 'NDArray', sos: 'NDArray') -> None:
+    """
+    This function evaluates all the properties of each altitude.
+    """
+    for i in prange(altitude.size):
+        j = kernel_index(altitude[i], breaks)
+        dalt = altitude[i] - h[j]
+        temp_i = l[j]*dalt + t[j]
+        log_theta = log1p(k[j]*dalt)
+        decay = dalt*delta[j]
+        temp[i] = temp_i
+        pres[i] = exp(lambda_p[j]*log_theta + decay)*p[j]
+        dens[i] = exp(lambda_rho[j]*log_theta + decay)*rho[j]
+        visc[i] = temp_i**expo*beta_s/(temp_i + s)
+        sos[i] = sqrt(gamma_r*temp_i)
+
+def kernel_call(loop: Callable[..., None], altitude: 'NDArray',
+                tables: tuple, outs: tuple['NDArray', ...]) -> None:
+    """
+    This function runs a compiled loop over the flattened altitudes,
+    writing through temporary arrays for outputs that cannot be
+    flattened in place.
+    """
+    # The loops index the outputs by the flattened altitude, unchecked.
+    for out in outs:
+        if out.shape != altitude.shape:
+            raise ValueError('The outputs must have the altitude shape.')
+    dtype = layer_dtype(altitude)
+    alt = ascontiguousarray(altitude, dtype=dtype).reshape(-1)
+    direct = [out.flags.c_contiguous and out.dtype == dtype for out in outs]
+    flats = [out.reshape(-1) if flag else empty(alt.size, dtype=dtype)
+             for out, flag in zip(outs, direct)]
+    loop(alt, *tables, *flats)
+    for out, flat, flag in zip(outs, flats, direct):
+        if not flag:
+            copyto(out, flat.reshape(out.shape))
+
+# The backends already built, so that each loop is compiled only once.
+NUMBA_BACKENDS: dict[bool, Backend] = {}
+
+def numba_backend(parallel: bool = False) -> Backend:
+    """
+    This function returns a backend evaluating the layers with the
+    compiled loops, spread over all cores if parallel.
+    """
+    if parallel not in NUMBA_BACKENDS:
+        NUMBA_BACKENDS[parallel] = build_backend(parallel)
+    return NUMBA_BACKENDS[parallel]
+
+def build_backend(parallel: bool) -> Backend:
+    """
+    This function compiles the loops and returns the backend
+    functions calling them.
+    """
+    name = 'numba_parallel' if parallel else 'numba'
+    temperature_kernel = njit(parallel=parallel, nogil=True)(temperature_loop)
+    power_kernel = njit(parallel=parallel, nogil=True)(power_loop)
+    temperature_pressure_kernel = njit(parallel=parallel, nogil=True)(
+        temperature_pressure_loop)
+    viscosity_kernel = njit(parallel=parallel, nogil=True)(viscosity_loop)
+    state_kernel = njit(parallel=parallel, nogil=True)(state_loop)
+
+    def temperature(altitude: 'NDArray', out: 'NDArray | None' = None,
+                    workspace: 'Workspace | None' = None) -> 'NDArray':
+        dtype = layer_dtype(altitude)
+        tables = LAYER_TABLES[dtype]
+        out = layer_output(altitude.shape, out, dtype)
+        kernel_call(temperature_kernel, altitude,
+                    (tables.breaks, tables.h, tables.t, tables.l), (out, ))
+        return out
+
+    def pressure(altitude: 'NDArray', out: 'NDArray | None' = None,
+                 workspace: 'Workspace | None' = None) -> 'NDArray':
+        dtype = layer_dtype(altitude)
+        tables = LAYER_TABLES[dtype]
+        out = layer_output(altitude.shape, out, dtype)
+        kernel_call(power_kernel, altitude,
+                    (tables.breaks, tables.h, tables.k, tables.p,
+                     tables.lambda_p, tables.delta), (out, ))
+        return out
+
+    def density(altitude: 'NDArray', out: 'NDArray | None' = None,
+                workspace: 'Workspace | None' = None) -> 'NDArray':
+        dtype = layer_dtype(altitude)
+        tables = LAYER_TABLES[dtype]
+        out = layer_output(altitude.shape, out, dtype)
+        kernel_call(power_kernel, altitude,
+                    (tables.breaks, tables.h, tables.k, tables.rho,
+                     tables.lambda_rho, tables.delta), (out, ))
+        return out
+
+    def temperature_pressure(altitude: 'NDArray',
+                             out: tuple['NDArray', 'NDArray'] | None = None,
+                             workspace: 'Workspace | None' = None
+                             ) -> tuple['NDArray', 'NDArray']:
+        dtype = layer_dtype(altitude)
+        tables = LAYER_TABLES[dtype]
+        if out is None:
+            out = tuple(layer_output(altitude.shape, dtype=dtype)
+                        for _ in range(2))
+        kernel_call(temperature_pressure_kernel, altitude,
+                    (tables.breaks, tables.h, tables.t, tables.l, tables.k,
+                     tables.p, tables.lambda_p, tables.delta), tuple(out))
+        return tuple(out)
+
+    def viscosity(temperature: 'NDArray', out: 'NDArray | None' = None,
+                  workspace: 'Workspace | None' = None) -> 'NDArray':
+        temperature = asarray(temperature)
+        dtype = layer_dtype(temperature)
+        out = layer_output(temperature.shape, out, dtype)
+        consts = tuple(dtype.type(c) for c in (BETA_S, S, 1.5))
+        kernel_call(viscosity_kernel, temperature, consts, (out, ))
+        return out
+
+    def state(altitude: 'NDArray', out: AtmosphereState | None = None,
+              workspace: 'Workspace | None' = None) -> AtmosphereState:
+        dtype = layer_dtype(altitude)
+        tables = LAYER_TABLES[dtype]
+        if out is None:
+            out = AtmosphereState(*(layer_output(altitude.shape, dtype=dtype)
+                                    for _ in AtmosphereState._fields))
+        # The constants take the working dtype as they do in numpy.
+        consts = tuple(dtype.type(c) for c in (BETA_S, S, GAMMA*R, 1.5))
+        kernel_call(state_kernel, altitude, (*tables, *consts), tuple(out))
+        return out
+
+    return Backend(name, temperature, pressure, density, temperature_pressure,
+                   viscosity, state)
@@ -0,0 +1,367 @@
+"""
+The layers module evaluates the standard atmosphere layers from
+per-layer coefficient tables indexed by a single layer id array.
+Within a layer the pressure and density follow
+
+    p = p_b*exp(lambda*log(T/T_b) + delta*(h - h_b))
+
+where lambda is zero for isothermal layers and delta is zero
+for gradient layers, with log(T/T_b) = log1p(L/T_b*(h - h_b)).
+
+The properties are built up in place in the output arrays and in the
+buffers of a Workspace, so that repeated evaluations on arrays of a
+fixed size with a reused Workspace and outputs allocate no arrays.
+
+Float32 altitudes are evaluated in float32 with the tables cast once to
+float32 on first use, all other altitudes are evaluated in float64. Against the
+float64 evaluation of the same altitudes the float32 results have a
+maximum relative error of about 1e-7 in temperature and 1e-6 in
+pressure and density.
+
+Layer ids run from 1 (troposphere) to 7 (mesosphere 6). Id 0 is used
+for altitudes below H_0 (or NaN) and id 8 for altitudes above H_7,
+and the coefficient tables hold NaN at these ids so that every
+property evaluates to NaN outside of the model.
+"""
+
+from math import prod
+from typing import TYPE_CHECKING, NamedTuple
+
+from numpy import (add, array, asarray, copyto, dtype, empty, exp, float32,
+                   float64, greater, inf, intp, log1p, multiply, nan,
+                   nextafter, power, sqrt, subtract, uint8)
+
+from .constants import (BETA_S, GAMMA, H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7,
+                        P_0, RHO_0, T_0, R, S)
+from .mesosphere import (L_5, L_6, P_5, P_6, RHO_5, RHO_6, T_5, T_6, lambda_5,
+                         lambda_6)
+from .stratopause import P_4, RHO_4, T_4, delta_4
+from .stratosphere import (L_2, L_3, P_2, P_3, RHO_2, RHO_3, T_2, T_3, lambda_2,
+                           lambda_3)
+from .tropopause import P_1, RHO_1, T_1, delta_1
+from .troposphere import L_0, lambda_0
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike, NDArray
+
+# Upper bounds of the layers, the troposphere includes H_0 itself.
+LAYER_BREAKS = array([nextafter(H_0, -inf), H_1, H_2, H_3, H_4, H_5, H_6, H_7])
+
+# Base altitude of each layer formula.
+LAYER_H = array([nan, 0.0, H_1, H_2, H_3, H_4, H_5, H_6, nan])
+# Base temperature of each layer.
+LAYER_T = array([nan, T_0, T_1, T_2, T_3, T_4, T_5, T_6, nan])
+# Base pressure of each layer.
+LAYER_P = array([nan, P_0, P_1, P_2, P_3, P_4, P_5, P_6, nan])
+# Base density of each layer.
+LAYER_RHO = array([nan, RHO_0, RHO_1, RHO_2, RHO_3, RHO_4, RHO_5, RHO_6, nan])
+# Temperature lapse rate of each layer, zero for isothermal layers.
+LAYER_L = array([nan, L_0, 0.0, L_2, L_3, 0.0, L_5, L_6, nan])
+# Temperature lapse rate relative to the base temperature of each layer.
+LAYER_K = LAYER_L/LAYER_T
+# Pressure exponent of each gradient layer, zero for isothermal layers.
+LAYER_LAMBDA_P = array([nan, lambda_0, 0.0, lambda_2, lambda_3, 0.0,
+                        lambda_5, lambda_6, nan])
+# Density exponent of each gradient layer, zero for isothermal layers.
+LAYER_LAMBDA_RHO = array([nan, lambda_0 - 1.0, 0.0, lambda_2 - 1.0,
+                          lambda_3 - 1.0, 0.0, lambda_5 - 1.0,
+                          lambda_6 - 1.0, nan])
+# Exponential decay rate of each isothermal layer, zero for gradient layers.
+LAYER_DELTA = array([nan, 0.0, delta_1, 0.0, 0.0, delta_4, 0.0, 0.0, nan])
+
+class LayerTables(NamedTuple):
+    """
+    This class holds the layer breakpoints and coefficient tables
+    cast to a working dtype.
+    """
+    breaks: 'NDArray'
+    h: 'NDArray'
+    t: 'NDArray'
+    p: 'NDArray'
+    rho: 'NDArray'
+    l: 'NDArray'
+    k: 'NDArray'
+    lambda_p: 'NDArray'
+    lambda_rho: 'NDArray'
+    delta: 'NDArray'
+
+def cast_tables(dtype: 'DTypeLike',
+                tables: LayerTables | None = None) -> LayerTables:
+    """
+    This function returns the float64 layer tables, of the standard
+    atmosphere by default, cast to the given dtype.
+    """
+    if tables is None:
+        tables = LayerTables(LAYER_BREAKS, LAYER_H, LAYER_T, LAYER_P,
+                             LAYER_RHO, LAYER_L, LAYER_K, LAYER_LAMBDA_P,
+                             LAYER_LAMBDA_RHO, LAYER_DELTA)
+    bottom = nextafter(tables.breaks[0], inf)
+    tables = LayerTables(*(table.astype(dtype) for table in tables))
+    # The bottom itself must stay in the first layer at the working
+    # precision.
+    scalar = tables.breaks.dtype.type
+    tables.breaks[0] = nextafter(scalar(bottom), scalar(-inf))
+    return tables
+
+# The supported working dtypes, float32 altitudes are evaluated in float32
+# and all other altitudes in float64.
+LAYER_DTYPES = (dtype(float64), dtype(float32))
+
+class StandardTables(dict):
+    """
+    This class holds the layer tables of the standard atmosphere for
+    each working dtype, cast on first use.
+    """
+    def __missing__(self, key: 'DTypeLike') -> LayerTables:
+        if key not in LAYER_DTYPES:
+            raise KeyError(key)
+        return self.setdefault(dtype(key), cast_tables(key))
+
+# Tables for the working dtypes, cast on first use rather than at import.
+LAYER_TABLES = StandardTables()
+
+def layer_dtype(array: 'NDArray') -> dtype:
+    """
+    This function returns the working dtype for a given input array.
+    """
+    if array.dtype in LAYER_DTYPES:
+        return array.dtype
+    return dtype(float64)
+
+def layer_tables(altitude: 'NDArray',
+                 tables: LayerTables | None = None) -> LayerTables:
+    """
+    This function returns the layer tables, of the standard atmosphere
+    in the working dtype of the altitude if none are given.
+    """
+    if tables is None:
+        return LAYER_TABLES[layer_dtype(altitude)]
+    return tables
+
+class Workspace():
+    """
+    This class holds the buffers used to evaluate the layers of up to
+    size altitudes so that they can be reused between calls.
+    """
+    __slots__ = ('size', 'dtype', 'index', 'count', 'mask', 'work',
+                 'altitude')
+
+    def __init__(self, size: int, dtype: 'DTypeLike' = float64) -> None:
+        self.size = size
+        self.index = empty(size, dtype=intp)
+        self.count = empty(size, dtype=uint8)
+        self.mask = empty(size, dtype=bool)
+        self.work = empty((4, size), dtype=dtype)
+        self.dtype = self.work.dtype
+        # The buffer of converted altitudes is allocated on first use.
+        self.altitude = None
+
+    def buffer(self, array: 'NDArray', shape: tuple[int, ...]) -> 'NDArray':
+        """
+        This function returns a view of a workspace buffer with the
+        given shape.
+        """
+        return array[:prod(shape)].reshape(shape)
+
+    def altitude_buffer(self, shape: tuple[int, ...]) -> 'NDArray':
+        """
+        This function returns a view of the buffer of the converted
+        altitudes with the given shape.
+        """
+        if self.altitude is None:
+            self.altitude = empty(self.size, dtype=self.dtype)
+        return self.buffer(self.altitude, shape)
+
+    def __repr__(self) -> str:
+        return f'Workspace(size={self.size:d}, dtype={self.dtype.name})'
+
+def layer_workspace(shape: tuple[int, ...],
+                    workspace: Workspace | None = None,
+                    dtype: 'DTypeLike' = float64) -> Workspace:
+    """
+    This function returns the workspace if it is large enough for the
+    given shape and dtype or a new workspace if none is given.
+    """
+    size = prod(shape)
+    if workspace is None:
+        return Workspace(size, dtype)
+    if workspace.size < size:
+        raise ValueError('The workspace is too small for the altitude array.')
+    if workspace.dtype != dtype:
+        raise ValueError(f'The workspace dtype {workspace.dtype.name} does '
+                         f'not match the working dtype {dtype.name}.')
+    return workspace
+
+def layer_output(shape: tuple[int, ...], out: 'NDArray | None' = None,
+                 dtype: 'DTypeLike' = float64) -> 'NDArray':
+    """
+    This function returns the output array or a new output array
+    if none is given.
+    """
+    if out is None:
+        return empty(shape, dtype=dtype)
+    return out
+
+def layer_index(altitude: 'NDArray', out: 'NDArray | None' = None,
+                workspace: Workspace | None = None,
+                tables: LayerTables | None = None) -> 'NDArray':
+    """
+    This function returns the layer id for a given
+    geopotential altitude.
+    """
+    altitude = asarray(altitude)
+    shape = altitude.shape
+    tables = layer_tables(altitude, tables)
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    if out is None:
+        out = workspace.buffer(workspace.index, shape)
+    count = workspace.buffer(workspace.count, shape)
+    mask = workspace.buffer(workspace.mask, shape)
+    # Counting the breakpoints below each altitude is branch free and
+    # unlike a binary search does not slow down for unsorted altitudes.
+    # The mask is counted as uint8 to avoid a buffered cast.
+    greater(altitude, tables.breaks[0], out=mask)
+    copyto(count, mask)
+    for brk in tables.breaks[1:]:
+        greater(altitude, brk, out=mask)
+        count += mask.view(uint8)
+    # NaN compares false everywhere and so maps to id 0.
+    copyto(out, count)
+    return out
+
+def layer_temperature(altitude: 'NDArray', index: 'NDArray',
+                      out: 'NDArray | None' = None,
+                      workspace: Workspace | None = None,
+                      tables: LayerTables | None = None) -> 'NDArray':
+    """
+    This function returns the temperature given input altitude
+    and layer id.
+    """
+    altitude = asarray(altitude)
+    shape = altitude.shape
+    tables = layer_tables(altitude, tables)
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    out = layer_output(shape, out, layer_dtype(altitude))
+    dalt = workspace.buffer(workspace.work[0], shape)
+    work = workspace.buffer(workspace.work[1], shape)
+    # The altitude is read before out is written, so out may alias it.
+    tables.h.take(index, out=dalt, mode='clip')
+    subtract(altitude, dalt, out=dalt)
+    tables.l.take(index, out=out, mode='clip')
+    out *= dalt
+    out += tables.t.take(index, out=work, mode='clip')
+    return out
+
+def layer_power(altitude: 'NDArray', index: 'NDArray', base: str,
+                expo: str, out: 'NDArray | None' = None,
+                workspace: Workspace | None = None,
+                tables: LayerTables | None = None) -> 'NDArray':
+    """
+    This function returns the pressure or density given input altitude
+    and layer id from the named base value and exponent tables.
+    """
+    altitude = asarray(altitude)
+    shape = altitude.shape
+    tables = layer_tables(altitude, tables)
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    out = layer_output(shape, out, layer_dtype(altitude))
+    dalt = workspace.buffer(workspace.work[0], shape)
+    work = workspace.buffer(workspace.work[1], shape)
+    tables.h.take(index, out=dalt, mode='clip')
+    subtract(altitude, dalt, out=dalt)
+    tables.k.take(index, out=out, mode='clip')
+    out *= dalt
+    log1p(out, out=out)
+    out *= getattr(tables, expo).take(index, out=work, mode='clip')
+    tables.delta.take(index, out=work, mode='clip')
+    work *= dalt
+    out += work
+    exp(out, out=out)
+    out *= getattr(tables, base).take(index, out=work, mode='clip')
+    return out
+
+def layer_pressure(altitude: 'NDArray', index: 'NDArray',
+                   out: 'NDArray | None' = None,
+                   workspace: Workspace | None = None,
+                   tables: LayerTables | None = None) -> 'NDArray':
+    """
+    This function returns the pressure given input altitude
+    and layer id.
+    """
+    return layer_power(altitude, index, 'p', 'lambda_p',
+                       out=out, workspace=workspace, tables=tables)
+
+def layer_density(altitude: 'NDArray', index: 'NDArray',
+                  out: 'NDArray | None' = None,
+                  workspace: Workspace | None = None,
+                  tables: LayerTables | None = None) -> 'NDArray':
+    """
+    This function returns the density given input altitude
+    and layer id.
+    """
+    return layer_power(altitude, index, 'rho', 'lambda_rho',
+                       out=out, workspace=workspace, tables=tables)
+
+def layer_state(altitude: 'NDArray', index: 'NDArray',
+                out: tuple['NDArray', 'NDArray', 'NDArray'] | None = None,
+                workspace: Workspace | None = None,
+                tables: LayerTables | None = None
+                ) -> tuple['NDArray', 'NDArray', 'NDArray']:
+    """
+    This function returns the temperature, pressure and density
+    given input altitude and layer id sharing the intermediate terms.
+    """
+    altitude = asarray(altitude)
+    shape = altitude.shape
+    tables = layer_tables(altitude, tables)
+    workspace = layer_workspace(shape, workspace, layer_dtype(altitude))
+    if out is None:
+        out = tuple(layer_output(shape, dtype=layer_dtype(altitude))
+                    for _ in range(3))
+    temp, pres, dens = out
+    dalt = workspace.buffer(workspace.work[0], shape)
+    log_theta = workspace.buffer(workspace.work[1], shape)
+    work = workspace.buffer(workspace.work[2], shape)
+    tables.h.take(index, out=dalt, mode='clip')
+    subtract(altitude, dalt, out=dalt)
+    tables.l.take(index, out=temp, mode='clip')
+    temp *= dalt
+    temp += tables.t.take(index, out=work, mode='clip')
+    tables.k.take(index, out=log_theta, mode='clip')
+    log_theta *= dalt
+    log1p(log_theta, out=log_theta)
+    dalt *= tables.delta.take(index, out=work, mode='clip')
+    tables.lambda_p.take(index, out=pres, mode='clip')
+    pres *= log_theta
+    pres += dalt
+    exp(pres, out=pres)
+    pres *= tables.p.take(index, out=work, mode='clip')
+    tables.lambda_rho.take(index, out=dens, mode='clip')
+    dens *= log_theta
+    dens += dalt
+    exp(dens, out=dens)
+    dens *= tables.rho.take(index, out=work, mode='clip')
+    return temp, pres, dens
+
+def layer_viscosity(temperature: 'NDArray', out: 'NDArray | None' = None,
+                    workspace: Workspace | None = None) -> 'NDArray':
+    """
+    This function returns the viscosity given input temperature.
+    """
+    temperature = asarray(temperature)
+    shape = temperature.shape
+    workspace = layer_workspace(shape, workspace, layer_dtype(temperature))
+    work = workspace.buffer(workspace.work[0], shape)
+    out = power(temperature, 1.5, out=out)
+    out *= BETA_S
+    out /= add(temperature, S, out=work)
+    return out
+
+def layer_speed_of_sound(temperature: 'NDArray',
+                         out: 'NDArray | None' = None) -> 'NDArray':
+    """
+    This function returns the speed of sound given input temperature.
+    """
+    temperature = asarray(temperature)
+    out = multiply(GAMMA*R, temperature, out=out)
+    return sqrt(out, out=out)
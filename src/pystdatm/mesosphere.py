@@ -1,18 +1,16 @@
 from typing import TYPE_CHECKING
 
 from .constants import G_0, R
-from .stratopause import density_stratopause as _density_before
-from .stratopause import pressure_stratopause as _pressure_before
-from .stratopause import temperature_stratopause as _temperature_before
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
 L_5 = -2.8e-3 # K/m
 H_5 = 51000.0 # m
-T_5 = _temperature_before(H_5) # K
-P_5 = _pressure_before(H_5) # Pa
-RHO_5 = _density_before(H_5) # kg/m^3
+# Base state derived from the layer below, see derivation.py.
+T_5 = 270.65 # K
+P_5 = 66.93852812117976 # Pa
+RHO_5 = 0.0008616010656034401 # kg/m^3
 
 lambda_5: float = -G_0/(L_5*R)
 
@@ -32,9 +30,10 @@ def density_mesosphere_5(altitude: 'NDArray') -> 'NDArray':
 
 L_6 = -2.0e-3 # K/m
 H_6 = 71000.0 # m
-T_6 = temperature_mesosphere_5(H_6) # K
-P_6 = pressure_mesosphere_5(H_6) # Pa
-RHO_6 = density_mesosphere_5(H_6) # kg/m^3
+# Base state derived from the layer below, see derivation.py.
+T_6 = 214.64999999999998 # K
+P_6 = 3.9563921603966064 # Pa
+RHO_6 = 6.421057219410461e-05 # kg/m^3
 
 lambda_6: float = -G_0/(L_6*R)
 
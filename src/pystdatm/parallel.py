@@ -0,0 +1,135 @@
+"""
+The parallel module evaluates the public functions over very large
+altitude arrays on a pool of threads.
+
+The altitudes are split into chunks and each thread evaluates one chunk
+at a time with its own Workspace straight into the matching slice of a
+preallocated output, so the memory used beyond the inputs and outputs
+is bounded by the number of threads and the chunk size rather than the
+size of the input. NumPy releases the GIL in the ufunc loops, as do the
+numba kernels, so the chunks are evaluated on all cores.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from os import cpu_count
+from typing import TYPE_CHECKING, Any, Callable
+
+from numpy import asarray, empty
+
+from .layers import Workspace, layer_dtype
+from .state import AtmosphereState
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Altitudes per chunk, so that the buffers of a chunk fit in cache.
+CHUNK_SIZE = 65536
+
+def parallel_output(result: Any, shape: tuple[int, ...]) -> Any:
+    """
+    This function returns a new output array, or AtmosphereState of
+    arrays, with the given shape matching the result of a function.
+    """
+    if isinstance(result, AtmosphereState):
+        return AtmosphereState(*(empty(shape, dtype=value.dtype)
+                                 for value in result))
+    return empty(shape, dtype=result.dtype)
+
+def parallel_chunk(values: Any, start: int, stop: int) -> Any:
+    """
+    This function returns the chunk of a flattened array, or of the
+    arrays of an AtmosphereState, between start and stop, or a scalar
+    argument itself.
+    """
+    if isinstance(values, AtmosphereState):
+        return AtmosphereState(*(value[start:stop] for value in values))
+    if isinstance(values, (float, int)) or values.ndim == 0:
+        return values
+    return values[start:stop]
+
+def parallel_flatten(values: Any, shape: tuple[int, ...]) -> Any:
+    """
+    This function returns flattened views of an output array, or of the
+    arrays of an AtmosphereState, with the given shape.
+    """
+    arrays = values if isinstance(values, AtmosphereState) else (values, )
+    for value in arrays:
+        if value.shape != shape:
+            raise ValueError('The outputs must have the altitude shape.')
+        if not value.flags.c_contiguous:
+            raise ValueError('The outputs must be contiguous.')
+    if isinstance(values, AtmosphereState):
+        return AtmosphereState(*(value.reshape(-1) for value in values))
+    return values.reshape(-1)
+
+def parallel_arguments(args: tuple['NDArray', ...],
+                       shape: tuple[int, ...]) -> list['NDArray']:
+    """
+    This function returns the arguments as scalars or flattened views,
+    which must have the given altitude shape.
+    """
+    flat_args = []
+    for arg in args:
+        # Python scalars are passed on as they are, so that a deviation
+        # of 0.0 still takes the standard day path.
+        if isinstance(arg, (float, int)):
+            flat_args.append(arg)
+            continue
+        arg = asarray(arg)
+        if arg.ndim == 0:
+            flat_args.append(arg)
+        elif arg.shape == shape:
+            flat_args.append(arg.reshape(-1))
+        else:
+            raise ValueError('The arguments must have the altitude shape.')
+    return flat_args
+
+def parallel_evaluate(func: Callable[..., Any], altitude: 'NDArray',
+                      *args: 'NDArray', out: Any = None,
+                      workers: int | None = None,
+                      chunk_size: int = CHUNK_SIZE, **kwargs: Any) -> Any:
+    """
+    This function returns the result of a function taking an altitude
+    array, out and workspace, such as pressure or atmosphere_state,
+    evaluated in chunks on a pool of threads. Further array arguments
+    must have the shape of the altitude array or be scalars, and keyword
+    arguments, such as altitude_type, are passed on to the function.
+    """
+    if chunk_size < 1:
+        raise ValueError('The chunk size must be positive.')
+    if workers is None:
+        workers = cpu_count() or 1
+    altitude = asarray(altitude)
+    shape = altitude.shape
+    alt = altitude.reshape(-1)
+    flat_args = parallel_arguments(args, shape)
+    # A call on no altitudes gives the structure and dtype of the result.
+    if out is None:
+        empty_args = [parallel_chunk(arg, 0, 0) for arg in flat_args]
+        out = parallel_output(func(alt[:0], *empty_args, **kwargs), shape)
+    flat_out = parallel_flatten(out, shape)
+    num_chunk = -(-alt.size//chunk_size)
+    chunks = count()
+    dtype = layer_dtype(alt)
+
+    def worker() -> None:
+        workspace = Workspace(min(chunk_size, alt.size), dtype)
+        # Each thread takes the next chunk until none remain.
+        for chunk in chunks:
+            if chunk >= num_chunk:
+                break
+            start = chunk*chunk_size
+            stop = min(start + chunk_size, alt.size)
+            chunk_args = [parallel_chunk(arg, start, stop)
+                          for arg in flat_args]
+            func(alt[start:stop], *chunk_args,
+                 out=parallel_chunk(flat_out, start, stop),
+                 workspace=workspace, **kwargs)
+
+    workers = max(min(workers, num_chunk), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(worker) for _ in range(workers)]
+        for future in futures:
+            future.result()
+    return out
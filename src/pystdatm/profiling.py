@@ -0,0 +1,289 @@
+"""
+The profiling module records how the public functions spend their time
+while a profile context is active.
+
+For every public function it records the number of evaluations, the
+number of altitudes evaluated, a histogram of the layer ids of the
+altitudes and the time spent in each stage: the layer classification
+(layer_index) and the layer formulas (layer_temperature, layer_pressure,
+layer_density, layer_state, layer_viscosity and layer_speed_of_sound),
+the numba kernels (numba_kernel), the backend when it is wrapped by
+other features, such as the cache or the upper atmosphere, (backend) or
+the Python scalar path (scalar).
+Functions that evaluate more than one property, such as
+density_deviation, make one evaluation per property.
+
+Profiling is switched on by wrapping the active backend, whatever other
+features are enabled, and replacing the scalar functions looked up by
+the public functions with recording versions, and switched off by
+removing the wrapper and restoring them, so the public functions run
+unchanged and at full speed outside of a profile context.
+"""
+
+from contextlib import contextmanager
+from importlib import import_module
+from inspect import currentframe
+from json import dumps
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from numpy import asarray, bincount
+
+from .backend import (ACTIVE, NUMPY_BACKEND, Backend, add_wrapper,
+                      remove_wrapper)
+from .constants import H_7
+from .layers import (layer_density, layer_index, layer_pressure,
+                     layer_speed_of_sound, layer_state, layer_temperature,
+                     layer_viscosity)
+from .scalar import layer_scalar
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .layers import Workspace
+    from .state import AtmosphereState
+
+# The scalar functions looked up by the public functions.
+SCALAR_FUNCTIONS = ('temperature_scalar', 'pressure_scalar', 'density_scalar',
+                    'density_deviation_scalar', 'viscosity_scalar',
+                    'speed_of_sound_scalar', 'state_scalar')
+
+# Number of layer ids, including the ids outside of the model.
+NUM_LAYER = 9
+# The function name recorded when the Python implementation does not
+# support stack frame introspection.
+UNKNOWN_CALLER = '<unknown>'
+
+class Profile():
+    """
+    This class holds the records of a profile context for each
+    public function.
+    """
+    records: dict[str, dict[str, Any]]
+
+    def __init__(self) -> None:
+        self.records = {}
+        self.lock = Lock()
+
+    def record(self, function: str, elements: int, layers: 'NDArray',
+               stages: dict[str, float]) -> None:
+        """
+        This function adds an evaluation of a public function to its
+        record given the altitudes evaluated, the layer id counts and
+        the time spent in each stage.
+        """
+        with self.lock:
+            if function not in self.records:
+                self.records[function] = {'calls': 0, 'elements': 0,
+                                          'layers': [0]*NUM_LAYER,
+                                          'stages': {}}
+            record = self.records[function]
+            record['calls'] += 1
+            record['elements'] += elements
+            for index, count in enumerate(layers):
+                record['layers'][index] += int(count)
+            for stage, time in stages.items():
+                stages_time = record['stages'].get(stage, 0.0)
+                record['stages'][stage] = stages_time + time
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """
+        This function returns a copy of the records as a dictionary.
+        """
+        with self.lock:
+            return {function: {'calls': record['calls'],
+                               'elements': record['elements'],
+                               'layers': list(record['layers']),
+                               'stages': dict(record['stages'])}
+                    for function, record in self.records.items()}
+
+    def to_json(self, path: str | None = None) -> str:
+        """
+        This function returns the records as JSON and writes them to
+        the file at path if one is given.
+        """
+        text = dumps(self.as_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
+
+    def __repr__(self) -> str:
+        return f'Profile(functions={len(self.records):d})'
+
+def profile_caller() -> str:
+    """
+    This function returns the name of the outermost public function in
+    the calls leading to a recording function.
+    """
+    frame = currentframe()
+    while frame is not None and frame.f_globals.get('__name__') == __name__:
+        frame = frame.f_back
+    if frame is None:
+        return UNKNOWN_CALLER
+    name = frame.f_code.co_name
+    # A public function calling another is recorded under its own name.
+    while frame is not None and frame.f_globals.get('__name__') == __package__:
+        name = frame.f_code.co_name
+        frame = frame.f_back
+    return name
+
+def profile_layers(altitude: 'NDArray',
+                   index: 'NDArray | None' = None) -> 'NDArray':
+    """
+    This function returns the number of altitudes in each layer.
+    """
+    if index is None:
+        index = layer_index(altitude)
+    return bincount(index.reshape(-1), minlength=NUM_LAYER)
+
+def profile_backend(backend: Backend, prof: Profile) -> Backend:
+    """
+    This function returns a backend that records the evaluations of
+    the given backend in a profile.
+    """
+    # Only the numpy backend is evaluated in stages, a wrapped backend
+    # is timed as a whole.
+    if backend is not NUMPY_BACKEND:
+        stage = 'backend'
+        if backend is ACTIVE['selected']:
+            stage = 'numba_kernel'
+        return profile_kernels(backend, prof, stage)
+
+    def evaluate(altitude: 'NDArray', out: Any, workspace: 'Workspace',
+                 layer: Callable[..., Any]) -> Any:
+        start = perf_counter()
+        index = layer_index(altitude, workspace=workspace)
+        middle = perf_counter()
+        out = layer(altitude, index, out=out, workspace=workspace)
+        end = perf_counter()
+        prof.record(profile_caller(), altitude.size,
+                    profile_layers(altitude, index),
+                    {'layer_index': middle - start,
+                     layer.__name__: end - middle})
+        return out
+
+    def temperature(altitude: 'NDArray', out: 'NDArray',
+                    workspace: 'Workspace') -> 'NDArray':
+        return evaluate(altitude, out, workspace, layer_temperature)
+
+    def pressure(altitude: 'NDArray', out: 'NDArray',
+                 workspace: 'Workspace') -> 'NDArray':
+        return evaluate(altitude, out, workspace, layer_pressure)
+
+    def density(altitude: 'NDArray', out: 'NDArray',
+                workspace: 'Workspace') -> 'NDArray':
+        return evaluate(altitude, out, workspace, layer_density)
+
+    def temperature_pressure(altitude: 'NDArray',
+                             out: tuple['NDArray', 'NDArray'],
+                             workspace: 'Workspace'
+                             ) -> tuple['NDArray', 'NDArray']:
+        times = [perf_counter()]
+        index = layer_index(altitude, workspace=workspace)
+        times.append(perf_counter())
+        layer_temperature(altitude, index, out=out[0], workspace=workspace)
+        times.append(perf_counter())
+        layer_pressure(altitude, index, out=out[1], workspace=workspace)
+        times.append(perf_counter())
+        stages = ('layer_index', 'layer_temperature', 'layer_pressure')
+        prof.record(profile_caller(), altitude.size,
+                    profile_layers(altitude, index),
+                    {stage: end - start for stage, start, end
+                     in zip(stages, times[:-1], times[1:])})
+        return out
+
+    def viscosity(temperature: 'NDArray', out: 'NDArray',
+                  workspace: 'Workspace') -> 'NDArray':
+        temperature = asarray(temperature)
+        start = perf_counter()
+        out = layer_viscosity(temperature, out=out, workspace=workspace)
+        end = perf_counter()
+        prof.record(profile_caller(), temperature.size, [],
+                    {'layer_viscosity': end - start})
+        return out
+
+    def state(altitude: 'NDArray', out: 'AtmosphereState',
+              workspace: 'Workspace') -> 'AtmosphereState':
+        times = [perf_counter()]
+        index = layer_index(altitude, workspace=workspace)
+        times.append(perf_counter())
+        layer_state(altitude, index, out=out[:3], workspace=workspace)
+        times.append(perf_counter())
+        layer_viscosity(out[0], out=out[3], workspace=workspace)
+        times.append(perf_counter())
+        layer_speed_of_sound(out[0], out=out[4])
+        times.append(perf_counter())
+        stages = ('layer_index', 'layer_state', 'layer_viscosity',
+                  'layer_speed_of_sound')
+        prof.record(profile_caller(), altitude.size,
+                    profile_layers(altitude, index),
+                    {stage: end - start for stage, start, end
+                     in zip(stages, times[:-1], times[1:])})
+        return out
+
+    return Backend(backend.name, temperature, pressure, density,
+                   temperature_pressure, viscosity, state)
+
+def profile_kernels(backend: Backend, prof: Profile,
+                    stage: str = 'numba_kernel') -> Backend:
+    """
+    This function returns a backend that records the evaluations of a
+    numba backend, where the stages are fused into a single kernel, or
+    of a wrapped backend, as a single stage.
+    """
+    def wrap(func: Callable[..., Any], layers: bool) -> Callable[..., Any]:
+        def evaluate(values: 'NDArray', out: Any = None,
+                     workspace: 'Workspace | None' = None) -> Any:
+            values = asarray(values)
+            start = perf_counter()
+            out = func(values, out=out, workspace=workspace)
+            end = perf_counter()
+            prof.record(profile_caller(), values.size,
+                        profile_layers(values) if layers else [],
+                        {stage: end - start})
+            return out
+        return evaluate
+
+    return Backend(backend.name, wrap(backend.temperature, True),
+                   wrap(backend.pressure, True), wrap(backend.density, True),
+                   wrap(backend.temperature_pressure, True),
+                   wrap(backend.viscosity, False), wrap(backend.state, True))
+
+def profile_scalar(func: Callable[..., float],
+                   prof: Profile) -> Callable[..., float]:
+    """
+    This function returns a scalar function that records its
+    evaluations in a profile.
+    """
+    def evaluate(altitude: float, *args: float) -> Any:
+        start = perf_counter()
+        value = func(altitude, *args)
+        end = perf_counter()
+        layers = [0]*NUM_LAYER
+        index = layer_scalar(altitude)
+        layers[8 if index == 0 and altitude > H_7 else index] = 1
+        prof.record(profile_caller(), 1, layers, {'scalar': end - start})
+        return value
+    return evaluate
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """
+    This function returns a context manager that records the
+    evaluations of the public functions in the Profile it yields.
+    """
+    namespace = vars(import_module(__package__))
+    prof = Profile()
+    scalars = {name: namespace[name] for name in SCALAR_FUNCTIONS}
+    # Nested profiles each wrap the backend under their own name.
+    name = f'profile_{id(prof):x}'
+    add_wrapper(name, lambda backend: profile_backend(backend, prof))
+    for scalar, func in scalars.items():
+        namespace[scalar] = profile_scalar(func, prof)
+    try:
+        yield prof
+    finally:
+        remove_wrapper(name)
+        namespace.update(scalars)
@@ -0,0 +1,133 @@
+"""
+The scalar module evaluates the standard atmosphere for a single
+altitude given as a Python float using plain math operations and
+the same per-layer coefficients as the layers module.
+"""
+
+from math import exp, log1p, nan, sqrt
+
+from .constants import (BETA_S, GAMMA, H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7,
+                        R, S)
+from .layers import (LAYER_DELTA, LAYER_H, LAYER_K, LAYER_L, LAYER_LAMBDA_P,
+                     LAYER_LAMBDA_RHO, LAYER_P, LAYER_RHO, LAYER_T)
+
+# The coefficient tables as tuples of Python floats.
+SCALAR_H: tuple[float, ...] = tuple(LAYER_H.tolist())
+SCALAR_T: tuple[float, ...] = tuple(LAYER_T.tolist())
+SCALAR_P: tuple[float, ...] = tuple(LAYER_P.tolist())
+SCALAR_RHO: tuple[float, ...] = tuple(LAYER_RHO.tolist())
+SCALAR_L: tuple[float, ...] = tuple(LAYER_L.tolist())
+SCALAR_K: tuple[float, ...] = tuple(LAYER_K.tolist())
+SCALAR_LAMBDA_P: tuple[float, ...] = tuple(LAYER_LAMBDA_P.tolist())
+SCALAR_LAMBDA_RHO: tuple[float, ...] = tuple(LAYER_LAMBDA_RHO.tolist())
+SCALAR_DELTA: tuple[float, ...] = tuple(LAYER_DELTA.tolist())
+
+def layer_scalar(altitude: float) -> int:
+    """
+    This function returns the layer id for a given
+    geopotential altitude, 0 if it is outside of the model.
+    """
+    if not H_0 <= altitude <= H_7:
+        return 0
+    if altitude <= H_1:
+        return 1
+    if altitude <= H_2:
+        return 2
+    if altitude <= H_3:
+        return 3
+    if altitude <= H_4:
+        return 4
+    if altitude <= H_5:
+        return 5
+    if altitude <= H_6:
+        return 6
+    return 7
+
+def temperature_scalar(altitude: float, deviation: float = 0.0) -> float:
+    """
+    This function returns the temperature for a given
+    geopotential altitude and temperature deviation.
+    """
+    layer = layer_scalar(altitude)
+    if layer == 0:
+        return nan
+    temp = SCALAR_T[layer] + SCALAR_L[layer]*(altitude - SCALAR_H[layer])
+    if deviation != 0.0:
+        temp += deviation
+        if not temp > 0.0:
+            return nan
+    return temp
+
+def pressure_scalar(altitude: float) -> float:
+    """
+    This function returns the pressure for a given
+    geopotential altitude.
+    """
+    layer = layer_scalar(altitude)
+    if layer == 0:
+        return nan
+    dalt = altitude - SCALAR_H[layer]
+    expo = SCALAR_LAMBDA_P[layer]*log1p(SCALAR_K[layer]*dalt)
+    return SCALAR_P[layer]*exp(expo + SCALAR_DELTA[layer]*dalt)
+
+def density_scalar(altitude: float) -> float:
+    """
+    This function returns the density for a given
+    geopotential altitude.
+    """
+    layer = layer_scalar(altitude)
+    if layer == 0:
+        return nan
+    dalt = altitude - SCALAR_H[layer]
+    expo = SCALAR_LAMBDA_RHO[layer]*log1p(SCALAR_K[layer]*dalt)
+    return SCALAR_RHO[layer]*exp(expo + SCALAR_DELTA[layer]*dalt)
+
+def density_deviation_scalar(altitude: float, deviation: float) -> float:
+    """
+    This function returns the density for a given
+    geopotential altitude and temperature deviation.
+    """
+    temp = temperature_scalar(altitude, deviation)
+    return pressure_scalar(altitude)/(R*temp)
+
+def viscosity_scalar(altitude: float, deviation: float = 0.0) -> float:
+    """
+    This function returns the viscosity for a given
+    geopotential altitude and temperature deviation.
+    """
+    temp = temperature_scalar(altitude, deviation)
+    return BETA_S*temp**1.5/(temp + S)
+
+def speed_of_sound_scalar(altitude: float, deviation: float = 0.0) -> float:
+    """
+    This function returns the speed of sound for a given
+    geopotential altitude and temperature deviation.
+    """
+    temp = temperature_scalar(altitude, deviation)
+    return sqrt(GAMMA*R*temp)
+
+def state_scalar(altitude: float, deviation: float = 0.0
+                 ) -> tuple[float, float, float, float, float]:
+    """
+    This function returns the temperature, pressure, density,
+    viscosity and speed of sound for a given geopotential altitude
+    and temperature deviation.
+    """
+    layer = layer_scalar(altitude)
+    if layer == 0:
+        return nan, nan, nan, nan, nan
+    dalt = altitude - SCALAR_H[layer]
+    temp = SCALAR_T[layer] + SCALAR_L[layer]*dalt
+    log_theta = log1p(SCALAR_K[layer]*dalt)
+    decay = SCALAR_DELTA[layer]*dalt
+    pres = SCALAR_P[layer]*exp(SCALAR_LAMBDA_P[layer]*log_theta + decay)
+    dens = SCALAR_RHO[layer]*exp(SCALAR_LAMBDA_RHO[layer]*log_theta + decay)
+    if deviation != 0.0:
+        # The pressure is unchanged and the density follows the gas law.
+        temp += deviation
+        if not temp > 0.0:
+            return nan, pres, nan, nan, nan
+        dens = pres/(R*temp)
+    visc = BETA_S*temp**1.5/(temp + S)
+    sos = sqrt(GAMMA*R*temp)
+    return temp, pres, dens, visc, sos
@@ -0,0 +1,238 @@
+"""
+The service module holds AsyncAtmosphere, an asyncio front end that
+evaluates many small concurrent requests of a public function, such as
+density or atmosphere_state, in batches.
+
+Each request waits in the current batch, which is evaluated once the
+batch window has passed since its first request or once it holds the
+maximum number of altitudes. The altitudes and arguments of the batch
+are concatenated and evaluated in one vectorized call on an executor,
+so the event loop stays free, and the results are scattered back to the
+waiting requests as views of the batch result. A wider window gathers
+larger batches, trading the latency of each request for throughput.
+
+The batches are evaluated in order on a single thread by default. An
+argument that is the same scalar for every request of a batch, such as
+a standard day deviation of 0.0, is passed on as a scalar. Inputs that
+are not numbers fail in the request that made them, and a batch that
+fails is evaluated again one request at a time, so that an error only
+reaches the requests that caused it.
+"""
+
+from asyncio import (AbstractEventLoop, Future, Task, TimerHandle, gather,
+                     get_running_loop)
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+from numpy import asarray, broadcast_to, concatenate, empty
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Default batch window in seconds and maximum altitudes per batch.
+BATCH_WINDOW = 0.0005
+MAX_BATCH = 65536
+
+# A waiting request of the altitude, its arguments and its future.
+Request = tuple['NDArray', tuple['NDArray', ...], Future]
+
+def batch_arguments(requests: list[Request]) -> tuple[Any, ...]:
+    """
+    This function returns the concatenated arguments of the requests of
+    a batch, or the scalar an argument takes in every request.
+    """
+    arguments = []
+    for values in zip(*(args for _, args, _ in requests)):
+        first = values[0]
+        if first.ndim == 0 and all(value.ndim == 0 and value == first
+                                   for value in values):
+            arguments.append(first.item())
+        else:
+            arguments.append(concatenate(
+                [broadcast_to(value, altitude.shape).reshape(-1)
+                 for value, (altitude, _, _) in zip(values, requests)]))
+    return tuple(arguments)
+
+def batch_result(result: Any, start: int, stop: int,
+                 shape: tuple[int, ...]) -> Any:
+    """
+    This function returns the result of a request from the result of
+    its batch, or of each array of a named tuple of results such as an
+    AtmosphereState, with the shape of its altitude.
+    """
+    if isinstance(result, tuple):
+        return type(result)(*(batch_result(value, start, stop, shape)
+                              for value in result))
+    return result[start:stop].reshape(shape)[()]
+
+def request_array(value: Any) -> 'NDArray':
+    """
+    This function returns the value of a request as an array of floats,
+    keeping the dtype of float arrays.
+    """
+    value = asarray(value)
+    if value.dtype.kind != 'f':
+        value = value.astype(float)
+    return value
+
+class AsyncAtmosphere():
+    """
+    This class holds an asyncio service evaluating the requests of a
+    function in batches gathered over a batch window.
+    """
+    func: Callable[..., Any]
+    batch_window: float
+    max_batch: int
+    executor: Executor
+    owned: bool
+    pending: list[Request]
+    size: int
+    timer: TimerHandle | None
+    tasks: set[Task]
+    batches: int
+    requests: int
+    warm: bool
+
+    def __init__(self, func: Callable[..., Any] | None = None,
+                 batch_window: float = BATCH_WINDOW,
+                 max_batch: int = MAX_BATCH,
+                 executor: Executor | None = None) -> None:
+        if batch_window < 0.0:
+            raise ValueError('The batch window must not be negative.')
+        if max_batch < 1:
+            raise ValueError('The maximum batch must be positive.')
+        if func is None:
+            from . import density as func
+        self.func = func
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.owned = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = executor
+        self.pending = []
+        self.size = 0
+        self.timer = None
+        self.tasks = set()
+        self.batches = 0
+        self.requests = 0
+        self.warm = False
+
+    async def evaluate(self, altitude: 'NDArray', *args: 'NDArray') -> Any:
+        """
+        This function returns the result of the function for a given
+        altitude and further arguments, which must be scalars or have
+        the shape of the altitude, evaluated in a batch.
+        """
+        loop = get_running_loop()
+        altitude = request_array(altitude)
+        args = tuple(request_array(arg) for arg in args)
+        for arg in args:
+            if arg.ndim != 0 and arg.shape != altitude.shape:
+                raise ValueError('The arguments must have the altitude '
+                                 'shape.')
+        # Requests of a different number of arguments start a new batch.
+        if self.pending and len(self.pending[0][1]) != len(args):
+            self.flush(loop)
+        future = loop.create_future()
+        self.pending.append((altitude, args, future))
+        self.size += altitude.size
+        if self.size >= self.max_batch:
+            self.flush(loop)
+        elif self.timer is None:
+            self.timer = loop.call_later(self.batch_window, self.flush, loop)
+        return await future
+
+    def flush(self, loop: AbstractEventLoop) -> None:
+        """
+        This function starts the evaluation of the current batch.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        requests = self.pending
+        self.pending = []
+        self.size = 0
+        if not self.warm:
+            self.warm_up(requests[0][1])
+        task = loop.create_task(self.dispatch(requests))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def warm_up(self, args: tuple['NDArray', ...]) -> None:
+        """
+        This function calls the function on no altitudes with the
+        arguments of the first batch, so that the numba kernels are
+        compiled and their thread pool started on the event loop thread,
+        not on the executor.
+        """
+        try:
+            self.func(empty(0), *(arg if arg.ndim == 0 else empty(0)
+                                  for arg in args))
+        except Exception:
+            # The batch reports the error to its requests.
+            return
+        self.warm = True
+
+    async def dispatch(self, requests: list[Request]) -> None:
+        """
+        This function evaluates a batch on the executor and sets the
+        results of its requests.
+        """
+        loop = get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.compute,
+                                                 requests)
+        except Exception as error:
+            # The requests of a failed batch are evaluated one at a time.
+            if len(requests) > 1:
+                await gather(*(self.dispatch([request])
+                               for request in requests))
+                return
+            for _, _, future in requests:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, _, future), result in zip(requests, results):
+            if not future.done():
+                future.set_result(result)
+
+    def compute(self, requests: list[Request]) -> list[Any]:
+        """
+        This function returns the results of the requests of a batch
+        evaluated in one call of the function.
+        """
+        altitude = concatenate([alt.reshape(-1) for alt, _, _ in requests])
+        result = self.func(altitude, *batch_arguments(requests))
+        results = []
+        start = 0
+        for alt, _, _ in requests:
+            stop = start + alt.size
+            results.append(batch_result(result, start, stop, alt.shape))
+            start = stop
+        self.batches += 1
+        self.requests += len(requests)
+        return results
+
+    async def close(self) -> None:
+        """
+        This function evaluates the waiting requests and shuts down the
+        executor if the service created it.
+        """
+        self.flush(get_running_loop())
+        await gather(*self.tasks)
+        if self.owned:
+            self.executor.shutdown()
+
+    async def __aenter__(self) -> 'AsyncAtmosphere':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def __repr__(self) -> str:
+        return (f'AsyncAtmosphere(func={self.func.__name__}, '
+                f'batch_window={self.batch_window:g}, '
+                f'max_batch={self.max_batch:d})')
@@ -0,0 +1,248 @@
+"""
+The shared module evaluates the public functions on buffer protocol
+inputs, such as memoryviews, bytearrays or multiprocessing shared
+memory, straight into caller provided output buffers.
+
+The buffers are wrapped as arrays without copying and evaluated in
+chunks with a single chunk sized Workspace straight into the matching
+slices of the outputs, so the memory used beyond the buffers is bounded
+by the chunk size rather than the size of the inputs.
+
+For process pools the inputs and outputs are described by SharedBuffer,
+the name, shape and dtype of a block of shared memory, which is cheap
+to send to a worker. process_evaluate partitions the altitudes into one
+contiguous slice per process, each attaching the shared memory blocks
+and writing its slice of the outputs in place. The workers are started
+with spawn by default, as the threading layers of numba are not safe to
+fork, and use the backend selected in the calling process with the
+upper atmosphere and the cache re-applied over it when they are enabled
+there. A profile only records the evaluations of the calling process.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from os import cpu_count
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from numpy import float64, frombuffer, generic, result_type
+
+from .layers import Workspace, layer_dtype
+from .parallel import (CHUNK_SIZE, parallel_arguments, parallel_chunk,
+                       parallel_flatten)
+from .state import AtmosphereState
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike, NDArray
+
+class SharedBuffer(NamedTuple):
+    """
+    This class holds the name, shape and dtype of an array in a block of
+    shared memory.
+    """
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+def buffer_array(buffer: Any, dtype: 'DTypeLike' = float64,
+                 shape: tuple[int, ...] | None = None,
+                 writeable: bool = False) -> 'NDArray':
+    """
+    This function returns an array viewing the memory of a buffer
+    protocol object with the given dtype and shape, flat by default.
+    """
+    view = memoryview(buffer)
+    if not view.c_contiguous:
+        raise ValueError('The buffer must be contiguous.')
+    if writeable and view.readonly:
+        raise ValueError('The output buffer must be writeable.')
+    # Typed buffers, such as arrays, must not be reinterpreted.
+    if view.format != 'B' and result_type(view.format) != result_type(dtype):
+        raise ValueError(f'The buffer format {view.format} does not match '
+                         f'the dtype {result_type(dtype).name}.')
+    array = frombuffer(view.cast('B'), dtype=dtype)
+    if shape is not None:
+        array = array.reshape(shape)
+    return array
+
+def shared_buffer(memory: SharedMemory, shape: tuple[int, ...],
+                  dtype: 'DTypeLike' = float64) -> SharedBuffer:
+    """
+    This function returns the SharedBuffer of an array with the given
+    shape and dtype at the start of a block of shared memory.
+    """
+    dtype = result_type(dtype)
+    shape = tuple(int(size) for size in shape)
+    nbytes = dtype.itemsize
+    for size in shape:
+        nbytes *= size
+    if nbytes > memory.size:
+        raise ValueError('The shared memory is too small for the array.')
+    return SharedBuffer(memory.name, shape, dtype.str)
+
+def attach_buffer(buffer: SharedBuffer) -> tuple[SharedMemory, 'NDArray']:
+    """
+    This function returns the attached shared memory of a SharedBuffer
+    and the array viewing it, valid until the memory is closed.
+    """
+    memory = SharedMemory(name=buffer.name)
+    nbytes = result_type(buffer.dtype).itemsize
+    for size in buffer.shape:
+        nbytes *= size
+    array = buffer_array(memory.buf[:nbytes], buffer.dtype, buffer.shape)
+    return memory, array
+
+def buffer_output(out: Any, shape: tuple[int, ...],
+                  dtype: 'DTypeLike') -> Any:
+    """
+    This function returns writeable arrays viewing an output buffer, or
+    an AtmosphereState of output buffers, with the given shape.
+    """
+    if isinstance(out, AtmosphereState):
+        return AtmosphereState(*(buffer_array(value, dtype, shape, True)
+                                 for value in out))
+    return buffer_array(out, dtype, shape, True)
+
+def buffer_evaluate(func: Callable[..., Any], altitude: Any, *args: Any,
+                    out: Any, chunk_size: int = CHUNK_SIZE,
+                    dtype: 'DTypeLike' = float64, **kwargs: Any) -> Any:
+    """
+    This function evaluates a function taking an altitude array, out and
+    workspace, such as pressure or atmosphere_state, on buffers of the
+    given dtype into the output buffer, or AtmosphereState of output
+    buffers, and returns the output arrays. Further arguments must be
+    scalars or buffers of the altitude size, and keyword arguments, such
+    as altitude_type, are passed on to the function.
+    """
+    if chunk_size < 1:
+        raise ValueError('The chunk size must be positive.')
+    alt = buffer_array(altitude, dtype)
+    flat_args = parallel_arguments(
+        tuple(arg if isinstance(arg, (float, int, generic)) else
+              buffer_array(arg, dtype) for arg in args), alt.shape)
+    out = buffer_output(out, alt.shape, dtype)
+    flat_out = parallel_flatten(out, alt.shape)
+    workspace = Workspace(min(chunk_size, alt.size), layer_dtype(alt))
+    for start in range(0, alt.size, chunk_size):
+        stop = min(start + chunk_size, alt.size)
+        chunk_args = [parallel_chunk(arg, start, stop) for arg in flat_args]
+        func(alt[start:stop], *chunk_args,
+             out=parallel_chunk(flat_out, start, stop), workspace=workspace,
+             **kwargs)
+    return out
+
+def process_features() -> tuple[tuple[str, tuple[Any, ...]], ...]:
+    """
+    This function returns the names and arguments of the features
+    applied over the backend in use that are re-applied in the workers,
+    in the order they are applied.
+    """
+    from .backend import ACTIVE
+    features = []
+    for name in ACTIVE['wrappers']:
+        if name == 'upper':
+            features.append((name, ()))
+        elif name == 'cache':
+            from .cache import get_cache
+            features.append((name, (get_cache().max_bytes, )))
+    return tuple(features)
+
+def process_setup(backend: str,
+                  features: tuple[tuple[str, tuple[Any, ...]], ...]
+                  ) -> None:
+    """
+    This function selects the backend of the calling process in a worker
+    process and re-applies its features over it.
+    """
+    from .backend import ACTIVE, set_backend
+    names = tuple(name for name, _ in features)
+    if (ACTIVE['selected'].name == backend and
+            tuple(ACTIVE['wrappers']) == names):
+        return
+    set_backend(backend)
+    for name, args in features:
+        if name == 'upper':
+            from .upper import enable_upper_atmosphere
+            enable_upper_atmosphere(*args)
+        else:
+            from .cache import enable_cache
+            enable_cache(*args)
+
+def process_task(func: Callable[..., Any], backend: str,
+                 features: tuple[tuple[str, tuple[Any, ...]], ...],
+                 altitude: SharedBuffer, args: tuple[Any, ...], out: Any,
+                 start: int, stop: int, chunk_size: int,
+                 kwargs: dict[str, Any]) -> None:
+    """
+    This function evaluates the altitudes from start to stop of shared
+    buffers in a worker process.
+    """
+    process_setup(backend, features)
+    memories = []
+
+    def attach(buffer: SharedBuffer) -> 'NDArray':
+        memory, array = attach_buffer(buffer)
+        memories.append(memory)
+        return array.reshape(-1)[start:stop]
+
+    try:
+        alt = attach(altitude)
+        chunk_args = [attach(arg) if isinstance(arg, SharedBuffer) else arg
+                      for arg in args]
+        if isinstance(out, AtmosphereState):
+            chunk_out = AtmosphereState(*(attach(value) for value in out))
+        else:
+            chunk_out = attach(out)
+        buffer_evaluate(func, alt, *chunk_args, out=chunk_out,
+                        chunk_size=chunk_size, dtype=alt.dtype, **kwargs)
+        # The arrays must be released before the memory is closed.
+        del alt, chunk_args, chunk_out
+    finally:
+        for memory in memories:
+            memory.close()
+
+def process_evaluate(func: Callable[..., Any], altitude: SharedBuffer,
+                     *args: SharedBuffer | float, out: Any,
+                     workers: int | None = None,
+                     chunk_size: int = CHUNK_SIZE,
+                     executor: Executor | None = None,
+                     **kwargs: Any) -> None:
+    """
+    This function evaluates a public function on shared buffers into the
+    output SharedBuffer, or AtmosphereState of SharedBuffers, on a pool
+    of processes, each writing one contiguous slice of the outputs.
+    Further arguments must be scalars or SharedBuffers of the altitude
+    shape and dtype, and keyword arguments are passed on to the function.
+    """
+    from .backend import ACTIVE
+    if chunk_size < 1:
+        raise ValueError('The chunk size must be positive.')
+    outs = out if isinstance(out, AtmosphereState) else (out, )
+    for buffer in (*outs, *(arg for arg in args
+                            if isinstance(arg, SharedBuffer))):
+        if buffer.shape != altitude.shape or buffer.dtype != altitude.dtype:
+            raise ValueError('The shared buffers must have the altitude '
+                             'shape and dtype.')
+    if workers is None:
+        workers = cpu_count() or 1
+    size = 1
+    for dim in altitude.shape:
+        size *= dim
+    workers = max(min(workers, -(-size//chunk_size)), 1)
+    bounds = [size*worker//workers for worker in range(workers + 1)]
+    owned = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=workers,
+                                       mp_context=get_context('spawn'))
+    try:
+        backend = ACTIVE['selected'].name
+        features = process_features()
+        futures = [executor.submit(process_task, func, backend, features,
+                                   altitude, args, out, start, stop,
+                                   chunk_size, kwargs)
+                   for start, stop in zip(bounds[:-1], bounds[1:])]
+        for future in futures:
+            future.result()
+    finally:
+        if owned:
+            executor.shutdown()
@@ -0,0 +1,15 @@
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+class AtmosphereState(NamedTuple):
+    """
+    This class holds the atmosphere properties evaluated
+    together for an array of altitudes.
+    """
+    temperature: 'NDArray' # K
+    pressure: 'NDArray' # Pa
+    density: 'NDArray' # kg/m^3
+    viscosity: 'NDArray' # Pa.s
+    speed_of_sound: 'NDArray' # m/s
@@ -3,17 +3,15 @@ from typing import TYPE_CHECKING
 from numpy import exp, full, shape
 
 from .constants import G_0, R
-from .stratosphere import density_stratosphere_3 as _density_before
-from .stratosphere import pressure_stratosphere_3 as _pressure_before
-from .stratosphere import temperature_stratosphere_3 as _temperature_before
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
 H_4 = 47000.0 # m
-T_4: float = _temperature_before(H_4) # K
-P_4: float = _pressure_before(H_4) # Pa
-RHO_4: float = _density_before(H_4) # kg/m^3
+# Base state derived from the layer below, see derivation.py.
+T_4: float = 270.65 # K
+P_4: float = 110.90577336731008 # Pa
+RHO_4: float = 0.0014275266456690034 # kg/m^3
 
 delta_4: float = -G_0/(R*T_4)
 
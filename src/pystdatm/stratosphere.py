@@ -1,18 +1,16 @@
 from typing import TYPE_CHECKING
 
 from .constants import G_0, R
-from .tropopause import density_tropopause as _density_before
-from .tropopause import pressure_tropopause as _pressure_before
-from .tropopause import temperature_tropopause as _temperature_before
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
 L_2 = 1.0e-3 # K/m
 H_2 = 20000.0 # m
-T_2 = _temperature_before(H_2) # K
-P_2 = _pressure_before(H_2) # Pa
-RHO_2 = _density_before(H_2) # kg/m^3
+# Base state derived from the layer below, see derivation.py.
+T_2 = 216.64999999999998 # K
+P_2 = 5474.877424281043 # Pa
+RHO_2 = 0.08803468348618351 # kg/m^3
 
 lambda_2: float = -G_0/(L_2*R)
 
@@ -32,9 +30,10 @@ def density_stratosphere_2(altitude: 'NDArray') -> 'NDArray':
 
 L_3 = 2.8e-3 # K/m
 H_3 = 32000.0 # m
-T_3 = temperature_stratosphere_2(H_3) # K
-P_3 = pressure_stratosphere_2(H_3) # Pa
-RHO_3 = density_stratosphere_2(H_3) # kg/m^3
+# Base state derived from the layer below, see derivation.py.
+T_3 = 228.64999999999998 # K
+P_3 = 868.0157766202149 # Pa
+RHO_3 = 0.013224964449151338 # kg/m^3
 
 lambda_3: float = -G_0/(L_3*R)
 
@@ -0,0 +1,141 @@
+"""
+The streaming module evaluates atmosphere columns over altitude and
+airspeed data that arrives in chunks, such as flight logs that are too
+large to load at once.
+
+Each chunk is evaluated with the array functions into column buffers
+and a Workspace that are reused from chunk to chunk, so the memory used
+depends on the largest chunk and not on the length of the stream. The
+buffers are only grown when a larger chunk arrives, and the columns
+yielded for a chunk are overwritten by the next chunk, so they must be
+copied to be kept.
+"""
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from numpy import asarray, copyto, divide, empty, load
+from numpy.lib.format import open_memmap
+
+from .layers import Workspace, layer_dtype
+from .parallel import CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Columns evaluated from the altitude alone.
+ALTITUDE_COLUMNS = ('temperature', 'pressure', 'density', 'density_ratio',
+                    'viscosity', 'speed_of_sound')
+# Columns that also need the airspeed.
+AIRSPEED_COLUMNS = ('true_airspeed', 'equivalent_airspeed', 'mach')
+COLUMNS = ALTITUDE_COLUMNS + AIRSPEED_COLUMNS
+
+def stream_chunks(array: 'NDArray',
+                  chunk_size: int = CHUNK_SIZE) -> Iterator['NDArray']:
+    """
+    This function yields consecutive chunks of a flattened array, which
+    may be memory mapped, with no more than chunk_size values.
+    """
+    if chunk_size < 1:
+        raise ValueError('The chunk size must be positive.')
+    array = array.reshape(-1)
+    for start in range(0, array.size, chunk_size):
+        yield array[start:start + chunk_size]
+
+def stream_atmosphere(altitudes: Iterable['NDArray'],
+                      airspeeds: Iterable['NDArray'] | None = None,
+                      columns: tuple[str, ...] | None = None,
+                      airspeed_type: str = 'true'
+                      ) -> Iterator[dict[str, 'NDArray']]:
+    """
+    This function yields the named columns for each chunk of altitude
+    and, for the airspeed columns, of true or equivalent airspeed. By
+    default all the columns that can be evaluated are returned.
+    """
+    from . import (density, density_ratio, equivalent_airspeed, pressure,
+                   speed_of_sound, temperature, true_airspeed, viscosity)
+    functions = {'temperature': temperature, 'pressure': pressure,
+                 'density': density, 'density_ratio': density_ratio,
+                 'viscosity': viscosity, 'speed_of_sound': speed_of_sound}
+    if airspeed_type not in ('true', 'equivalent'):
+        raise ValueError("The airspeed type must be 'true' or 'equivalent'.")
+    if columns is None:
+        columns = ALTITUDE_COLUMNS if airspeeds is None else COLUMNS
+    for column in columns:
+        if column not in COLUMNS:
+            raise ValueError(f'The column {column} is not one of {COLUMNS}.')
+        if column in AIRSPEED_COLUMNS and airspeeds is None:
+            raise ValueError(f'The column {column} requires airspeeds.')
+    if airspeeds is None:
+        chunks = ((altitude, None) for altitude in altitudes)
+    else:
+        chunks = zip(altitudes, airspeeds, strict=True)
+    workspace = None
+    for altitude, airspeed in chunks:
+        altitude = asarray(altitude)
+        shape = altitude.shape
+        dtype = layer_dtype(altitude)
+        if (workspace is None or workspace.size < altitude.size or
+                workspace.dtype != dtype):
+            workspace = Workspace(altitude.size, dtype)
+            buffers = {column: empty(altitude.size, dtype=dtype)
+                       for column in columns + ('vtas', )}
+        result = {column: workspace.buffer(buffers[column], shape)
+                  for column in columns}
+        if airspeed is not None:
+            airspeed = asarray(airspeed)
+            if airspeed.shape != shape:
+                raise ValueError('The airspeed and altitude chunks must '
+                                 'have the same shape.')
+            if airspeed_type == 'true':
+                vtas = airspeed
+            else:
+                vtas = true_airspeed(altitude, airspeed,
+                                     out=workspace.buffer(buffers['vtas'],
+                                                          shape),
+                                     workspace=workspace)
+        for column, out in result.items():
+            if column in functions:
+                functions[column](altitude, out=out, workspace=workspace)
+            elif column == 'true_airspeed':
+                copyto(out, vtas)
+            elif column == 'equivalent_airspeed':
+                if airspeed_type == 'equivalent':
+                    copyto(out, airspeed)
+                else:
+                    equivalent_airspeed(altitude, vtas, out=out,
+                                        workspace=workspace)
+            else:
+                speed_of_sound(altitude, out=out, workspace=workspace)
+                divide(vtas, out, out=out)
+        yield result
+
+def stream_npy(altitude_path: str, out_paths: dict[str, str],
+               airspeed_path: str | None = None, airspeed_type: str = 'true',
+               chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    This function evaluates the columns of an altitude .npy file, and
+    optionally an airspeed .npy file, in chunks through memory maps and
+    writes each column to the .npy file given for it in out_paths.
+    """
+    altitude = load(altitude_path, mmap_mode='r')
+    airspeeds = None
+    if airspeed_path is not None:
+        airspeed = load(airspeed_path, mmap_mode='r')
+        if airspeed.shape != altitude.shape:
+            raise ValueError('The airspeed and altitude files must have '
+                             'the same shape.')
+        airspeeds = stream_chunks(airspeed, chunk_size)
+    outs = {column: open_memmap(path, mode='w+', shape=altitude.shape,
+                                dtype=layer_dtype(altitude))
+            for column, path in out_paths.items()}
+    flats = {column: out.reshape(-1) for column, out in outs.items()}
+    start = 0
+    for result in stream_atmosphere(stream_chunks(altitude, chunk_size),
+                                    airspeeds, tuple(out_paths),
+                                    airspeed_type):
+        stop = start + chunk_size
+        for column, values in result.items():
+            flats[column][start:stop] = values
+        start = stop
+    for out in outs.values():
+        out.flush()
@@ -0,0 +1,92 @@
+"""
+The thermosphere module holds the layers of the 1976 US Standard
+Atmosphere from 86 km to 1000 km geometric altitude.
+
+The temperature follows the 1976 formulas in geometric altitude: it is
+constant in layer 7, elliptical in layer 8, linear in layer 9 and tends
+exponentially to the exospheric temperature in layer 10. The mean
+molecular weight and the pressure are tabulated values of the standard,
+the pressure at the anchor altitudes only.
+"""
+
+from typing import TYPE_CHECKING
+
+from numpy import asarray, exp, sqrt, where
+
+from .constants import R_0
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Universal gas constant of the 1976 standard.
+R_STAR = 8314.32 # J/kmol/K
+# Mean molecular weight of the air below 86 km.
+M_0 = 28.9644 # kg/kmol
+
+Z_7 = 86000.0 # m
+T_7 = 186.8673 # K
+
+def temperature_thermosphere_7(altitude: 'NDArray') -> 'NDArray':
+    """This function returns the temperature given input geometric altitude."""
+    return T_7 + 0.0*asarray(altitude)
+
+Z_8 = 91000.0 # m
+T_C = 263.1905 # K
+A_8 = -76.3232 # K
+a_8 = -19942.9 # m
+
+def temperature_thermosphere_8(altitude: 'NDArray') -> 'NDArray':
+    """This function returns the temperature given input geometric altitude."""
+    return T_C + A_8*sqrt(1.0 - ((altitude - Z_8)/a_8)**2)
+
+Z_9 = 110000.0 # m
+T_9 = 240.0 # K
+L_9 = 12.0e-3 # K/m
+
+def temperature_thermosphere_9(altitude: 'NDArray') -> 'NDArray':
+    """This function returns the temperature given input geometric altitude."""
+    return T_9 + L_9*(altitude - Z_9)
+
+Z_10 = 120000.0 # m
+T_10 = 360.0 # K
+T_INF = 1000.0 # K
+lambda_10: float = L_9/(T_INF - T_10)
+
+def temperature_thermosphere_10(altitude: 'NDArray') -> 'NDArray':
+    """This function returns the temperature given input geometric altitude."""
+    xi = (altitude - Z_10)*(R_0 + Z_10)/(R_0 + altitude)
+    return T_INF - (T_INF - T_10)*exp(-lambda_10*xi)
+
+Z_11 = 1000000.0 # m
+
+def temperature_thermosphere(altitude: 'NDArray') -> 'NDArray':
+    """This function returns the temperature given input geometric altitude."""
+    altitude = asarray(altitude, dtype=float)
+    ellipse = where((altitude > Z_8) & (altitude <= Z_9), altitude, Z_8)
+    return where(altitude <= Z_8, temperature_thermosphere_7(altitude),
+                 where(altitude <= Z_9, temperature_thermosphere_8(ellipse),
+                       where(altitude <= Z_10,
+                             temperature_thermosphere_9(altitude),
+                             temperature_thermosphere_10(altitude))))
+
+# Geometric altitudes of the tabulated mean molecular weight.
+THERMOSPHERE_Z = (86000.0, 90000.0, 95000.0, 100000.0, 110000.0, 120000.0,
+                  130000.0, 140000.0, 150000.0, 160000.0, 170000.0, 180000.0,
+                  190000.0, 200000.0, 250000.0, 300000.0, 350000.0, 400000.0,
+                  450000.0, 500000.0, 550000.0, 600000.0, 650000.0, 700000.0,
+                  750000.0, 800000.0, 850000.0, 900000.0, 950000.0, 1000000.0)
+# Mean molecular weight in kg/kmol.
+THERMOSPHERE_M = (28.95, 28.91, 28.77, 28.40, 27.27, 26.20, 25.44, 24.75,
+                  24.10, 23.49, 22.90, 22.34, 21.81, 21.30, 19.19, 17.73,
+                  16.68, 15.98, 15.25, 14.33, 13.09, 11.51, 9.72, 8.00, 6.58,
+                  5.54, 4.85, 4.40, 4.12, 3.94)
+# Geometric altitudes of the anchor pressures.
+ANCHOR_Z = (86000.0, 90000.0, 100000.0, 110000.0, 120000.0, 130000.0,
+            140000.0, 150000.0, 160000.0, 170000.0, 180000.0, 190000.0,
+            200000.0, 250000.0, 300000.0, 400000.0, 450000.0, 500000.0,
+            600000.0, 800000.0, 1000000.0)
+# Anchor pressures in Pa.
+ANCHOR_P = (3.7338e-1, 1.8359e-1, 3.2011e-2, 7.1042e-3, 2.5382e-3, 1.2505e-3,
+            7.2028e-4, 4.5422e-4, 3.0395e-4, 2.1210e-4, 1.5271e-4, 1.1266e-4,
+            8.4736e-5, 2.4767e-5, 8.7704e-6, 1.4518e-6, 6.4468e-7, 3.0221e-7,
+            8.2130e-8, 1.7010e-8, 7.5138e-9)
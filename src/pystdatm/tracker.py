@@ -0,0 +1,206 @@
+"""
+The tracker module holds AtmosphereTracker, which evaluates the
+atmosphere of many vehicles along their trajectories, remembering the
+layer of each vehicle between steps.
+
+The public functions count the layer breaks below every altitude and
+gather the coefficients of its layer on every call. Along a trajectory
+the altitude of a vehicle changes slowly and rarely crosses a layer
+break, so the tracker instead holds the layer id, the bounds and the
+gathered coefficients of the layer of each vehicle. A step only checks
+each altitude against the bounds of its layer, locating the layer again
+for the few vehicles that crossed a break, and then evaluates with the
+held coefficients.
+
+The properties are evaluated in the same operations as the layers
+module, so the results are identical to those of the public functions
+with the numpy backend, for geopotential altitudes on a standard day.
+A tracker of another Atmosphere evaluates its tables and its gas
+properties, as Atmosphere does.
+"""
+
+from typing import TYPE_CHECKING
+
+from numpy import (add, asarray, empty, exp, flatnonzero, greater, inf, intp,
+                   less_equal, log1p, logical_not, multiply, power, sqrt,
+                   subtract)
+
+from .atmosphere import ISA, Atmosphere
+from .layers import (LayerTables, Workspace, layer_dtype, layer_index,
+                     layer_tables)
+from .state import AtmosphereState
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+class AtmosphereTracker():
+    """
+    This class holds the layer id, layer bounds and layer coefficients
+    of each vehicle of an array of altitudes tracked between steps.
+    """
+    __slots__ = ('shape', 'dtype', 'atmosphere', 'tables', 'bounds',
+                 'index', 'lower', 'coefficients', 'inside', 'workspace',
+                 'crossings')
+
+    def __init__(self, altitude: 'NDArray',
+                 tables: LayerTables | None = None,
+                 atmosphere: Atmosphere | None = None) -> None:
+        altitude = asarray(altitude)
+        self.shape = altitude.shape
+        self.dtype = layer_dtype(altitude)
+        # Given tables are taken to be those of the atmosphere, the
+        # standard atmosphere by default.
+        if tables is None and atmosphere is not None:
+            tables = atmosphere.layer_tables(self.dtype)
+        self.atmosphere = ISA if atmosphere is None else atmosphere
+        self.tables = layer_tables(altitude, tables)
+        breaks = self.tables.breaks
+        # The lower bound of each layer id and, in place of the breaks,
+        # the upper bound of each layer id.
+        lower = empty(breaks.size + 1, dtype=self.dtype)
+        lower[0] = -inf
+        lower[1:] = breaks
+        upper = empty(breaks.size + 1, dtype=self.dtype)
+        upper[:-1] = breaks
+        upper[-1] = inf
+        self.bounds = (lower, self.tables._replace(breaks=upper))
+        self.index = empty(self.shape, dtype=intp)
+        self.lower = empty(self.shape, dtype=self.dtype)
+        self.coefficients = LayerTables(*(empty(self.shape, dtype=self.dtype)
+                                          for _ in LayerTables._fields))
+        self.inside = empty(self.shape, dtype=bool)
+        self.workspace = Workspace(altitude.size, self.dtype)
+        self.crossings = 0
+        self.locate(altitude.astype(self.dtype, copy=False).reshape(-1),
+                    slice(None))
+        self.crossings = 0
+
+    def locate(self, altitude: 'NDArray', vehicles: 'NDArray | slice'
+               ) -> None:
+        """
+        This function locates the layers of the given vehicles from
+        their flattened altitudes and gathers the layer coefficients.
+        """
+        alt = altitude[vehicles]
+        index = layer_index(alt, out=empty(alt.shape, dtype=intp),
+                            tables=self.tables)
+        self.index.reshape(-1)[vehicles] = index
+        lower, tables = self.bounds
+        self.lower.reshape(-1)[vehicles] = lower.take(index, mode='clip')
+        for table, values in zip(tables, self.coefficients):
+            values.reshape(-1)[vehicles] = table.take(index, mode='clip')
+        self.crossings += alt.size
+
+    def update(self, altitude: 'NDArray') -> 'NDArray':
+        """
+        This function tracks the layers of the vehicles to the given
+        altitudes and returns the altitudes in the working dtype.
+        """
+        altitude = asarray(altitude, dtype=self.dtype)
+        if altitude.shape != self.shape:
+            raise ValueError('The altitudes must have the shape of the '
+                             'tracked vehicles.')
+        inside = self.inside
+        mask = self.workspace.buffer(self.workspace.mask, self.shape)
+        greater(altitude, self.lower, out=inside)
+        less_equal(altitude, self.coefficients.breaks, out=mask)
+        inside &= mask
+        # NaN altitudes fall outside of every layer and are located to
+        # id 0 on every step.
+        if not inside.all():
+            moved = flatnonzero(logical_not(inside, out=mask))
+            self.locate(altitude.reshape(-1), moved)
+        return altitude
+
+    def temperature(self, altitude: 'NDArray', out: 'NDArray | None' = None
+                    ) -> 'NDArray':
+        """
+        This function returns the temperature of the vehicles for given
+        geopotential altitudes.
+        """
+        altitude = self.update(altitude)
+        coef = self.coefficients
+        out = subtract(altitude, coef.h, out=out)
+        out *= coef.l
+        out += coef.t
+        return out
+
+    def power(self, altitude: 'NDArray', base: str, expo: str,
+              out: 'NDArray | None' = None) -> 'NDArray':
+        """
+        This function returns the pressure or density of the vehicles
+        from the named base value and exponent coefficients.
+        """
+        altitude = self.update(altitude)
+        coef = self.coefficients
+        dalt = self.workspace.buffer(self.workspace.work[0], self.shape)
+        work = self.workspace.buffer(self.workspace.work[1], self.shape)
+        subtract(altitude, coef.h, out=dalt)
+        out = multiply(coef.k, dalt, out=out)
+        log1p(out, out=out)
+        out *= getattr(coef, expo)
+        multiply(coef.delta, dalt, out=work)
+        out += work
+        exp(out, out=out)
+        out *= getattr(coef, base)
+        return out
+
+    def pressure(self, altitude: 'NDArray', out: 'NDArray | None' = None
+                 ) -> 'NDArray':
+        """
+        This function returns the pressure of the vehicles for given
+        geopotential altitudes.
+        """
+        return self.power(altitude, 'p', 'lambda_p', out=out)
+
+    def density(self, altitude: 'NDArray', out: 'NDArray | None' = None
+                ) -> 'NDArray':
+        """
+        This function returns the density of the vehicles for given
+        geopotential altitudes.
+        """
+        return self.power(altitude, 'rho', 'lambda_rho', out=out)
+
+    def state(self, altitude: 'NDArray', out: AtmosphereState | None = None
+              ) -> AtmosphereState:
+        """
+        This function returns the temperature, pressure, density,
+        viscosity and speed of sound of the vehicles for given
+        geopotential altitudes.
+        """
+        altitude = self.update(altitude)
+        if out is None:
+            out = AtmosphereState(*(empty(self.shape, dtype=self.dtype)
+                                    for _ in AtmosphereState._fields))
+        temp, pres, dens, visc, sos = out
+        coef = self.coefficients
+        dalt = self.workspace.buffer(self.workspace.work[0], self.shape)
+        log_theta = self.workspace.buffer(self.workspace.work[1], self.shape)
+        subtract(altitude, coef.h, out=dalt)
+        multiply(coef.l, dalt, out=temp)
+        temp += coef.t
+        multiply(coef.k, dalt, out=log_theta)
+        log1p(log_theta, out=log_theta)
+        dalt *= coef.delta
+        multiply(coef.lambda_p, log_theta, out=pres)
+        pres += dalt
+        exp(pres, out=pres)
+        pres *= coef.p
+        multiply(coef.lambda_rho, log_theta, out=dens)
+        dens += dalt
+        exp(dens, out=dens)
+        dens *= coef.rho
+        atmosphere = self.atmosphere
+        work = self.workspace.buffer(self.workspace.work[0], self.shape)
+        # mu = beta_s*T**1.5/(T + S)
+        power(temp, 1.5, out=visc)
+        visc *= atmosphere.beta_s
+        visc /= add(temp, atmosphere.sutherland, out=work)
+        # a = sqrt(gamma*R*T)
+        multiply(temp, atmosphere.gamma*atmosphere.gas_constant, out=sos)
+        sqrt(sos, out=sos)
+        return out
+
+    def __repr__(self) -> str:
+        return (f'AtmosphereTracker(shape={self.shape}, '
+                f'dtype={self.dtype.name})')
@@ -3,17 +3,15 @@ from typing import TYPE_CHECKING
 from numpy import exp, full, shape
 
 from .constants import G_0, R
-from .troposphere import density_troposphere as _density_before
-from .troposphere import pressure_troposphere as _pressure_before
-from .troposphere import temperature_troposphere as _temperature_before
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
 H_1 = 11000.0 # m
-T_1: float = _temperature_before(H_1) # K
-P_1: float = _pressure_before(H_1) # Pa
-RHO_1: float = _density_before(H_1) # kg/m^3
+# Base state derived from the layer below, see derivation.py.
+T_1: float = 216.64999999999998 # K
+P_1: float = 22632.040095007793 # Pa
+RHO_1: float = 0.36391764271731925 # kg/m^3
 
 delta_1: float = -G_0/(R*T_1)
 
@@ -0,0 +1,433 @@
+"""
+The upper module extends the public functions above H_7 with the
+thermosphere layers of the 1976 US Standard Atmosphere up to 1000 km
+geometric altitude, H_11 in geopotential altitude, once enabled.
+
+The upper layers are evaluated from tables on a uniform grid of 1 km in
+geometric altitude, so that the layer id of an altitude is found by a
+single division. Within each interval of the grid
+
+    log(p) = c_0 + c_1*z + c_2*z^2 + c_3*z^3, M = m_0 + m_1*z
+    T = t_0 + t_1*z + t_2*z^2 + t_3*z^3 + a*sqrt(1 - (e*(Z - Z_b))^2)
+
+with z the height above the start of the interval, and the density
+follows the gas law with the mean molecular weight M. The temperature
+is that of the 1976 formulas: the cubic is exact for layers 7 and 9,
+the square root term, which is zero outside of layer 8, gives the
+elliptical layer 8, and for the exponential layer 10 the cubic matches
+the formula and its slope at the grid points to within 1e-6 K.
+
+The pressure tables are built by integrating the hydrostatic equation
+over the tabulated mean molecular weight, with the weight scaled between
+the anchor altitudes so that the tabulated anchor pressures are matched
+exactly. The cubic matches the integrated log pressure and its slope at
+the grid points. At the anchor altitudes the density is within about
+0.25% of the 1976 tables.
+
+The temperature drops by 0.08 K at H_7 where the 1976 standard switches
+from the molecular scale temperature used below 86 km to the kinetic
+temperature. The viscosity and speed of sound follow the temperature
+as below H_7, although the standard does not define them above 86 km,
+and the functions that apply a temperature deviation, and the airspeed
+conversions, use the gas law with the sea level molecular weight, so
+they are only meaningful below H_7.
+
+Enabling the upper atmosphere wraps the active backend with one that
+fills in the altitudes above H_7, and the scalar functions with ones
+that evaluate altitudes above H_7 through the array functions while it
+is enabled. Disabling it removes the backend wrapper, whatever was
+enabled after it, and selecting a backend with set_backend replaces it.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from numpy import (arange, array, asarray, concatenate, copyto, cumsum,
+                   diff, divide, dtype, empty_like, exp, flatnonzero, float32,
+                   float64, fmax, greater, interp, intp, log, multiply, nan,
+                   put, searchsorted, sqrt, subtract, where)
+
+from .backend import Backend, add_wrapper, has_wrapper, remove_wrapper
+from .constants import G_0, H_7, R_0
+from .layers import (layer_dtype, layer_output, layer_speed_of_sound,
+                     layer_workspace)
+from .state import AtmosphereState
+from .thermosphere import (A_8, ANCHOR_P, ANCHOR_Z, L_9, R_STAR, T_7, T_9,
+                           T_10, T_C, T_INF, THERMOSPHERE_M, THERMOSPHERE_Z,
+                           Z_7, Z_8, Z_9, Z_10, Z_11, a_8, lambda_10,
+                           temperature_thermosphere)
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike, NDArray
+
+    from .layers import Workspace
+
+# Top of the upper layers in geopotential altitude.
+H_11 = R_0*Z_11/(R_0 + Z_11) # m
+# Grid spacing of the upper tables and of the hydrostatic integration.
+UPPER_STEP = 1000.0 # m
+UPPER_SUBSTEPS = 10
+# Grid of the upper tables in geometric altitude.
+UPPER_Z = arange(Z_7, Z_11 + UPPER_STEP/2.0, UPPER_STEP)
+
+class UpperTables(NamedTuple):
+    """
+    This class holds the coefficient tables of the upper layers for each
+    interval of the grid cast to a working dtype.
+    """
+    z: 'NDArray'
+    c_0: 'NDArray'
+    c_1: 'NDArray'
+    c_2: 'NDArray'
+    c_3: 'NDArray'
+    t_0: 'NDArray'
+    t_1: 'NDArray'
+    t_2: 'NDArray'
+    t_3: 'NDArray'
+    m_0: 'NDArray'
+    m_1: 'NDArray'
+    z_b: 'NDArray'
+    a: 'NDArray'
+    e: 'NDArray'
+
+def upper_cubic(value_0: 'NDArray', value_1: 'NDArray',
+                slope_0: 'NDArray', slope_1: 'NDArray'
+                ) -> tuple['NDArray', ...]:
+    """
+    This function returns the coefficients of the cubics on the grid
+    intervals that match the values and slopes at the start and end of
+    each interval.
+    """
+    step = UPPER_STEP
+    dvalue = (value_1 - value_0)/step
+    return (value_0, slope_0, (3.0*dvalue - 2.0*slope_0 - slope_1)/step,
+            (slope_0 + slope_1 - 2.0*dvalue)/step**2)
+
+def upper_pressure_grid() -> tuple['NDArray', ...]:
+    """
+    This function returns the log pressure and its slope at the start
+    and end of each interval of the upper tables, the slope from the
+    anchor interval that holds the interval.
+    """
+    fine = arange(Z_7, Z_11 + UPPER_STEP/UPPER_SUBSTEPS/2.0,
+                  UPPER_STEP/UPPER_SUBSTEPS)
+    grav = G_0*(R_0/(R_0 + fine))**2
+    rate = grav*interp(fine, THERMOSPHERE_Z, THERMOSPHERE_M)
+    rate /= R_STAR*temperature_thermosphere(fine)
+    # Integral of the hydrostatic rate of the tabulated molecular weight.
+    integral = concatenate(([0.0], cumsum(diff(fine)*(rate[1:] +
+                                                      rate[:-1])/2.0)))
+    anchor_z = array(ANCHOR_Z)
+    anchor_logp = log(array(ANCHOR_P))
+    anchor_int = interp(anchor_z, fine, integral)
+    scale = -diff(anchor_logp)/diff(anchor_int)
+    # The anchor interval of every fine point, the last point included.
+    anchor = searchsorted(anchor_z, fine, side='right') - 1
+    anchor[-1] = anchor_z.size - 2
+    logp = anchor_logp[anchor] - scale[anchor]*(integral - anchor_int[anchor])
+    coarse = slice(None, None, UPPER_SUBSTEPS)
+    interval = anchor[coarse][:-1]
+    slope_0 = -scale[interval]*rate[coarse][:-1]
+    slope_1 = -scale[interval]*rate[coarse][1:]
+    logp = logp[coarse]
+    return logp[:-1], logp[1:], slope_0, slope_1
+
+def upper_temperature_grid(altitude: 'NDArray', layer: 'NDArray'
+                           ) -> tuple['NDArray', 'NDArray']:
+    """
+    This function returns the temperature and its slope at the given
+    geometric altitudes from the formula of the given layer, leaving
+    out the elliptical term of layer 8.
+    """
+    xi = (altitude - Z_10)*(R_0 + Z_10)/(R_0 + altitude)
+    decay = (T_INF - T_10)*exp(-lambda_10*xi)
+    temp = where(layer == 7, T_7, where(layer == 8, T_C, where(
+        layer == 9, T_9 + L_9*(altitude - Z_9), T_INF - decay)))
+    slope = where(layer == 9, L_9, where(
+        layer == 10, lambda_10*decay*((R_0 + Z_10)/(R_0 + altitude))**2,
+        0.0))
+    return temp, slope
+
+def upper_tables() -> UpperTables:
+    """
+    This function returns the upper tables.
+    """
+    z = UPPER_Z[:-1]
+    layer = 7 + (z >= Z_8) + (z >= Z_9) + (z >= Z_10)
+    temp_0, slope_0 = upper_temperature_grid(z, layer)
+    temp_1, slope_1 = upper_temperature_grid(UPPER_Z[1:], layer)
+    molw = interp(UPPER_Z, THERMOSPHERE_Z, THERMOSPHERE_M)
+    ellipse = layer == 8
+    return UpperTables(
+        # Start of each interval and the cubic of the log pressure.
+        z, *upper_cubic(*upper_pressure_grid()),
+        # Cubic of the temperature, which is exact but for layer 10.
+        *upper_cubic(temp_0, temp_1, slope_0, slope_1),
+        # Mean molecular weight.
+        molw[:-1], diff(molw)/UPPER_STEP,
+        # Elliptical term of the temperature in layer 8.
+        Z_8*ellipse, A_8*ellipse, ellipse/a_8)
+
+def cast_upper_tables(tables: UpperTables,
+                      dtype: 'DTypeLike') -> UpperTables:
+    """
+    This function returns the upper tables cast to the given dtype.
+    """
+    return UpperTables(*(table.astype(dtype) for table in tables))
+
+# Tables for the supported working dtypes as for the layers below H_7.
+UPPER_TABLES = {dtype(float64): upper_tables()}
+UPPER_TABLES[dtype(float32)] = cast_upper_tables(UPPER_TABLES[dtype(float64)],
+                                                 float32)
+
+def upper_geometric(altitude: 'NDArray') -> 'NDArray':
+    """
+    This function returns the geometric altitude for a given
+    geopotential altitude above H_7, NaN above H_11.
+    """
+    altitude = asarray(altitude)
+    out = layer_output(altitude.shape, dtype=layer_dtype(altitude))
+    subtract(R_0, altitude, out=out)
+    divide(altitude, out, out=out)
+    out *= R_0
+    copyto(out, nan, where=greater(altitude, H_11))
+    return out
+
+def upper_index(altitude: 'NDArray') -> 'NDArray':
+    """
+    This function returns the interval of the upper tables for a given
+    geometric altitude, which is clipped to the tables when taken.
+    """
+    index = subtract(altitude, Z_7)
+    index /= UPPER_STEP
+    # NaN maps to the first interval and evaluates to NaN all the same.
+    fmax(index, 0.0, out=index)
+    return index.astype(intp)
+
+def upper_cubic_value(dalt: 'NDArray', index: 'NDArray',
+                      coefs: tuple['NDArray', ...],
+                      work: 'NDArray') -> 'NDArray':
+    """
+    This function returns the value of the cubics with the given
+    coefficients at a height above the start of the interval.
+    """
+    out = coefs[3].take(index, mode='clip')
+    for coef in coefs[2::-1]:
+        out *= dalt
+        out += coef.take(index, out=work, mode='clip')
+    return out
+
+def upper_interval(altitude: 'NDArray'
+                   ) -> tuple[UpperTables, 'NDArray', 'NDArray', 'NDArray']:
+    """
+    This function returns the upper tables of the working dtype, the
+    geometric altitude, the interval and the height above the start of
+    the interval for a given geopotential altitude above H_7.
+    """
+    altitude = asarray(altitude)
+    dtype = layer_dtype(altitude)
+    tables = UPPER_TABLES[dtype]
+    geometric = upper_geometric(altitude.astype(dtype, copy=False))
+    index = upper_index(geometric)
+    dalt = tables.z.take(index, mode='clip')
+    subtract(geometric, dalt, out=dalt)
+    return tables, geometric, index, dalt
+
+def upper_layer_temperature(geometric: 'NDArray', index: 'NDArray',
+                            dalt: 'NDArray', tables: UpperTables,
+                            work: 'NDArray') -> 'NDArray':
+    """
+    This function returns the temperature given input geometric
+    altitude, interval and height above the start of the interval.
+    """
+    temp = upper_cubic_value(dalt, index, tables[5:9], work)
+    # The elliptical term is zero outside of layer 8.
+    tables.z_b.take(index, out=work, mode='clip')
+    subtract(geometric, work, out=geometric)
+    geometric *= tables.e.take(index, out=work, mode='clip')
+    geometric *= geometric
+    subtract(1.0, geometric, out=geometric)
+    sqrt(geometric, out=geometric)
+    geometric *= tables.a.take(index, out=work, mode='clip')
+    temp += geometric
+    return temp
+
+def upper_temperature(altitude: 'NDArray') -> 'NDArray':
+    """
+    This function returns the temperature of the upper layers
+    for a given geopotential altitude above H_7.
+    """
+    tables, geometric, index, dalt = upper_interval(altitude)
+    return upper_layer_temperature(geometric, index, dalt, tables,
+                                   empty_like(dalt))
+
+def upper_pressure(altitude: 'NDArray') -> 'NDArray':
+    """
+    This function returns the pressure of the upper layers
+    for a given geopotential altitude above H_7.
+    """
+    tables, _, index, dalt = upper_interval(altitude)
+    pres = upper_cubic_value(dalt, index, tables[1:5], empty_like(dalt))
+    return exp(pres, out=pres)
+
+def upper_state(altitude: 'NDArray'
+                ) -> tuple['NDArray', 'NDArray', 'NDArray']:
+    """
+    This function returns the temperature, pressure and density
+    of the upper layers for a given geopotential altitude above H_7.
+    """
+    tables, geometric, index, dalt = upper_interval(altitude)
+    work = empty_like(dalt)
+    temp = upper_layer_temperature(geometric, index, dalt, tables, work)
+    pres = upper_cubic_value(dalt, index, tables[1:5], work)
+    exp(pres, out=pres)
+    dens = tables.m_1.take(index, mode='clip')
+    dens *= dalt
+    dens += tables.m_0.take(index, out=work, mode='clip')
+    dens *= pres
+    multiply(temp, R_STAR, out=work)
+    dens /= work
+    return temp, pres, dens
+
+def upper_backend(backend: Backend) -> Backend:
+    """
+    This function returns a backend that evaluates the altitudes above
+    H_7 of the given backend in the upper layers, and only the altitudes
+    at or below H_7 with the given backend.
+    """
+    def values(altitude: 'NDArray', fields: tuple[int, ...]
+               ) -> dict[int, 'NDArray']:
+        if fields == (0, ):
+            return {0: upper_temperature(altitude)}
+        if fields == (1, ):
+            return {1: upper_pressure(altitude)}
+        temp, pres, dens = upper_state(altitude)
+        if len(fields) < 5:
+            return {0: temp, 1: pres, 2: dens}
+        return {0: temp, 1: pres, 2: dens, 3: backend.viscosity(temp),
+                4: layer_speed_of_sound(temp)}
+
+    def evaluate(lower: Callable[..., Any], altitude: 'NDArray', out: Any,
+                 workspace: 'Workspace | None', fields: tuple[int, ...]
+                 ) -> Any:
+        altitude = asarray(altitude)
+        # Without altitudes above H_7 the lower backend is called alone.
+        # A NaN maximum falls through to the mask, which skips NaN.
+        if altitude.size == 0 or altitude.max() <= H_7:
+            return lower(altitude, out=out, workspace=workspace)
+        if workspace is None:
+            mask = greater(altitude, H_7)
+        else:
+            workspace = layer_workspace(altitude.shape, workspace,
+                                        layer_dtype(altitude))
+            mask = greater(altitude, H_7,
+                           out=workspace.buffer(workspace.mask,
+                                                altitude.shape))
+        # The upper altitudes are gathered and evaluated before the lower
+        # backend, which may overwrite the altitudes through out or reuse
+        # the workspace mask.
+        upper = flatnonzero(mask)
+        state = values(altitude.take(upper), fields)
+        if upper.size < altitude.size:
+            out = lower(altitude, out=out, workspace=workspace)
+        elif out is None:
+            dtype = layer_dtype(altitude)
+            out = tuple(layer_output(altitude.shape, dtype=dtype)
+                        for _ in fields)
+        for field, target in zip(fields, out):
+            put(target, upper, state[field])
+        return out
+
+    def field(name: str, index: int) -> Callable[..., 'NDArray']:
+        func = getattr(backend, name)
+
+        def lower(altitude: 'NDArray', out: tuple['NDArray'] | None,
+                  workspace: 'Workspace | None') -> tuple['NDArray']:
+            if out is not None:
+                out = out[0]
+            return (func(altitude, out=out, workspace=workspace), )
+
+        def single(altitude: 'NDArray', out: 'NDArray | None' = None,
+                   workspace: 'Workspace | None' = None) -> 'NDArray':
+            if out is not None:
+                out = (out, )
+            return evaluate(lower, altitude, out, workspace, (index, ))[0]
+        return single
+
+    def temperature_pressure(altitude: 'NDArray',
+                             out: tuple['NDArray', 'NDArray'] | None = None,
+                             workspace: 'Workspace | None' = None
+                             ) -> tuple['NDArray', 'NDArray']:
+        return evaluate(backend.temperature_pressure, altitude, out,
+                        workspace, (0, 1))
+
+    def state(altitude: 'NDArray', out: 'AtmosphereState | None' = None,
+              workspace: 'Workspace | None' = None) -> 'AtmosphereState':
+        out = evaluate(backend.state, altitude, out, workspace,
+                       (0, 1, 2, 3, 4))
+        if not isinstance(out, AtmosphereState):
+            out = AtmosphereState(*out)
+        return out
+
+    return Backend(backend.name, field('temperature', 0),
+                   field('pressure', 1), field('density', 2),
+                   temperature_pressure, backend.viscosity, state)
+
+# The scalar functions looked up by the public functions and the public
+# functions that evaluate them as arrays.
+SCALAR_FUNCTIONS = {'temperature_scalar': 'temperature',
+                    'pressure_scalar': 'pressure',
+                    'density_scalar': 'density',
+                    'density_deviation_scalar': 'density_deviation',
+                    'viscosity_scalar': 'viscosity',
+                    'speed_of_sound_scalar': 'speed_of_sound',
+                    'state_scalar': 'atmosphere_state'}
+
+def upper_scalar(func: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """
+    This function returns a scalar function that evaluates altitudes
+    above H_7 through the named public function while the upper layers
+    are enabled.
+    """
+    def evaluate(altitude: float, *args: float) -> Any:
+        if not (altitude > H_7 and upper_enabled()):
+            return func(altitude, *args)
+        public = getattr(import_module(__package__), name)
+        value = public(array([float(altitude)]), *args)
+        if isinstance(value, tuple):
+            return tuple(float(field[0]) for field in value)
+        return float(value[0])
+    evaluate.__wrapped__ = func
+    evaluate.upper = True
+    return evaluate
+
+def enable_upper_atmosphere() -> None:
+    """
+    This function enables the upper layers above H_7 up to H_11 for
+    the public functions.
+    """
+    namespace = vars(import_module(__package__))
+    for name, public in SCALAR_FUNCTIONS.items():
+        # The scalar functions pass through while the upper layers are
+        # disabled, so they are only wrapped once.
+        if not getattr(namespace[name], 'upper', False):
+            namespace[name] = upper_scalar(namespace[name], public)
+    add_wrapper('upper', upper_backend)
+
+def disable_upper_atmosphere() -> None:
+    """
+    This function disables the upper layers of the public functions.
+    """
+    remove_wrapper('upper')
+    namespace = vars(import_module(__package__))
+    for name in SCALAR_FUNCTIONS:
+        # A scalar function wrapped again since, such as by a profile,
+        # is left in place and passes through.
+        if getattr(namespace[name], 'upper', False):
+            namespace[name] = namespace[name].__wrapped__
+
+def upper_enabled() -> bool:
+    """
+    This function returns whether the upper layers are enabled.
+    """
+    return has_wrapper('upper')
@@ -0,0 +1,10 @@
+from pytest import fixture
+
+from pystdatm import available_backends, set_backend
+
+
+@fixture(autouse=True, params=available_backends())
+def backend(request):
+    set_backend(request.param)
+    yield request.param
+    set_backend('numpy')
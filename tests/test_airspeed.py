@@ -0,0 +1,109 @@
+from numpy import (array, empty, float32, isclose, linspace, meshgrid, sqrt,
+                   zeros)
+from pytest import raises
+
+from pystdatm import (Workspace, airspeed_state,
+                      calibrated_airspeed_from_mach, dynamic_pressure,
+                      equivalent_airspeed, impact_pressure,
+                      mach_from_calibrated_airspeed, mach_from_true_airspeed,
+                      pressure, speed_of_sound, true_airspeed_from_mach)
+from pystdatm.airspeed import A_0, PITOT_SONIC, impact_mach, impact_ratio
+from pystdatm.constants import GAMMA, P_0
+
+ALTITUDES, MACHS = (value.ravel() for value in
+                    meshgrid(linspace(-2000.0, 84000.0, 44),
+                             linspace(0.0, 5.0, 51)))
+DEVIATIONS = linspace(-30.0, 31.0, ALTITUDES.size)
+
+def assert_close(value, reference, rtol=1e-13):
+    assert isclose(value, reference, rtol=rtol, atol=0.0).all()
+
+def test_airspeed_0():
+    mach = linspace(0.0, 20.0, 20001)
+    assert_close(impact_mach(impact_ratio(mach)), mach, 1e-14)
+    # Both relations give the sonic pressure ratio at Mach 1.
+    sonic = impact_ratio(array([1.0 - 1e-12, 1.0, 1.0 + 1e-12]))
+    assert_close(sonic, PITOT_SONIC - 1.0, 1e-11)
+    # The Rayleigh pitot relation for a ratio of specific heats of 1.4.
+    sup = linspace(1.0, 5.0, 101)
+    assert_close(impact_ratio(sup),
+                 166.921582*sup**7/(7.0*sup**2 - 1.0)**2.5 - 1.0, 1e-7)
+
+def test_airspeed_1():
+    # The calibrated airspeed is the true airspeed at sea level.
+    vtas = linspace(0.0, 1000.0, 101)
+    assert pressure(0.0) == P_0
+    mach = mach_from_true_airspeed(zeros(vtas.size), vtas)
+    assert_close(mach, vtas/A_0)
+    assert_close(calibrated_airspeed_from_mach(zeros(vtas.size), mach), vtas,
+                 1e-12)
+
+def test_airspeed_2():
+    vcas = calibrated_airspeed_from_mach(ALTITUDES, MACHS)
+    assert_close(mach_from_calibrated_airspeed(ALTITUDES, vcas), MACHS)
+    vtas = true_airspeed_from_mach(ALTITUDES, MACHS, DEVIATIONS)
+    assert_close(vtas, MACHS*speed_of_sound(ALTITUDES, DEVIATIONS))
+    assert_close(mach_from_true_airspeed(ALTITUDES, vtas, DEVIATIONS), MACHS)
+    pres = pressure(ALTITUDES)
+    assert_close(dynamic_pressure(ALTITUDES, MACHS),
+                 GAMMA/2.0*pres*MACHS**2)
+    assert_close(impact_pressure(ALTITUDES, MACHS),
+                 pres*impact_ratio(MACHS))
+
+def test_airspeed_3():
+    # Every airspeed type gives back the same state.
+    state = airspeed_state(ALTITUDES, MACHS, 'mach', DEVIATIONS)
+    assert_close(state.true_airspeed,
+                 true_airspeed_from_mach(ALTITUDES, MACHS, DEVIATIONS))
+    assert_close(state.calibrated_airspeed,
+                 calibrated_airspeed_from_mach(ALTITUDES, MACHS))
+    assert_close(state.impact_pressure, impact_pressure(ALTITUDES, MACHS))
+    assert_close(state.dynamic_pressure, dynamic_pressure(ALTITUDES, MACHS))
+    inputs = {'true': state.true_airspeed,
+              'equivalent': state.equivalent_airspeed,
+              'calibrated': state.calibrated_airspeed}
+    for airspeed_type, airspeed in inputs.items():
+        other = airspeed_state(ALTITUDES, airspeed, airspeed_type, DEVIATIONS)
+        for value, reference in zip(other, state):
+            assert_close(value, reference, 1e-12)
+
+def test_airspeed_4():
+    # The equivalent airspeed matches on the standard day, where the
+    # density is tabulated rather than from the gas law.
+    vtas = MACHS*speed_of_sound(ALTITUDES)
+    state = airspeed_state(ALTITUDES, vtas)
+    assert_close(state.equivalent_airspeed,
+                 equivalent_airspeed(ALTITUDES, vtas), 2e-8)
+    assert_close(state.mach, MACHS)
+
+def test_airspeed_5():
+    # Altitudes broadcast against the airspeeds and deviations.
+    alt = linspace(0.0, 20000.0, 5)[:, None]
+    vcas = linspace(50.0, 400.0, 8)
+    state = airspeed_state(alt, vcas, 'calibrated', array([[-10.0], [10.0],
+                                                           [0.0], [5.0],
+                                                           [20.0]]))
+    assert state.mach.shape == (5, 8)
+    assert_close(state.mach, mach_from_calibrated_airspeed(alt, vcas))
+    out = airspeed_state(alt, vcas, 'calibrated', 0.0,
+                         out=state, workspace=Workspace(40))
+    assert out is state
+    assert_close(out.true_airspeed, true_airspeed_from_mach(alt, out.mach))
+    buffer = empty((5, 8))
+    assert mach_from_true_airspeed(alt, vcas, out=buffer) is buffer
+
+def test_airspeed_6():
+    alt = linspace(0.0, 20000.0, 11, dtype=float32)
+    state = airspeed_state(alt, linspace(0.5, 2.5, 11, dtype=float32),
+                           'mach')
+    for value in state:
+        assert value.dtype == float32
+    assert calibrated_airspeed_from_mach(alt, state.mach).dtype == float32
+    assert_close(state.equivalent_airspeed,
+                 state.true_airspeed*sqrt(state.dynamic_pressure*2.0/
+                                          (1.225*state.true_airspeed**2)),
+                 1e-5)
+
+def test_airspeed_7():
+    with raises(ValueError):
+        airspeed_state(ALTITUDES, MACHS, 'indicated')
@@ -0,0 +1,142 @@
+from numpy import (array, array_equal, float32, isclose, linspace, meshgrid,
+                   nan, shares_memory)
+from pytest import raises
+
+from pystdatm import (airspeed_state, atmosphere_state,
+                      calibrated_airspeed_from_mach, density,
+                      density_deviation, density_ratio, dynamic_pressure,
+                      equivalent_airspeed, geometric_altitude,
+                      geopotential_altitude, impact_pressure,
+                      latitude_gravity, latitude_radius, layer_workspace,
+                      mach_from_calibrated_airspeed, mach_from_true_airspeed,
+                      parallel_evaluate, pressure, speed_of_sound,
+                      temperature, true_airspeed, true_airspeed_from_mach,
+                      viscosity)
+from pystdatm.constants import G_0, R_0
+
+GEOMETRIC = linspace(-2000.0, 86000.0, 1001)
+DEVIATIONS = linspace(-20.0, 20.0, GEOMETRIC.size)
+
+def test_altitude_0():
+    alt = geopotential_altitude(GEOMETRIC)
+    assert isclose(alt, R_0*GEOMETRIC/(R_0 + GEOMETRIC), rtol=1e-15,
+                   atol=0.0).all()
+    assert isclose(geometric_altitude(alt), GEOMETRIC, rtol=1e-12,
+                   atol=1e-9).all()
+    for value, expected in zip(GEOMETRIC.tolist(), alt):
+        assert isclose(geopotential_altitude(value), expected, rtol=1e-15,
+                       atol=1e-12)
+
+def test_altitude_1():
+    # Lambert's equation gives the standard gravity and radius at the
+    # reference latitude of the standard atmosphere.
+    assert isclose(latitude_gravity(45.5425), G_0, rtol=1e-6)
+    assert isclose(latitude_radius(45.5425), R_0, rtol=1e-6)
+    assert isclose(latitude_gravity([0.0, 90.0]), [9.78036, 9.83208],
+                   rtol=1e-6).all()
+    lats, alts = meshgrid(linspace(-90.0, 90.0, 37), GEOMETRIC)
+    pot = geopotential_altitude(alts, latitude=lats)
+    assert pot.shape == lats.shape
+    assert isclose(geometric_altitude(pot, latitude=lats), alts, rtol=1e-12,
+                   atol=1e-9).all()
+    # Gravity is weaker at the equator, so the geopotential is lower.
+    assert (pot[-1, 18] < pot[-1, 0]).all()
+    assert isclose(geopotential_altitude(GEOMETRIC, latitude=45.5425),
+                   geopotential_altitude(GEOMETRIC), rtol=1e-6).all()
+
+def test_altitude_2():
+    alt = geopotential_altitude(GEOMETRIC)
+    funcs = (temperature, density, density_deviation, density_ratio,
+             viscosity, speed_of_sound, atmosphere_state)
+    for func in funcs:
+        values = func(GEOMETRIC, DEVIATIONS, altitude_type='geometric')
+        expected = func(alt, DEVIATIONS)
+        for value, other in zip(array(values).reshape(-1, alt.size),
+                                array(expected).reshape(-1, alt.size)):
+            assert isclose(value, other, rtol=1e-14, atol=0.0,
+                           equal_nan=True).all(), func.__name__
+        for geom, pot, dev in zip(GEOMETRIC.tolist()[::50],
+                                  alt.tolist()[::50],
+                                  DEVIATIONS.tolist()[::50]):
+            assert isclose(func(geom, dev, altitude_type='geometric'),
+                           func(pot, dev), rtol=1e-14, atol=0.0,
+                           equal_nan=True).all()
+    assert isclose(pressure(GEOMETRIC, altitude_type='geometric'),
+                   pressure(alt), rtol=1e-14, atol=0.0,
+                   equal_nan=True).all()
+    assert isclose(pressure(1000.0, altitude_type='geometric'),
+                   pressure(geopotential_altitude(1000.0)), rtol=1e-14)
+
+def test_altitude_3():
+    alt = geopotential_altitude(GEOMETRIC)
+    speed = linspace(50.0, 250.0, GEOMETRIC.size)
+    assert isclose(equivalent_airspeed(GEOMETRIC, speed, DEVIATIONS,
+                                       altitude_type='geometric'),
+                   equivalent_airspeed(alt, speed, DEVIATIONS),
+                   rtol=1e-14, atol=0.0, equal_nan=True).all()
+    assert isclose(true_airspeed(GEOMETRIC, speed,
+                                 altitude_type='geometric'),
+                   true_airspeed(alt, speed), rtol=1e-14, atol=0.0,
+                   equal_nan=True).all()
+    state = airspeed_state(GEOMETRIC, speed, 'calibrated',
+                           altitude_type='geometric')
+    for value, other in zip(state, airspeed_state(alt, speed, 'calibrated')):
+        assert isclose(value, other, rtol=1e-13, atol=0.0,
+                       equal_nan=True).all()
+
+def test_altitude_4():
+    # The conversion reuses the altitude buffer of the workspace.
+    workspace = layer_workspace(GEOMETRIC.shape)
+    out = temperature(GEOMETRIC, workspace=workspace,
+                      altitude_type='geometric')
+    buffer = workspace.altitude
+    temperature(GEOMETRIC, out=out, workspace=workspace,
+                altitude_type='geometric')
+    assert workspace.altitude is buffer
+    assert shares_memory(workspace.altitude_buffer(GEOMETRIC.shape), buffer)
+    alts = GEOMETRIC.astype(float32)
+    assert density(alts, altitude_type='geometric').dtype == float32
+    assert isclose(temperature(array([nan]), altitude_type='geometric'),
+                   nan, equal_nan=True).all()
+    with raises(ValueError):
+        temperature(GEOMETRIC, altitude_type='geodetic')
+    with raises(ValueError):
+        temperature(1000.0, altitude_type='geodetic')
+
+def test_altitude_5():
+    # The conversions may be evaluated in place.
+    for func in (geopotential_altitude, geometric_altitude):
+        out = GEOMETRIC.copy()
+        assert func(out, out=out) is out
+        assert array_equal(out, func(GEOMETRIC))
+
+def test_altitude_6():
+    alt = geopotential_altitude(GEOMETRIC)
+    speed = linspace(0.1, 2.0, GEOMETRIC.size)
+    funcs = (mach_from_true_airspeed, true_airspeed_from_mach,
+             impact_pressure, dynamic_pressure, calibrated_airspeed_from_mach,
+             mach_from_calibrated_airspeed)
+    for func in funcs:
+        assert isclose(func(GEOMETRIC, speed, altitude_type='geometric'),
+                       func(alt, speed), rtol=1e-13, atol=0.0,
+                       equal_nan=True).all(), func.__name__
+        assert isclose(parallel_evaluate(func, GEOMETRIC, speed,
+                                         chunk_size=100,
+                                         altitude_type='geometric'),
+                       func(alt, speed), rtol=1e-13, atol=0.0,
+                       equal_nan=True).all(), func.__name__
+    with raises(ValueError):
+        dynamic_pressure(GEOMETRIC, speed, altitude_type='geodetic')
+
+def test_altitude_7():
+    # Scalar altitudes and latitudes, and altitudes converted in place.
+    for func in (geopotential_altitude, geometric_altitude):
+        expected = func(GEOMETRIC, latitude=30.0)
+        for value, other in zip(GEOMETRIC[::100].tolist(), expected[::100]):
+            assert isclose(func(value, latitude=30.0), other, rtol=1e-15,
+                           atol=1e-12)
+            assert isclose(func(array(value), latitude=30.0), other,
+                           rtol=1e-15, atol=1e-12)
+        out = GEOMETRIC.copy()
+        assert func(out, out=out, latitude=30.0) is out
+        assert array_equal(out, expected)
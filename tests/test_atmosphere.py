@@ -0,0 +1,82 @@
+from numpy import (array_equal, diff, dtype, float32, gradient, isclose,
+                   isnan, linspace, nan)
+from pytest import raises
+
+from pystdatm import (ISA, Atmosphere, atmosphere_state, density, pressure,
+                      temperature)
+from pystdatm.constants import H_7
+from pystdatm.layers import LAYER_TABLES
+
+ALTITUDES = linspace(-2000.0, 86000.0, 1001)
+
+# A Mars like atmosphere of a troposphere and an isothermal layer above.
+MARS = Atmosphere((-8000.0, 7000.0, 60000.0), (-2.22e-3, 0.0),
+                  temperature_0=242.1, pressure_0=699.0,
+                  gas_constant=191.8, gravity=3.711, gamma=1.29,
+                  name='Mars')
+
+def test_atmosphere_0():
+    assert ISA.layer_tables(dtype(float32)) is LAYER_TABLES[dtype(float32)]
+    # The numba backends may differ from the numpy layers in the last bit.
+    for method, func in ((ISA.temperature, temperature),
+                         (ISA.pressure, pressure), (ISA.density, density)):
+        assert isclose(method(ALTITUDES), func(ALTITUDES), rtol=1e-14,
+                       atol=0.0, equal_nan=True).all()
+    for value, other in zip(ISA.state(ALTITUDES),
+                            atmosphere_state(ALTITUDES)):
+        assert isclose(value, other, rtol=1e-14, atol=0.0,
+                       equal_nan=True).all()
+    for alt in (-2001.0, H_7 + 1.0, nan):
+        assert isnan(ISA.state(alt)).all()
+    assert repr(ISA) == "Atmosphere(name='ISA', layers=7)"
+
+def test_atmosphere_1():
+    # The atmosphere is continuous and in hydrostatic equilibrium.
+    alts = linspace(-8000.0, 60000.0, 6801)
+    temp, pres, dens, _, sos = MARS.state(alts)
+    assert isclose(dens, pres/(191.8*temp), rtol=1e-14).all()
+    assert isclose(sos, (1.29*191.8*temp)**0.5, rtol=1e-15).all()
+    assert isclose(gradient(pres, alts)[1:-1], -3.711*dens[1:-1],
+                   rtol=1e-4).all()
+    assert (abs(diff(temp)) < 0.03).all()
+    assert isclose(MARS.pressure(0.0), 699.0*(1.0 - 2.22e-3*0.0/242.1))
+    assert isclose(MARS.temperature(7000.0), 242.1 - 2.22e-3*7000.0)
+    assert isnan(MARS.temperature(60001.0))
+
+def test_atmosphere_2():
+    # A hot day of the standard lapse rates from a raised base state.
+    hot = Atmosphere(ISA.breaks, ISA.lapse_rates, temperature_0=312.6,
+                     pressure_0=101325.0, base_altitude=0.0, name='hot')
+    assert isclose(hot.temperature(ALTITUDES)[:500],
+                   temperature(ALTITUDES[:500]) + 24.45, rtol=1e-14).all()
+    high = Atmosphere(ISA.breaks, ISA.lapse_rates,
+                      temperature_0=float(temperature(1000.0)),
+                      pressure_0=float(pressure(1000.0)),
+                      density_0=float(density(1000.0)), base_altitude=1000.0)
+    for value, other in zip(high.state(ALTITUDES), ISA.state(ALTITUDES)):
+        assert isclose(value, other, rtol=1e-12, equal_nan=True).all()
+
+def test_atmosphere_3():
+    alts = ALTITUDES.astype(float32)
+    values = MARS.state(alts[alts < 60000.0])
+    assert all(value.dtype == float32 for value in values)
+    assert float32 in map(lambda key: key.type, MARS.tables)
+    assert isclose(MARS.pressure(alts[alts < 60000.0]),
+                   MARS.pressure(ALTITUDES[ALTITUDES < 60000.0]),
+                   rtol=1e-5).all()
+    out = MARS.temperature(ALTITUDES)
+    assert MARS.temperature(ALTITUDES, out=out) is out
+
+def test_atmosphere_4():
+    with raises(ValueError):
+        Atmosphere((0.0, 11000.0), (-6.5e-3, 0.0))
+    with raises(ValueError):
+        Atmosphere((0.0, 11000.0, 5000.0), (-6.5e-3, 0.0))
+    with raises(ValueError):
+        Atmosphere((0.0, 11000.0), (-6.5e-3, ), base_altitude=12000.0)
+
+def test_atmosphere_5():
+    for func in (MARS.temperature, MARS.pressure, MARS.density):
+        out = ALTITUDES.copy()
+        assert func(out, out=out) is out
+        assert array_equal(out, func(ALTITUDES), equal_nan=True)
@@ -0,0 +1,23 @@
+from numpy import array_equal, linspace
+
+from pystdatm import (atmosphere_state, density, pressure, speed_of_sound,
+                      temperature, viscosity)
+
+ALTITUDES = linspace(-3000.0, 90000.0, 1001)
+
+def test_atmosphere_state_0():
+    state = atmosphere_state(ALTITUDES)
+    assert array_equal(state.temperature, temperature(ALTITUDES), equal_nan=True)
+    assert array_equal(state.pressure, pressure(ALTITUDES), equal_nan=True)
+    assert array_equal(state.density, density(ALTITUDES), equal_nan=True)
+    assert array_equal(state.viscosity, viscosity(ALTITUDES), equal_nan=True)
+    assert array_equal(state.speed_of_sound, speed_of_sound(ALTITUDES),
+                       equal_nan=True)
+
+def test_atmosphere_state_1():
+    temp, pres, dens, visc, sos = atmosphere_state(14000.0)
+    assert temp == temperature(14000.0)
+    assert pres == pressure(14000.0)
+    assert dens == density(14000.0)
+    assert visc == viscosity(14000.0)
+    assert sos == speed_of_sound(14000.0)
@@ -0,0 +1,76 @@
+from numpy import (abs, array, concatenate, empty, float32, float64, int32,
+                   int64, isnan, linspace, nan)
+from pytest import MonkeyPatch, raises
+
+import pystdatm.backend
+from pystdatm import (AtmosphereState, atmosphere_state, density,
+                      get_backend, pressure, set_backend, temperature)
+from pystdatm.backend import NUMPY_BACKEND, Workspace
+
+ALTITUDES = concatenate((linspace(-3000.0, 90000.0, 100001), [nan]))
+
+# The kernels round exp, log1p and power differently from numpy by up to
+# one ulp, which the exponent of the pressure and density amplifies.
+MAXULP = 16
+
+def ulp_difference(value, reference):
+    assert (isnan(value) == isnan(reference)).all()
+    view = int64 if value.dtype == float64 else int32
+    valid = ~isnan(reference)
+    diff = (value[valid].view(view).astype(int64) -
+            reference[valid].view(view).astype(int64))
+    return abs(diff).max()
+
+def test_backend_0(backend):
+    assert get_backend() == backend
+    for dtype in (float64, float32):
+        altitude = ALTITUDES.astype(dtype)
+        workspace = Workspace(altitude.size, dtype)
+        for func, name in ((temperature, 'temperature'),
+                           (pressure, 'pressure'), (density, 'density')):
+            reference = getattr(NUMPY_BACKEND, name)(
+                altitude, empty(altitude.shape, dtype), workspace)
+            value = func(altitude)
+            assert value.dtype == dtype
+            maxulp = 0 if name == 'temperature' else MAXULP
+            assert ulp_difference(value, reference) <= maxulp
+
+def test_backend_1():
+    altitude = ALTITUDES.reshape(2, -1)
+    out = tuple(empty(altitude.shape) for _ in range(5))
+    reference = NUMPY_BACKEND.state(altitude, out, Workspace(altitude.size))
+    result = atmosphere_state(altitude)
+    for value, expected in zip(result, reference):
+        assert value.shape == altitude.shape
+        assert ulp_difference(value.ravel(), expected.ravel()) <= MAXULP
+    assert ulp_difference(result.temperature.ravel(),
+                          reference[0].ravel()) == 0
+
+def test_backend_2():
+    # Outputs that are not contiguous are written through.
+    out = empty((ALTITUDES.size, 2))
+    result = pressure(ALTITUDES, out=out[:, 0])
+    assert result.base is out
+    assert ulp_difference(out[:, 0], pressure(ALTITUDES)) == 0
+
+def test_backend_3():
+    with raises(ValueError):
+        set_backend('fortran')
+
+def test_backend_4(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(pystdatm.backend, 'available_backends',
+                        lambda: ('numpy', ))
+    assert set_backend('numba_parallel') == 'numpy'
+    assert get_backend() == 'numpy'
+    assert temperature(array([0.0]))[0] == 288.15
+
+def test_backend_5():
+    # Outputs of another size are rejected rather than partly written.
+    altitude = ALTITUDES[:100]
+    for size in (99, 101):
+        for func in (temperature, pressure, density):
+            with raises(ValueError):
+                func(altitude, out=empty(size))
+        with raises(ValueError):
+            atmosphere_state(altitude, out=AtmosphereState(
+                *(empty(size) for _ in AtmosphereState._fields)))
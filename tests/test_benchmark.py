@@ -0,0 +1,26 @@
+from pytest import raises
+
+from pystdatm.benchmark import (compare_benchmarks, load_benchmarks,
+                                run_benchmarks, save_benchmarks)
+
+def test_benchmark_0(tmp_path):
+    results = run_benchmarks(functions=('density', 'true_airspeed'),
+                             sizes=(None, 10), repeat=1, number=1)
+    assert set(results['timings']) == {
+        'density/mixed/scalar', 'density/mixed/10',
+        'true_airspeed/mixed/scalar', 'true_airspeed/mixed/10',
+        'density/single/scalar', 'density/single/10',
+        'true_airspeed/single/scalar', 'true_airspeed/single/10'}
+    assert all(value > 0.0 for value in results['timings'].values())
+    save_benchmarks(results, tmp_path/'results.json')
+    assert load_benchmarks(tmp_path/'results.json') == results
+
+def test_benchmark_1():
+    baseline = {'timings': {'a': 1.0, 'b': 1.0, 'c': 1.0}}
+    results = {'timings': {'a': 1.2, 'b': 1.5, 'd': 9.0}}
+    assert compare_benchmarks(results, baseline) == {'b': 1.5}
+    assert compare_benchmarks(results, baseline, 1.1) == {'a': 1.2, 'b': 1.5}
+
+def test_benchmark_2():
+    with raises(ValueError):
+        run_benchmarks(distributions=('uniform', ))
@@ -0,0 +1,124 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from numpy import array_equal, empty, linspace
+from pytest import raises
+
+from pystdatm import (AtmosphereCache, atmosphere_state, density,
+                      density_deviation, disable_cache, enable_cache,
+                      get_backend, get_cache, pressure, set_backend,
+                      speed_of_sound, temperature)
+from pystdatm.backend import ACTIVE, add_wrapper, remove_wrapper
+
+ALTITUDES = linspace(-3000.0, 90000.0, 1001)
+
+def test_cache_0():
+    expected = [func(ALTITUDES) for func in (temperature, pressure, density,
+                                             speed_of_sound)]
+    cache = enable_cache()
+    assert get_cache() is cache
+    for _ in range(3):
+        for func, value in zip((temperature, pressure, density,
+                                speed_of_sound), expected):
+            assert array_equal(func(ALTITUDES), value, equal_nan=True)
+    assert cache.stats() == {'hits': 11, 'misses': 1, 'evictions': 0,
+                             'entries': 1, 'bytes': 5*ALTITUDES.nbytes}
+    disable_cache()
+    assert get_cache() is None
+
+def test_cache_1():
+    expected = density_deviation(ALTITUDES, 15.0)
+    cache = enable_cache()
+    # The deviation is applied to the cached state.
+    density_deviation(ALTITUDES, -10.0)
+    result = density_deviation(ALTITUDES, 15.0)
+    assert array_equal(result, expected, equal_nan=True)
+    assert cache.stats()['misses'] == 1
+    # Results are copies that can be modified.
+    result[:] = 0.0
+    out = empty(ALTITUDES.size)
+    assert pressure(ALTITUDES, out=out) is out
+    assert array_equal(out, pressure(ALTITUDES.copy()), equal_nan=True)
+    state = atmosphere_state(ALTITUDES)
+    state.temperature[:] = 0.0
+    assert not (temperature(ALTITUDES) == 0.0).any()
+    disable_cache()
+
+def test_cache_2():
+    # Each state of 100 altitudes takes 4000 bytes.
+    cache = enable_cache(max_bytes=10000)
+    grids = [linspace(0.0, 1000.0*i, 100) for i in range(1, 4)]
+    pressure(grids[0])
+    pressure(grids[1])
+    pressure(grids[0])
+    pressure(grids[2])
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['entries'] == 2
+    # The least recently used grid was evicted.
+    pressure(grids[0])
+    assert cache.stats()['misses'] == 3
+    pressure(grids[1])
+    assert cache.stats()['misses'] == 4
+    # States larger than the budget are evaluated but not stored.
+    pressure(ALTITUDES)
+    assert cache.stats()['bytes'] <= 10000
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+    disable_cache()
+
+def test_cache_3():
+    cache = enable_cache()
+    grids = [linspace(0.0, 1000.0*i, 1000) for i in range(1, 9)]
+    expected = [pressure(grid) for grid in grids]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(pressure, grids*20))
+    for result, value in zip(results, expected*20):
+        assert array_equal(result, value)
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 8*21
+    assert stats['entries'] == 8
+    disable_cache()
+
+def test_cache_4():
+    backend = ACTIVE['backend']
+    enable_cache()
+    assert ACTIVE['backend'] is not backend
+    disable_cache()
+    assert ACTIVE['backend'] is backend
+    enable_cache()
+    set_backend('numpy')
+    assert get_cache() is None
+    disable_cache()
+    with raises(ValueError):
+        AtmosphereCache(-1)
+
+def test_cache_5():
+    # The cache is removed from under a wrapper applied after it.
+    cache = enable_cache()
+    add_wrapper('test', lambda backend: backend._replace(name='test'))
+    try:
+        pressure(ALTITUDES)
+        disable_cache()
+        assert get_cache() is None
+        pressure(ALTITUDES)
+        assert cache.stats()['hits'] + cache.stats()['misses'] == 1
+        assert get_backend() == 'test'
+    finally:
+        remove_wrapper('test')
+    assert ACTIVE['backend'] is ACTIVE['selected']
+
+def test_cache_6():
+    # The fused temperature and pressure take a single lookup.
+    expected = temperature(ALTITUDES), pressure(ALTITUDES)
+    cache = enable_cache()
+    try:
+        temp_pres = ACTIVE['backend'].temperature_pressure
+        for value, other in zip(temp_pres(ALTITUDES), expected):
+            assert array_equal(value, other, equal_nan=True)
+        out = ALTITUDES.copy(), empty(ALTITUDES.size)
+        temp_pres(out[0], out=out)
+        for value, other in zip(out, expected):
+            assert array_equal(value, other, equal_nan=True)
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['hits'] == 1
+    finally:
+        disable_cache()
@@ -0,0 +1,81 @@
+from json import load as load_json
+
+from numpy import array, array_equal, float32, isclose, load, loadtxt
+from pytest import importorskip, raises
+
+from pystdatm import atmosphere_state, density_ratio, pressure
+from pystdatm.cli import main, range_size, table_chunks
+
+ARGS = ['--altitude', '-2000', '11000', '250', '--altitude', '11000.5',
+        '90000', '1000', '--deviation', '-15', '0', '15']
+
+def expected_table(altitude_type: str = 'geopotential') -> dict:
+    alt = [-2000.0 + 250.0*i for i in range(53)]
+    alt += [11000.5 + 1000.0*i for i in range(79)]
+    alt = array(alt).repeat(3)
+    dev = array([-15.0, 0.0, 15.0]*(alt.size//3))
+    state = atmosphere_state(alt, dev, altitude_type=altitude_type)
+    table = {'altitude': alt, 'deviation': dev, **state._asdict()}
+    table['pressure'] = pressure(alt, altitude_type=altitude_type)
+    table['density_ratio'] = density_ratio(alt, dev,
+                                           altitude_type=altitude_type)
+    return table
+
+def test_cli_0(tmp_path):
+    assert main([str(tmp_path / 'table')] + ARGS + ['--chunk-size', '7']) == 0
+    metadata = load_json(open(tmp_path / 'table' / 'metadata.json'))
+    assert metadata['rows'] == 396
+    for column, values in expected_table().items():
+        table = load(tmp_path / 'table' / f'{column}.npy', mmap_mode='r')
+        assert isclose(table, values, rtol=1e-14, atol=0.0,
+                       equal_nan=True).all(), column
+
+def test_cli_1(tmp_path):
+    # The table does not depend on the chunk size.
+    main([str(tmp_path / 'a')] + ARGS + ['--chunk-size', '5'])
+    main([str(tmp_path / 'b')] + ARGS + ['--chunk-size', '1000'])
+    for column in expected_table():
+        assert (open(tmp_path / 'a' / f'{column}.npy', 'rb').read() ==
+                open(tmp_path / 'b' / f'{column}.npy', 'rb').read())
+
+def test_cli_2(tmp_path):
+    path = tmp_path / 'table.csv'
+    main([str(path)] + ARGS + ['--properties', 'density', 'pressure',
+                               '--altitude-type', 'geometric'])
+    header = open(path).readline().strip().split(',')
+    assert header == ['altitude', 'deviation', 'density', 'pressure']
+    values = loadtxt(path, delimiter=',', skiprows=1)
+    expected = expected_table('geometric')
+    for index, column in enumerate(header):
+        assert array_equal(values[:, index], expected[column],
+                           equal_nan=True), column
+
+def test_cli_3(tmp_path):
+    main([str(tmp_path / 'table'), '--altitude', '0', '20000', '100',
+          '--dtype', 'float32', '--properties', 'temperature'])
+    table = load(tmp_path / 'table' / 'temperature.npy')
+    assert table.dtype == float32 and table.size == 201
+    assert range_size(0.0, 0.3, 0.1) == 4
+    assert range_size(0.0, 0.35, 0.1) == 4
+    chunks = list(table_chunks([(0.0, 10.0, 1.0)], chunk_size=4))
+    assert [chunk['altitude'].size for chunk in chunks] == [4, 4, 3]
+    with raises(ValueError):
+        next(table_chunks([(0.0, 10.0, 1.0)], columns=('mach', )))
+
+def test_cli_4(tmp_path):
+    for args in (['--altitude', '0', '100', '0'],
+                 ['--altitude', '100', '0', '10'],
+                 ['--altitude', '0', '100', '10', '--properties', 'mach'],
+                 ['--altitude', '0', '100', '10', '--chunk-size', '0']):
+        with raises(SystemExit):
+            main([str(tmp_path / 'table')] + args)
+
+def test_cli_5(tmp_path):
+    parquet = importorskip('pyarrow.parquet')
+    path = tmp_path / 'table.parquet'
+    main([str(path)] + ARGS + ['--chunk-size', '50'])
+    table = parquet.read_table(path)
+    assert b'pystdatm' in table.schema.metadata
+    for column, values in expected_table().items():
+        assert isclose(table[column].to_numpy(), values, rtol=1e-14,
+                       atol=0.0, equal_nan=True).all(), column
@@ -0,0 +1,97 @@
+from numpy import (array, array_equal, float32, isclose, isnan, linspace,
+                   sqrt, zeros)
+
+from pystdatm import (atmosphere_state, density, density_deviation,
+                      density_ratio, equivalent_airspeed, pressure,
+                      speed_of_sound, temperature, true_airspeed, viscosity)
+from pystdatm.constants import GAMMA, R, RHO_0
+
+ALTITUDES = linspace(-3000.0, 90000.0, 1001)
+DEVIATIONS = linspace(-30.0, 31.0, ALTITUDES.size)
+SPEEDS = linspace(50.0, 300.0, ALTITUDES.size)
+
+def test_deviation_0():
+    temp = temperature(ALTITUDES, DEVIATIONS)
+    pres = pressure(ALTITUDES)
+    assert array_equal(temp, temperature(ALTITUDES) + DEVIATIONS,
+                       equal_nan=True)
+    assert isclose(density(ALTITUDES, DEVIATIONS), pres/(R*temp),
+                   rtol=1e-15, atol=0.0, equal_nan=True).all()
+    assert isclose(speed_of_sound(ALTITUDES, DEVIATIONS), sqrt(GAMMA*R*temp),
+                   rtol=1e-15, atol=0.0, equal_nan=True).all()
+    assert isclose(density_ratio(ALTITUDES, DEVIATIONS),
+                   density(ALTITUDES, DEVIATIONS)/RHO_0,
+                   rtol=1e-15, atol=0.0, equal_nan=True).all()
+
+def test_deviation_1():
+    # Every element matches the scalar evaluation with its own deviation.
+    funcs = (temperature, density, density_deviation, density_ratio,
+             viscosity, speed_of_sound)
+    for func in funcs:
+        values = func(ALTITUDES, DEVIATIONS)
+        for alt, dev, value in zip(ALTITUDES.tolist(), DEVIATIONS.tolist(),
+                                   values):
+            assert isclose(func(alt, dev), value, rtol=1e-14, atol=0.0,
+                           equal_nan=True), func.__name__
+
+def test_deviation_2():
+    state = atmosphere_state(ALTITUDES, DEVIATIONS)
+    expected = (temperature(ALTITUDES, DEVIATIONS), pressure(ALTITUDES),
+                density(ALTITUDES, DEVIATIONS),
+                viscosity(ALTITUDES, DEVIATIONS),
+                speed_of_sound(ALTITUDES, DEVIATIONS))
+    for value, reference in zip(state, expected):
+        assert array_equal(value, reference, equal_nan=True)
+    for alt, dev in ((5000.0, 12.0), (30000.0, -40.0), (1000.0, -400.0)):
+        scalar = atmosphere_state(alt, dev)
+        array_state = atmosphere_state(array([alt]), array([dev]))
+        for value, reference in zip(scalar, array_state):
+            assert isclose(value, reference[0], rtol=1e-14, atol=0.0,
+                           equal_nan=True)
+
+def test_deviation_3():
+    veas = equivalent_airspeed(ALTITUDES, SPEEDS, DEVIATIONS)
+    sigma = density(ALTITUDES, DEVIATIONS)/RHO_0
+    assert isclose(veas, SPEEDS*sqrt(sigma), rtol=1e-15, atol=0.0,
+                   equal_nan=True).all()
+    vtas = true_airspeed(ALTITUDES, veas, DEVIATIONS)
+    valid = ~isnan(vtas)
+    assert isclose(vtas[valid], SPEEDS[valid], rtol=1e-14, atol=0.0).all()
+
+def test_deviation_4():
+    # The deviation broadcasts against the altitude.
+    altitude = ALTITUDES[::100, None]
+    deviation = array([-15.0, 0.0, 15.0])
+    result = density(altitude, deviation)
+    assert result.shape == (11, 3)
+    for j, dev in enumerate(deviation):
+        assert array_equal(result[:, j],
+                           density_deviation(altitude[:, 0], dev),
+                           equal_nan=True)
+    state = atmosphere_state(altitude, deviation)
+    assert all(value.shape == (11, 3) for value in state)
+
+def test_deviation_5():
+    # A zero deviation array follows the gas law, which matches the
+    # standard day densities to 1.5e-8.
+    assert array_equal(density(ALTITUDES, zeros(ALTITUDES.size)),
+                       density_deviation(ALTITUDES, 0.0), equal_nan=True)
+    assert isclose(density(ALTITUDES, zeros(ALTITUDES.size)),
+                   density(ALTITUDES), rtol=2e-8, atol=0.0,
+                   equal_nan=True).all()
+    # Temperatures that are not positive give NaN.
+    cold = temperature(ALTITUDES, -250.0)
+    assert (isnan(cold) == ~(temperature(ALTITUDES) > 250.0)).all()
+    assert isnan(speed_of_sound(80000.0, -300.0))
+    assert isnan(viscosity(array([80000.0]), array([-300.0]))).all()
+    assert isnan(density(array([0.0]), array([-300.0]))).all()
+
+def test_deviation_6():
+    altitude = ALTITUDES.astype(float32)
+    deviation = DEVIATIONS.astype(float32)
+    for func in (temperature, density, viscosity, speed_of_sound):
+        value = func(altitude, deviation)
+        assert value.dtype == float32
+        reference = func(ALTITUDES, DEVIATIONS)
+        assert isclose(value, reference, rtol=2e-6, atol=0.0,
+                       equal_nan=True).all()
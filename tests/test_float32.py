@@ -0,0 +1,84 @@
+from typing import TYPE_CHECKING
+
+from numpy import (abs, array, concatenate, empty, float32, float64, inf,
+                   isnan, linspace, nanmax, nextafter)
+from pytest import raises
+
+from pystdatm import (Workspace, altitude_from_density, altitude_from_pressure,
+                      atmosphere_state, density, density_deviation,
+                      density_ratio, equivalent_airspeed, geometric_altitude,
+                      pressure, speed_of_sound, temperature, true_airspeed,
+                      viscosity)
+from pystdatm.constants import H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+BOUNDARIES = array([H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7], dtype=float32)
+ALTITUDES = concatenate((
+    linspace(H_0, H_7, 100001, dtype=float32), BOUNDARIES,
+    nextafter(BOUNDARIES, float32(-inf)), nextafter(BOUNDARIES, float32(inf))
+))
+SPEEDS = linspace(50.0, 300.0, ALTITUDES.size, dtype=float32)
+
+# Maximum relative error against float64 for the same altitudes.
+TOLERANCES = (
+    (temperature, (), 2e-7),
+    (pressure, (), 2e-6),
+    (density, (), 2e-6),
+    (density_ratio, (), 2e-6),
+    (viscosity, (), 5e-7),
+    (speed_of_sound, (), 2e-7),
+    (geometric_altitude, (), 2e-7),
+    (equivalent_airspeed, (SPEEDS,), 2e-6),
+    (true_airspeed, (SPEEDS,), 2e-6),
+)
+
+def relative_error(value: 'NDArray', reference: 'NDArray') -> float:
+    assert (isnan(value) == isnan(reference)).all()
+    return nanmax(abs(value/reference - 1.0))
+
+def test_float32_0():
+    for func, args, tol in TOLERANCES:
+        value = func(ALTITUDES, *args)
+        reference = func(ALTITUDES.astype(float64),
+                         *(arg.astype(float64) for arg in args))
+        assert value.dtype == float32, func.__name__
+        assert relative_error(value, reference) < tol, func.__name__
+
+def test_float32_1():
+    value = density_deviation(ALTITUDES, 15.0)
+    reference = density_deviation(ALTITUDES.astype(float64), 15.0)
+    assert value.dtype == float32
+    assert relative_error(value, reference) < 2e-6
+
+def test_float32_2():
+    state = atmosphere_state(ALTITUDES)
+    for value, func in zip(state, (temperature, pressure, density,
+                                   viscosity, speed_of_sound)):
+        assert value.dtype == float32
+        assert (value == func(ALTITUDES))[~isnan(value)].all()
+
+def test_float32_3():
+    assert not isnan(pressure(BOUNDARIES)).any()
+    assert isnan(pressure(nextafter(BOUNDARIES[[0, -1]],
+                                    float32([-inf, inf])))).all()
+
+def test_float32_4():
+    altitude = linspace(H_0, H_7, 1001, dtype=float32)
+    for inverse, func in ((altitude_from_pressure, pressure),
+                          (altitude_from_density, density)):
+        value = inverse(func(altitude))
+        assert value.dtype == float32
+        assert nanmax(abs(value - altitude)) < 0.5
+
+def test_float32_5():
+    out = empty(ALTITUDES.size, dtype=float32)
+    workspace = Workspace(ALTITUDES.size, dtype=float32)
+    assert pressure(ALTITUDES, out=out, workspace=workspace) is out
+    with raises(ValueError):
+        pressure(ALTITUDES, workspace=Workspace(ALTITUDES.size))
+
+def test_float32_6():
+    assert temperature(float32(11000.0)).dtype == float32
+    assert temperature(array([0, 11000])).dtype == float64
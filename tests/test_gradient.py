@@ -0,0 +1,84 @@
+from numpy import (array, float32, isclose, isfinite, isnan, linspace,
+                   zeros_like)
+
+from pystdatm import (atmosphere_state, atmosphere_state_and_gradient,
+                      density_and_gradient, pressure, pressure_and_gradient,
+                      speed_of_sound_and_gradient, temperature,
+                      temperature_and_gradient, viscosity_and_gradient)
+from pystdatm.constants import H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7
+
+BREAKS = array([H_1, H_2, H_3, H_4, H_5, H_6])
+ALTITUDES = linspace(H_0 + 50.0, H_7 - 50.0, 2001)
+# Keep the finite differences clear of the layer breaks.
+ALTITUDES = ALTITUDES[abs(ALTITUDES[:, None] - BREAKS).min(axis=1) > 1.0]
+DEVIATIONS = linspace(-30.0, 30.0, ALTITUDES.size)
+STEP = 1e-3
+
+def test_gradient_0():
+    grad = atmosphere_state_and_gradient(ALTITUDES, DEVIATIONS)
+    state = atmosphere_state(ALTITUDES, DEVIATIONS)
+    upper = atmosphere_state(ALTITUDES + STEP, DEVIATIONS)
+    lower = atmosphere_state(ALTITUDES - STEP, DEVIATIONS)
+    for value, expected, dvdh, above, below in zip(grad.state, state,
+                                                   grad.altitude, upper,
+                                                   lower):
+        assert isclose(value, expected, rtol=1e-15, atol=0.0).all()
+        fdiff = (above - below)/(2*STEP)
+        assert isclose(dvdh, fdiff, rtol=1e-6, atol=1e-9*abs(value)).all()
+
+def test_gradient_1():
+    grad = atmosphere_state_and_gradient(ALTITUDES, DEVIATIONS)
+    upper = atmosphere_state(ALTITUDES, DEVIATIONS + STEP)
+    lower = atmosphere_state(ALTITUDES, DEVIATIONS - STEP)
+    for value, dvdt, above, below in zip(grad.state, grad.deviation,
+                                         upper, lower):
+        fdiff = (above - below)/(2*STEP)
+        assert isclose(dvdt, fdiff, rtol=1e-6, atol=1e-9*abs(value)).all()
+    assert (grad.deviation.temperature == 1.0).all()
+    assert (grad.deviation.pressure == 0.0).all()
+
+def test_gradient_2():
+    grad = atmosphere_state_and_gradient(ALTITUDES, DEVIATIONS)
+    funcs = (temperature_and_gradient, density_and_gradient,
+             viscosity_and_gradient, speed_of_sound_and_gradient)
+    for func, field in zip(funcs, (0, 2, 3, 4)):
+        value, dvdh, dvdt = func(ALTITUDES, DEVIATIONS)
+        assert (value == grad.state[field]).all()
+        assert (dvdh == grad.altitude[field]).all()
+        assert (dvdt == grad.deviation[field]).all()
+    value, dpdh, dpdt = pressure_and_gradient(ALTITUDES)
+    assert isclose(value, pressure(ALTITUDES), rtol=1e-14, atol=0.0).all()
+    assert (dpdh == grad.altitude.pressure).all()
+
+def test_gradient_3():
+    # The derivatives at a break are those of the layer below and the
+    # pressure derivative is continuous across it.
+    value, dtdh, _ = temperature_and_gradient(BREAKS)
+    _, below, _ = temperature_and_gradient(BREAKS - 1.0)
+    assert (dtdh == below).all()
+    _, dpdh, _ = pressure_and_gradient(BREAKS)
+    _, above, _ = pressure_and_gradient(BREAKS + 1e-6)
+    assert isclose(dpdh, above, rtol=1e-9, atol=0.0).all()
+    assert (value == temperature(BREAKS)).all()
+
+def test_gradient_4():
+    alts = array([H_0 - 1.0, H_7 + 1.0, float('nan'), 1000.0])
+    grad = atmosphere_state_and_gradient(alts, array([0.0, 0.0, 0.0, -300.0]))
+    for values in grad:
+        for field, value in enumerate(values):
+            # The pressure does not depend on the deviation.
+            assert isnan(value[:3]).all()
+            assert isnan(value[3]) != (field == 1)
+    value, dvdh, dvdt = density_and_gradient(1000.0)
+    assert isfinite(value) and dvdh < 0.0 and dvdt < 0.0
+
+def test_gradient_5():
+    alts = ALTITUDES.astype(float32)
+    grad = atmosphere_state_and_gradient(alts, 5.0)
+    expected = atmosphere_state_and_gradient(alts.astype(float), 5.0)
+    for values, others in zip(grad, expected):
+        for value, other in zip(values, others):
+            assert value.dtype == float32
+            assert isclose(value, other, rtol=1e-5,
+                           atol=1e-5*abs(other).max()).all()
+    assert (grad.deviation.pressure == zeros_like(alts)).all()
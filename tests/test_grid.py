@@ -0,0 +1,75 @@
+from numpy import array, isclose, linspace, sqrt
+from pytest import raises
+
+from pystdatm import (atmosphere_state, density_ratio, equivalent_airspeed,
+                      grid_evaluate, pressure, speed_of_sound, true_airspeed)
+
+ALTITUDES = linspace(-3000.0, 90000.0, 101)
+SPEEDS = linspace(50.0, 300.0, 7)
+MACHS = linspace(0.1, 2.0, 5)
+DEVIATIONS = array([-250.0, -30.0, 0.0, 15.0])
+
+def assert_close(value, reference, rtol=1e-14):
+    assert isclose(value, reference, rtol=rtol, atol=0.0,
+                   equal_nan=True).all()
+
+def test_grid_0():
+    grid = grid_evaluate(ALTITUDES)
+    assert grid.dims == ('altitude', )
+    assert grid.shape == ALTITUDES.shape
+    for name, value in atmosphere_state(ALTITUDES)._asdict().items():
+        assert_close(grid.data[name], value)
+    assert_close(grid.data['density_ratio'], density_ratio(ALTITUDES))
+
+def test_grid_1():
+    grid = grid_evaluate(ALTITUDES, SPEEDS, DEVIATIONS)
+    assert grid.dims == ('altitude', 'speed', 'deviation')
+    assert grid.shape == (ALTITUDES.size, SPEEDS.size, DEVIATIONS.size)
+    alt = ALTITUDES[:, None, None]
+    vtas = SPEEDS[:, None]
+    state = atmosphere_state(alt, DEVIATIONS)
+    for name, value in state._asdict().items():
+        assert grid.data[name].shape == grid.shape
+        assert_close(grid.data[name], value, 2e-15)
+    assert_close(grid.data['true_airspeed'], vtas)
+    assert_close(grid.data['equivalent_airspeed'],
+                 equivalent_airspeed(alt, vtas, DEVIATIONS))
+    assert_close(grid.data['mach'], vtas/speed_of_sound(alt, DEVIATIONS))
+
+def test_grid_2():
+    # The atmosphere properties are views that do not copy the grid.
+    grid = grid_evaluate(ALTITUDES, SPEEDS, DEVIATIONS)
+    assert grid.data['pressure'].strides[1:] == (0, 0)
+    for name in ('temperature', 'density', 'viscosity', 'speed_of_sound',
+                 'density_ratio'):
+        assert grid.data[name].strides[1] == 0
+        assert grid.data[name].base.size == ALTITUDES.size*DEVIATIONS.size
+    assert grid.data['true_airspeed'].strides[::2] == (0, 0)
+
+def test_grid_3():
+    veas = grid_evaluate(ALTITUDES, SPEEDS, speed_type='equivalent')
+    assert veas.dims == ('altitude', 'speed')
+    alt = ALTITUDES[:, None]
+    assert_close(veas.data['true_airspeed'], true_airspeed(alt, SPEEDS))
+    mach = grid_evaluate(ALTITUDES, MACHS, speed_type='mach')
+    sound = speed_of_sound(alt)
+    assert_close(mach.data['true_airspeed'], MACHS*sound)
+    assert_close(mach.data['equivalent_airspeed'],
+                 MACHS*sound*sqrt(density_ratio(alt)))
+
+def test_grid_4():
+    # Repeated altitudes give the same values as the unique ones.
+    altitude = array([11000.0, 0.0, 11000.0, 5000.0, 0.0])
+    grid = grid_evaluate(altitude, deviation=DEVIATIONS)
+    assert grid.dims == ('altitude', 'deviation')
+    assert_close(grid.data['pressure'][:, 0], pressure(altitude))
+    assert_close(grid.data['temperature'],
+                 atmosphere_state(altitude[:, None], DEVIATIONS).temperature)
+
+def test_grid_5():
+    with raises(ValueError):
+        grid_evaluate(ALTITUDES, SPEEDS, speed_type='calibrated')
+    with raises(ValueError):
+        grid_evaluate(ALTITUDES[:, None])
+    with raises(ValueError):
+        grid_evaluate(ALTITUDES, SPEEDS[:, None])
@@ -0,0 +1,65 @@
+from importlib import import_module
+from os import environ
+from pathlib import Path
+from subprocess import run
+from sys import executable
+
+from pytest import raises
+
+import pystdatm
+from pystdatm import LAZY_IMPORTS, LAZY_NAMES
+from pystdatm.derivation import bake_base_states, derive_base_states
+
+# Import time budget of the package after numpy, as a fraction of the
+# import time of numpy measured in the same runs, which is about 0.04.
+IMPORT_BUDGET = 0.1
+
+def run_python(code: str, tmp_path: Path) -> tuple[str, str]:
+    env = dict(environ, PYTHONPYCACHEPREFIX=str(tmp_path))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = run([executable, '-X', 'importtime', '-c', code], env=env,
+                 capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+def import_time(tmp_path: Path) -> float:
+    code = 'import numpy; import pystdatm'
+    # The first run writes the bytecode cache measured by the others.
+    run_python(code, tmp_path)
+    ratios = []
+    for _ in range(3):
+        times = {}
+        for line in run_python(code, tmp_path)[1].splitlines():
+            fields = line.split('|')
+            if fields[-1].strip() in ('numpy', 'pystdatm'):
+                times[fields[-1].strip()] = int(fields[1])
+        ratios.append(times['pystdatm']/times['numpy'])
+    return min(ratios)
+
+def test_import_0():
+    for module, values in derive_base_states().items():
+        layer = import_module(f'pystdatm.{module}')
+        for name, value in values.items():
+            assert getattr(layer, name) == value
+            assert type(getattr(layer, name)) is float
+
+def test_import_1():
+    for module, values in derive_base_states().items():
+        source = Path(import_module(f'pystdatm.{module}').__file__).read_text()
+        assert bake_base_states(source, values) == source
+
+def test_import_2(tmp_path):
+    modules = [f'pystdatm.{module}' for module in LAZY_IMPORTS]
+    code = ('import sys, pystdatm; '
+            f'print([m for m in {modules!r} if m in sys.modules])')
+    assert run_python(code, tmp_path)[0].strip() == '[]'
+
+def test_import_3(tmp_path):
+    assert import_time(tmp_path) < IMPORT_BUDGET
+
+def test_import_4():
+    for name, module in LAZY_NAMES.items():
+        value = getattr(import_module(f'pystdatm.{module}'), name)
+        assert getattr(pystdatm, name) is value
+        assert name in dir(pystdatm)
+    with raises(AttributeError):
+        pystdatm.not_a_name
@@ -0,0 +1,45 @@
+from numpy import array, isclose, isnan, linspace, nan, nextafter
+
+from pystdatm import (altitude_from_density, altitude_from_density_ratio,
+                      altitude_from_pressure, density, density_ratio,
+                      pressure)
+from pystdatm.constants import H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7
+
+BOUNDARIES = array([H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7])
+ALTITUDES = linspace(H_0, H_7, 100001)
+
+def test_altitude_from_pressure_0():
+    assert isclose(altitude_from_pressure(pressure(ALTITUDES)), ALTITUDES,
+                   rtol=0.0, atol=1e-9).all()
+
+def test_altitude_from_pressure_1():
+    for alt in (BOUNDARIES, nextafter(BOUNDARIES, 0.0)):
+        assert isclose(altitude_from_pressure(pressure(alt)), alt,
+                       rtol=0.0, atol=1e-9).all()
+
+def test_altitude_from_pressure_2():
+    assert isclose(altitude_from_pressure(101325.0), 0.0, atol=1e-9)
+    assert isclose(altitude_from_pressure(22632.064), 11000.0, atol=1e-3)
+
+def test_altitude_from_pressure_3():
+    pres = array([nan, 0.0, -1.0, 1.01*pressure(H_0), 0.99*pressure(H_7)])
+    assert isnan(altitude_from_pressure(pres)).all()
+
+def test_altitude_from_density_0():
+    assert isclose(altitude_from_density(density(ALTITUDES)), ALTITUDES,
+                   rtol=0.0, atol=1e-9).all()
+
+def test_altitude_from_density_1():
+    for alt in (BOUNDARIES, nextafter(BOUNDARIES, 0.0)):
+        assert isclose(altitude_from_density(density(alt)), alt,
+                       rtol=0.0, atol=1e-9).all()
+
+def test_altitude_from_density_2():
+    dens = array([nan, 0.0, 1.01*density(H_0), 0.99*density(H_7)])
+    assert isnan(altitude_from_density(dens)).all()
+
+def test_altitude_from_density_ratio_0():
+    sigma = density_ratio(ALTITUDES)
+    assert isclose(altitude_from_density_ratio(sigma), ALTITUDES,
+                   rtol=0.0, atol=1e-9).all()
+    assert isclose(altitude_from_density_ratio(1.0), 0.0, atol=1e-9)
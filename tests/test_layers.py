@@ -0,0 +1,42 @@
+from numpy import array, array_equal, inf, isclose, isnan, linspace, nan, nextafter
+
+from pystdatm import (check_layer, density_troposphere, pressure_tropopause,
+                      temperature)
+from pystdatm.constants import H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7
+from pystdatm.layers import layer_density, layer_index, layer_pressure
+
+BOUNDARIES = array([H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7])
+
+def test_layer_index_0():
+    assert array_equal(layer_index(BOUNDARIES), [1, 1, 2, 3, 4, 5, 6, 7])
+
+def test_layer_index_1():
+    below = nextafter(BOUNDARIES, -inf)
+    above = nextafter(BOUNDARIES, inf)
+    assert array_equal(layer_index(below), [0, 1, 2, 3, 4, 5, 6, 7])
+    assert array_equal(layer_index(above), [1, 2, 3, 4, 5, 6, 7, 8])
+
+def test_layer_index_2():
+    assert array_equal(layer_index([nan, -inf, inf]), [0, 0, 8])
+
+def test_layer_index_3():
+    altitude = linspace(-3000.0, 90000.0, 9301)
+    index = layer_index(altitude)
+    for layer, chk in enumerate(check_layer(altitude), start=1):
+        assert array_equal(index == layer, chk)
+
+def test_layer_pressure_0():
+    altitude = linspace(H_1, H_2, 11)
+    pres = layer_pressure(altitude, layer_index(altitude))
+    assert isclose(pres, pressure_tropopause(altitude), rtol=1e-14, atol=0.0).all()
+
+def test_layer_density_0():
+    altitude = linspace(H_0, H_1, 11)
+    dens = layer_density(altitude, layer_index(altitude))
+    assert isclose(dens, density_troposphere(altitude), rtol=1e-14, atol=0.0).all()
+
+def test_layer_temperature_0():
+    altitude = array([[H_0, H_7], [nextafter(H_0, -inf), nextafter(H_7, inf)]])
+    temp = temperature(altitude)
+    assert temp.shape == (2, 2)
+    assert isnan(temp[1]).all() and not isnan(temp[0]).any()
@@ -0,0 +1,87 @@
+import tracemalloc
+
+from numpy import array, array_equal, empty, full, isclose, linspace
+from pytest import raises
+
+from pystdatm import (AtmosphereState, Workspace, altitude_from_density,
+                      altitude_from_density_ratio, altitude_from_pressure,
+                      atmosphere_state, density, density_deviation,
+                      density_ratio, equivalent_airspeed, geometric_altitude,
+                      pressure, speed_of_sound, temperature, true_airspeed,
+                      viscosity)
+
+SIZE = 100_000
+ALTITUDES = linspace(-3000.0, 90000.0, SIZE)
+SPEEDS = full(SIZE, 100.0)
+
+PRESSURES = pressure(ALTITUDES)
+DENSITIES = density(ALTITUDES)
+
+CALLS = (
+    (temperature, (ALTITUDES,)),
+    (pressure, (ALTITUDES,)),
+    (density, (ALTITUDES,)),
+    (density_deviation, (ALTITUDES, 10.0)),
+    (density_ratio, (ALTITUDES,)),
+    (viscosity, (ALTITUDES,)),
+    (speed_of_sound, (ALTITUDES,)),
+    (geometric_altitude, (ALTITUDES,)),
+    (equivalent_airspeed, (ALTITUDES, SPEEDS)),
+    (true_airspeed, (ALTITUDES, SPEEDS)),
+    (altitude_from_pressure, (PRESSURES,)),
+    (altitude_from_density, (DENSITIES,)),
+    (altitude_from_density_ratio, (DENSITIES/1.225,)),
+)
+
+def test_out_0():
+    workspace = Workspace(SIZE)
+    for func, args in CALLS:
+        out = empty(SIZE)
+        result = func(*args, out=out, workspace=workspace)
+        assert result is out, func.__name__
+        assert array_equal(result, func(*args), equal_nan=True), func.__name__
+
+def test_out_1():
+    workspace = Workspace(SIZE)
+    out = AtmosphereState(*(empty(SIZE) for _ in AtmosphereState._fields))
+    result = atmosphere_state(ALTITUDES, out=out, workspace=workspace)
+    assert result is out
+    for value, expected in zip(result, atmosphere_state(ALTITUDES)):
+        assert array_equal(value, expected, equal_nan=True)
+
+def test_out_2():
+    workspace = Workspace(SIZE)
+    out = empty(SIZE)
+    for func, args in CALLS:
+        func(*args, out=out, workspace=workspace)
+        tracemalloc.start()
+        for _ in range(10):
+            func(*args, out=out, workspace=workspace)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Only small Python objects such as array views are allocated.
+        assert peak < 4096, func.__name__
+
+def test_out_3():
+    altitude = ALTITUDES.reshape(100, -1)
+    out = empty(altitude.shape)
+    assert pressure(altitude, out=out, workspace=Workspace(SIZE)) is out
+    assert array_equal(out, pressure(ALTITUDES).reshape(100, -1),
+                       equal_nan=True)
+
+def test_out_4():
+    with raises(ValueError):
+        density(ALTITUDES, workspace=Workspace(SIZE - 1))
+
+def test_out_5():
+    # The altitude may be evaluated in place.
+    workspace = Workspace(SIZE)
+    for func, args in CALLS[:8]:
+        out = ALTITUDES.copy()
+        result = func(out, *args[1:], out=out, workspace=workspace)
+        assert result is out, func.__name__
+        assert array_equal(out, func(*args), equal_nan=True), func.__name__
+    out = linspace(0.0, 40000.0, 5)
+    temperature(out, out=out)
+    assert isclose(out, array([288.15, 223.15, 216.65, 226.65, 251.05]),
+                   rtol=1e-14).all()
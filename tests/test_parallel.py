@@ -0,0 +1,65 @@
+import tracemalloc
+
+from numpy import array_equal, empty, float32, full, linspace
+from pytest import raises
+
+from pystdatm import (atmosphere_state, density, equivalent_airspeed,
+                      parallel_evaluate, pressure, temperature, viscosity)
+
+ALTITUDES = linspace(-3000.0, 90000.0, 10001)
+SPEEDS = full(ALTITUDES.size, 100.0)
+
+def test_parallel_0():
+    for func in (temperature, pressure, density, viscosity):
+        result = parallel_evaluate(func, ALTITUDES, workers=3, chunk_size=999)
+        assert array_equal(result, func(ALTITUDES), equal_nan=True)
+
+def test_parallel_1():
+    out = empty(ALTITUDES.size)
+    result = parallel_evaluate(equivalent_airspeed, ALTITUDES, SPEEDS,
+                               out=out, workers=2, chunk_size=1000)
+    assert result is out
+    expected = equivalent_airspeed(ALTITUDES, SPEEDS)
+    assert array_equal(result, expected, equal_nan=True)
+    result = parallel_evaluate(density, ALTITUDES, 10.0, chunk_size=1000)
+    assert array_equal(result, density(ALTITUDES, 10.0), equal_nan=True)
+
+def test_parallel_2():
+    altitude = ALTITUDES[:-1].reshape(100, 100).astype(float32)
+    result = parallel_evaluate(atmosphere_state, altitude, chunk_size=777)
+    for value, expected in zip(result, atmosphere_state(altitude)):
+        assert value.shape == altitude.shape
+        assert value.dtype == float32
+        assert array_equal(value, expected, equal_nan=True)
+
+def test_parallel_3():
+    assert parallel_evaluate(pressure, ALTITUDES[:0]).shape == (0, )
+    with raises(ValueError):
+        parallel_evaluate(pressure, ALTITUDES, chunk_size=0)
+    with raises(ValueError):
+        parallel_evaluate(equivalent_airspeed, ALTITUDES, SPEEDS[:10])
+    with raises(ValueError):
+        parallel_evaluate(pressure, ALTITUDES, out=empty((10001, 2))[:, 0])
+    with raises(ValueError):
+        parallel_evaluate(pressure, ALTITUDES, out=empty((2, 10001))[0, ::2])
+
+def test_parallel_4():
+    altitude = linspace(-2000.0, 84852.0, 200000)
+    out = empty(altitude.size)
+    tracemalloc.start()
+    parallel_evaluate(pressure, altitude, out=out, workers=2, chunk_size=1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Two workspaces of a thousand altitudes, far less than the input.
+    assert peak < 200000
+
+def test_parallel_5():
+    # A scalar deviation of 0.0 is the standard day, as it is serially.
+    for func in (density, temperature):
+        result = parallel_evaluate(func, ALTITUDES, 0.0, workers=2,
+                                   chunk_size=1000)
+        assert array_equal(result, func(ALTITUDES, 0.0), equal_nan=True)
+    result = parallel_evaluate(equivalent_airspeed, ALTITUDES, 100.0, 0.0,
+                               workers=2, chunk_size=1000)
+    assert array_equal(result, equivalent_airspeed(ALTITUDES, 100.0, 0.0),
+                       equal_nan=True)
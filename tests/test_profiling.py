@@ -0,0 +1,111 @@
+from json import loads
+
+from numpy import array, array_equal, isnan, linspace
+
+import pystdatm
+from pystdatm import (atmosphere_state, density, density_ratio,
+                      disable_cache, disable_upper_atmosphere, enable_cache,
+                      enable_upper_atmosphere, get_cache, pressure, profile,
+                      temperature, viscosity)
+from pystdatm.backend import ACTIVE
+
+ALTITUDES = linspace(-3000.0, 90000.0, 1001)
+
+def test_profiling_0(backend):
+    with profile() as prof:
+        values = pressure(ALTITUDES)
+        pressure(ALTITUDES[:10])
+        density_ratio(ALTITUDES)
+    assert array_equal(values, pressure(ALTITUDES), equal_nan=True)
+    records = prof.as_dict()
+    assert set(records) == {'pressure', 'density_ratio'}
+    record = records['pressure']
+    assert record['calls'] == 2
+    assert record['elements'] == 1011
+    assert sum(record['layers']) == 1011
+    assert record['layers'][0] == 11 + 10
+    assert record['layers'][8] == 56
+    if backend == 'numpy':
+        assert set(record['stages']) == {'layer_index', 'layer_pressure'}
+    else:
+        assert set(record['stages']) == {'numba_kernel'}
+    assert all(time >= 0.0 for time in record['stages'].values())
+
+def test_profiling_1():
+    with profile() as prof:
+        temperature(1000.0)
+        temperature(90000.0)
+        density(5000.0, 10.0)
+        viscosity(ALTITUDES)
+        atmosphere_state(ALTITUDES)
+    records = loads(prof.to_json())
+    assert records['temperature']['calls'] == 2
+    assert records['temperature']['layers'] == [0, 1, 0, 0, 0, 0, 0, 0, 1]
+    assert set(records['temperature']['stages']) == {'scalar'}
+    assert records['density']['calls'] == 1
+    # The viscosity evaluates the temperature then the viscosity.
+    assert records['viscosity']['calls'] == 2
+    assert records['atmosphere_state']['elements'] == ALTITUDES.size
+
+def test_profiling_2(tmp_path):
+    backend = ACTIVE['backend']
+    scalar = pystdatm.temperature_scalar
+    with profile() as prof:
+        assert ACTIVE['backend'] is not backend
+        assert pystdatm.temperature_scalar is not scalar
+        temperature(array([0.0]))
+    # Nothing is left instrumented outside of the context.
+    assert ACTIVE['backend'] is backend
+    assert pystdatm.temperature_scalar is scalar
+    temperature(array([0.0]))
+    assert prof.as_dict()['temperature']['calls'] == 1
+    prof.to_json(tmp_path/'profile.json')
+    assert loads((tmp_path/'profile.json').read_text()) == prof.as_dict()
+
+def test_profiling_3(backend):
+    # The profile records the backend in use with the features enabled.
+    alt = array([50000.0, 90000.0, 200000.0])
+    enable_upper_atmosphere()
+    enable_cache()
+    try:
+        expected = temperature(alt)
+        assert not isnan(expected).any()
+        cache = get_cache()
+        hits, misses = cache.hits, cache.misses
+        with profile() as prof:
+            assert array_equal(temperature(alt), expected)
+            pressure(alt + 1.0)
+            assert temperature(alt[2]) == expected[2]
+        # The upper scalar is evaluated as a one altitude array, recorded
+        # as both a scalar and a backend evaluation.
+        assert cache.hits == hits + 1
+        assert cache.misses == misses + 2
+        assert get_cache() is cache
+        records = prof.as_dict()
+        assert set(records['temperature']['stages']) == {'backend',
+                                                         'scalar'}
+        assert records['temperature']['calls'] == 3
+        assert records['pressure']['elements'] == 3
+        assert array_equal(temperature(alt), expected)
+        assert cache.hits == hits + 2
+    finally:
+        disable_cache()
+        disable_upper_atmosphere()
+    assert ACTIVE['backend'] is ACTIVE['selected']
+
+def test_profiling_4():
+    backend = ACTIVE['backend']
+    with profile() as outer:
+        with profile() as inner:
+            pressure(ALTITUDES)
+        pressure(ALTITUDES)
+    assert ACTIVE['backend'] is backend
+    assert outer.as_dict()['pressure']['calls'] == 2
+    assert inner.as_dict()['pressure']['calls'] == 1
+
+def test_profiling_5(monkeypatch):
+    # Without stack frame introspection the caller is not named.
+    monkeypatch.setattr(pystdatm.profiling, 'currentframe', lambda: None)
+    with profile() as prof:
+        pressure(ALTITUDES)
+    assert set(prof.as_dict()) == {pystdatm.profiling.UNKNOWN_CALLER}
@@ -0,0 +1,41 @@
+from numpy import array, isclose, isnan, linspace, nextafter
+
+from pystdatm import (atmosphere_state, density, density_deviation,
+                      density_ratio, pressure, speed_of_sound, temperature,
+                      viscosity)
+from pystdatm.constants import H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7
+
+BOUNDARIES = array([H_0, H_1, H_2, H_3, H_4, H_5, H_6, H_7])
+ALTITUDES = sorted(linspace(H_0, H_7, 997).tolist() + BOUNDARIES.tolist() +
+                   nextafter(BOUNDARIES, 0.0).tolist())
+
+FUNCTIONS = (temperature, pressure, density, density_ratio,
+             viscosity, speed_of_sound)
+
+def test_scalar_0():
+    for func in FUNCTIONS:
+        values = func(array(ALTITUDES))
+        for alt, value in zip(ALTITUDES, values):
+            result = func(alt)
+            assert isinstance(result, float)
+            assert isclose(result, value, rtol=1e-15, atol=0.0)
+
+def test_scalar_1():
+    values = density_deviation(array(ALTITUDES), 15.0)
+    for alt, value in zip(ALTITUDES, values):
+        assert isclose(density_deviation(alt, 15.0), value, rtol=1e-15, atol=0.0)
+
+def test_scalar_2():
+    states = atmosphere_state(array(ALTITUDES))
+    for i, alt in enumerate(ALTITUDES):
+        for result, value in zip(atmosphere_state(alt), states):
+            assert isclose(result, value[i], rtol=1e-15, atol=0.0)
+
+def test_scalar_3():
+    for func in FUNCTIONS:
+        assert isnan(func(nextafter(H_0, -1e9)))
+        assert isnan(func(nextafter(H_7, 1e9)))
+        assert isnan(func(float('nan')))
+
+def test_scalar_4():
+    assert temperature(11000) == temperature(11000.0)
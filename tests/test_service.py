@@ -0,0 +1,126 @@
+from asyncio import gather, run, sleep
+
+from numpy import array_equal, float32, isclose, isnan, linspace, nan
+from pytest import raises
+
+from pystdatm import (AsyncAtmosphere, airspeed_state, atmosphere_state,
+                      density, equivalent_airspeed, pressure, temperature)
+
+ALTITUDES = linspace(-3000.0, 90000.0, 1001)
+
+async def evaluate_all(service, *args):
+    async with service:
+        return await gather(*(service.evaluate(*values)
+                              for values in zip(*args)))
+
+def test_service_0():
+    service = AsyncAtmosphere(batch_window=0.01)
+    results = run(evaluate_all(service, ALTITUDES.tolist()))
+    assert service.batches == 1
+    assert service.requests == ALTITUDES.size
+    # The numba backends may differ from the numpy layers in the last bit.
+    assert isclose(results, density(ALTITUDES), rtol=1e-14, atol=0.0,
+                   equal_nan=True).all()
+    assert all(result.shape == () for result in results)
+
+def test_service_1():
+    service = AsyncAtmosphere(pressure, batch_window=0.2, max_batch=100)
+    results = run(evaluate_all(service, ALTITUDES.tolist()))
+    assert service.batches == 11
+    assert array_equal(results, pressure(ALTITUDES), equal_nan=True)
+    altitude = ALTITUDES[:-1].reshape(10, 100)
+    service = AsyncAtmosphere(pressure, max_batch=250)
+    results = run(evaluate_all(service, altitude))
+    assert service.batches == 4
+    for result, expected in zip(results, pressure(altitude)):
+        assert result.shape == (100, )
+        assert array_equal(result, expected, equal_nan=True)
+
+def test_service_2():
+    deviations = linspace(-20.0, 20.0, ALTITUDES.size)
+    service = AsyncAtmosphere(batch_window=0.01)
+    results = run(evaluate_all(service, ALTITUDES, deviations))
+    assert array_equal(results, density(ALTITUDES, deviations),
+                       equal_nan=True)
+    service = AsyncAtmosphere(temperature, batch_window=0.01)
+    results = run(evaluate_all(service, ALTITUDES, [10.0]*ALTITUDES.size))
+    assert service.batches == 1
+    assert array_equal(results, temperature(ALTITUDES, 10.0),
+                       equal_nan=True)
+
+def test_service_3():
+    altitude = ALTITUDES.astype(float32).reshape(7, 143)
+    service = AsyncAtmosphere(atmosphere_state, batch_window=0.01)
+    results = run(evaluate_all(service, altitude))
+    expected = atmosphere_state(altitude)
+    for row, result in enumerate(results):
+        for value, other in zip(result, expected):
+            assert value.dtype == float32
+            assert array_equal(value, other[row], equal_nan=True)
+
+def test_service_4():
+    async def requests(service):
+        async with service:
+            first = service.evaluate(1000.0)
+            await sleep(0.0)
+            # A request of another number of arguments starts a batch.
+            second = service.evaluate(1000.0, 10.0)
+            return await gather(first, second)
+
+    service = AsyncAtmosphere(batch_window=0.01)
+    results = run(requests(service))
+    assert service.batches == 2
+    assert isclose(results, [density(1000.0), density(1000.0, 10.0)],
+                   rtol=1e-14).all()
+
+def test_service_5():
+    async def failing(service):
+        async with service:
+            with raises(ValueError):
+                await service.evaluate(ALTITUDES, ALTITUDES[:10])
+            with raises(TypeError):
+                await service.evaluate(1000.0, 1.0, 2.0, 3.0, 4.0, 5.0)
+
+    run(failing(AsyncAtmosphere()))
+    with raises(ValueError):
+        AsyncAtmosphere(batch_window=-1.0)
+    with raises(ValueError):
+        AsyncAtmosphere(max_batch=0)
+    assert repr(AsyncAtmosphere()) == ('AsyncAtmosphere(func=density, '
+                                       'batch_window=0.0005, '
+                                       'max_batch=65536)')
+
+def test_service_6():
+    # A bad request fails alone, not the requests batched with it.
+    def checked(altitude, *args):
+        if isnan(altitude).any():
+            raise ValueError('The altitude must not be NaN.')
+        return temperature(altitude, *args)
+
+    async def requests(service):
+        async with service:
+            return await gather(service.evaluate(1000.0),
+                                service.evaluate('x'),
+                                service.evaluate(nan),
+                                service.evaluate([2000.0, 3000.0]),
+                                return_exceptions=True)
+
+    service = AsyncAtmosphere(checked, batch_window=0.01)
+    first, bad, nans, last = run(requests(service))
+    assert isinstance(bad, ValueError) and isinstance(nans, ValueError)
+    assert first == temperature(1000.0)
+    assert array_equal(last, temperature([2000.0, 3000.0]))
+    assert service.requests == 2
+
+def test_service_7():
+    # Functions of further arguments are warmed up on the first batch.
+    speeds = linspace(50.0, 250.0, ALTITUDES.size)
+    service = AsyncAtmosphere(equivalent_airspeed, batch_window=0.01)
+    assert not service.warm
+    results = run(evaluate_all(service, ALTITUDES.tolist(), speeds.tolist()))
+    assert service.warm
+    assert isclose(results, equivalent_airspeed(ALTITUDES, speeds),
+                   rtol=1e-14, equal_nan=True).all()
+    service = AsyncAtmosphere(airspeed_state)
+    state = run(evaluate_all(service, [1000.0], [100.0]))[0]
+    assert isclose(state.true_airspeed, 100.0)
@@ -0,0 +1,151 @@
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+from numpy import (array_equal, empty, float32, full, isclose, isnan,
+                   linspace, shares_memory)
+from pytest import raises
+
+from pystdatm import (AtmosphereState, SharedBuffer, atmosphere_state,
+                      attach_buffer, buffer_array, buffer_evaluate, density,
+                      disable_cache, disable_upper_atmosphere, enable_cache,
+                      enable_upper_atmosphere, equivalent_airspeed,
+                      geopotential_altitude, pressure, process_evaluate,
+                      shared_buffer, temperature)
+
+ALTITUDES = linspace(-3000.0, 90000.0, 10001)
+SPEEDS = full(ALTITUDES.size, 100.0)
+
+def test_shared_0():
+    out = bytearray(ALTITUDES.nbytes)
+    result = buffer_evaluate(pressure, memoryview(ALTITUDES), out=out,
+                             chunk_size=999)
+    assert shares_memory(result, buffer_array(out))
+    assert array_equal(buffer_array(out), pressure(ALTITUDES),
+                       equal_nan=True)
+    out = empty(ALTITUDES.size)
+    result = buffer_evaluate(equivalent_airspeed, ALTITUDES.data,
+                             SPEEDS.data, 10.0, out=out, chunk_size=1000)
+    assert shares_memory(result, out)
+    assert array_equal(out, equivalent_airspeed(ALTITUDES, SPEEDS, 10.0),
+                       equal_nan=True)
+
+def test_shared_1():
+    altitude = ALTITUDES.astype(float32)
+    out = AtmosphereState(*(bytearray(altitude.nbytes)
+                            for _ in AtmosphereState._fields))
+    result = buffer_evaluate(atmosphere_state, altitude, out=out,
+                             chunk_size=777, dtype=float32)
+    for value, buffer, expected in zip(result, out,
+                                       atmosphere_state(altitude)):
+        assert value.dtype == float32
+        assert shares_memory(value, buffer_array(buffer, float32))
+        assert array_equal(value, expected, equal_nan=True)
+
+def test_shared_2():
+    # The memory used is bounded by the chunk size, not the input size.
+    peaks = []
+    for size in (100000, 400000):
+        altitude = linspace(-2000.0, 84852.0, size)
+        deviation = linspace(-20.0, 20.0, size)
+        out = empty(size)
+        tracemalloc.start()
+        buffer_evaluate(density, altitude, deviation, out=out,
+                        chunk_size=1000)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+    assert peaks[1] < 200000
+    assert peaks[1] < 2*peaks[0]
+
+def test_shared_3():
+    memories = [SharedMemory(create=True, size=ALTITUDES.nbytes)
+                for _ in range(1 + 1 + len(AtmosphereState._fields))]
+    try:
+        alt_buf, temp_buf, *state_bufs = (
+            shared_buffer(memory, ALTITUDES.shape) for memory in memories)
+        buffer_array(memories[0].buf)[:] = ALTITUDES
+        context = get_context('spawn')
+        with ProcessPoolExecutor(2, mp_context=context) as executor:
+            process_evaluate(temperature, alt_buf, 10.0, out=temp_buf,
+                             chunk_size=1000, executor=executor)
+            process_evaluate(atmosphere_state, alt_buf,
+                             out=AtmosphereState(*state_bufs), workers=3,
+                             chunk_size=1000, executor=executor)
+        assert array_equal(buffer_array(memories[1].buf),
+                           temperature(ALTITUDES, 10.0), equal_nan=True)
+        for memory, expected in zip(memories[2:],
+                                    atmosphere_state(ALTITUDES)):
+            assert isclose(buffer_array(memory.buf), expected, rtol=1e-14,
+                           atol=0.0, equal_nan=True).all()
+        memory, array = attach_buffer(temp_buf)
+        assert array.shape == ALTITUDES.shape
+        del array
+        memory.close()
+    finally:
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+
+def test_shared_4():
+    with raises(ValueError):
+        buffer_evaluate(pressure, ALTITUDES, out=bytes(ALTITUDES.nbytes))
+    with raises(ValueError):
+        buffer_evaluate(pressure, ALTITUDES.astype(float32),
+                        out=empty(ALTITUDES.size))
+    with raises(ValueError):
+        buffer_evaluate(pressure, ALTITUDES[::2], out=empty(5001))
+    with raises(ValueError):
+        buffer_evaluate(pressure, ALTITUDES, out=empty(ALTITUDES.size),
+                        chunk_size=0)
+    with raises(ValueError):
+        buffer_evaluate(equivalent_airspeed, ALTITUDES, SPEEDS[:10],
+                        out=empty(ALTITUDES.size))
+    memory = SharedMemory(create=True, size=800)
+    try:
+        with raises(ValueError):
+            shared_buffer(memory, (101, ))
+        buffer = shared_buffer(memory, (10, 10), float32)
+        assert buffer == SharedBuffer(memory.name, (10, 10), '<f4')
+        with raises(ValueError):
+            process_evaluate(pressure, buffer,
+                             out=shared_buffer(memory, (100, )))
+    finally:
+        memory.close()
+        memory.unlink()
+
+def test_shared_5():
+    # Keyword arguments are passed on to the function.
+    out = empty(ALTITUDES.size)
+    buffer_evaluate(pressure, ALTITUDES, out=out, chunk_size=1000,
+                    altitude_type='geometric')
+    assert isclose(out, pressure(geopotential_altitude(ALTITUDES)),
+                   rtol=1e-14, atol=0.0, equal_nan=True).all()
+
+def test_shared_6():
+    # The workers evaluate with the features enabled in this process.
+    altitude = linspace(80000.0, 200000.0, 1001)
+    memories = [SharedMemory(create=True, size=altitude.nbytes)
+                for _ in range(2)]
+    enable_upper_atmosphere()
+    enable_cache()
+    try:
+        alt_buf, out_buf = (shared_buffer(memory, altitude.shape)
+                            for memory in memories)
+        buffer_array(memories[0].buf)[:] = altitude
+        context = get_context('spawn')
+        with ProcessPoolExecutor(2, mp_context=context) as executor:
+            process_evaluate(density, alt_buf, out=out_buf, chunk_size=100,
+                             executor=executor)
+        expected = buffer_evaluate(density, altitude,
+                                   out=empty(altitude.size), chunk_size=100)
+        assert not isnan(expected).any()
+        assert isclose(buffer_array(memories[1].buf), expected, rtol=1e-14,
+                       atol=0.0).all()
+    finally:
+        disable_cache()
+        disable_upper_atmosphere()
+        for memory in memories:
+            memory.close()
+            memory.unlink()
@@ -0,0 +1,93 @@
+import tracemalloc
+
+from numpy import array_equal, concatenate, float32, linspace, load, save
+from pytest import raises
+
+from pystdatm import (density, density_ratio, equivalent_airspeed, pressure,
+                      speed_of_sound, stream_atmosphere, stream_chunks,
+                      stream_npy, temperature, true_airspeed)
+
+ALTITUDES = linspace(-3000.0, 90000.0, 10001)
+SPEEDS = linspace(50.0, 300.0, ALTITUDES.size)
+
+def collect(results, column):
+    return concatenate([result[column].copy() for result in results])
+
+def test_streaming_0():
+    results = [{column: value.copy() for column, value in result.items()}
+               for result in stream_atmosphere(stream_chunks(ALTITUDES, 1000))]
+    assert len(results) == 11
+    assert array_equal(collect(results, 'temperature'),
+                       temperature(ALTITUDES), equal_nan=True)
+    results = stream_atmosphere(stream_chunks(ALTITUDES, 1000))
+    values = concatenate([result['pressure'].copy() for result in results])
+    assert array_equal(values, pressure(ALTITUDES), equal_nan=True)
+
+def test_streaming_1():
+    results = [{column: value.copy() for column, value in result.items()}
+               for result in stream_atmosphere(stream_chunks(ALTITUDES, 999),
+                                               stream_chunks(SPEEDS, 999))]
+    veas = equivalent_airspeed(ALTITUDES, SPEEDS)
+    mach = SPEEDS/speed_of_sound(ALTITUDES)
+    assert array_equal(collect(results, 'true_airspeed'), SPEEDS)
+    assert array_equal(collect(results, 'equivalent_airspeed'), veas,
+                       equal_nan=True)
+    assert array_equal(collect(results, 'mach'), mach, equal_nan=True)
+
+def test_streaming_2():
+    columns = ('density_ratio', 'true_airspeed', 'equivalent_airspeed')
+    results = [{column: value.copy() for column, value in result.items()}
+               for result in stream_atmosphere(stream_chunks(ALTITUDES, 999),
+                                               stream_chunks(SPEEDS, 999),
+                                               columns, 'equivalent')]
+    assert tuple(results[0]) == columns
+    assert array_equal(collect(results, 'density_ratio'),
+                       density_ratio(ALTITUDES), equal_nan=True)
+    assert array_equal(collect(results, 'true_airspeed'),
+                       true_airspeed(ALTITUDES, SPEEDS), equal_nan=True)
+    assert array_equal(collect(results, 'equivalent_airspeed'), SPEEDS)
+
+def test_streaming_3():
+    # The column buffers are reused between chunks of the same size.
+    results = stream_atmosphere(stream_chunks(ALTITUDES[:4000], 1000),
+                                columns=('density', ))
+    first = next(results)['density']
+    second = next(results)['density']
+    assert first is not second
+    assert first.__array_interface__ == second.__array_interface__
+
+def test_streaming_4(tmp_path):
+    altitude = ALTITUDES.astype(float32)
+    save(tmp_path/'altitude.npy', altitude)
+    save(tmp_path/'speed.npy', SPEEDS)
+    out_paths = {'density': tmp_path/'density.npy',
+                 'mach': tmp_path/'mach.npy'}
+    stream_npy(tmp_path/'altitude.npy', out_paths,
+               airspeed_path=tmp_path/'speed.npy', chunk_size=777)
+    rho = load(tmp_path/'density.npy')
+    assert rho.dtype == float32
+    assert array_equal(rho, density(altitude), equal_nan=True)
+    mach = load(tmp_path/'mach.npy')
+    expected = (SPEEDS/speed_of_sound(altitude)).astype(float32)
+    assert array_equal(mach, expected, equal_nan=True)
+
+def test_streaming_5():
+    # The memory used does not grow with the length of the stream.
+    altitude = linspace(-2000.0, 84852.0, 200000)
+    tracemalloc.start()
+    for _ in stream_atmosphere(stream_chunks(altitude, 1000),
+                               columns=('density', 'viscosity')):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 100000
+
+def test_streaming_6():
+    with raises(ValueError):
+        next(stream_atmosphere(stream_chunks(ALTITUDES), columns=('mach', )))
+    with raises(ValueError):
+        next(stream_atmosphere(stream_chunks(ALTITUDES), columns=('rho', )))
+    with raises(ValueError):
+        next(stream_atmosphere(stream_chunks(ALTITUDES), [SPEEDS[:10]]))
+    with raises(ValueError):
+        next(stream_chunks(ALTITUDES, 0))
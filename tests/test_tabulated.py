@@ -0,0 +1,40 @@
+from numpy import abs, array, array_equal, isnan, linspace, nan
+
+from pystdatm import TabulatedAtmosphere, atmosphere_state
+from pystdatm.constants import H_0, H_7
+
+ALTITUDES = linspace(H_0, H_7, 200001)
+
+def max_relative_error(tabatm: TabulatedAtmosphere) -> list[float]:
+    exact = atmosphere_state(ALTITUDES)
+    approx = tabatm.atmosphere_state(ALTITUDES)
+    return [abs(a/e - 1.0).max() for a, e in zip(approx, exact)]
+
+def test_tabulated_0():
+    errors = max_relative_error(TabulatedAtmosphere())
+    assert errors[0] < 1e-15
+    assert max(errors) < 3e-10
+
+def test_tabulated_1():
+    assert max(max_relative_error(TabulatedAtmosphere(1000.0))) < 3e-6
+    assert max(max_relative_error(TabulatedAtmosphere(250.0))) < 2e-8
+
+def test_tabulated_2():
+    tabatm = TabulatedAtmosphere()
+    values = tabatm.pressure(array([nan, H_0 - 1e-3, H_7 + 1e-3, H_7 + 40.0]))
+    assert isnan(values).all()
+    assert not isnan(tabatm.density(array([H_0, H_7]))).any()
+
+def test_tabulated_3(tmp_path):
+    tabatm = TabulatedAtmosphere(300.0)
+    assert tabatm.step == 250.0
+    path = tmp_path / 'table.npz'
+    tabatm.save(path)
+    loaded = TabulatedAtmosphere.load(path)
+    assert loaded.step == tabatm.step
+    assert array_equal(loaded.density(ALTITUDES), tabatm.density(ALTITUDES))
+
+def test_tabulated_4():
+    tabatm = TabulatedAtmosphere()
+    assert tabatm.temperature(14000.0).shape == ()
+    assert tabatm.speed_of_sound(ALTITUDES.reshape(-1, 1)).shape == (200001, 1)
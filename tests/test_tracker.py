@@ -0,0 +1,86 @@
+from numpy import (array_equal, dtype, empty, float32, isclose, linspace, nan,
+                   sin)
+from pytest import raises
+
+from pystdatm import (Atmosphere, AtmosphereTracker, atmosphere_state,
+                      density, layer_index, pressure, temperature)
+
+# Vehicles climbing, descending and oscillating through all the layers.
+STEPS = linspace(0.0, 1.0, 501)
+START = linspace(-2500.0, 90000.0, 200)
+
+def trajectory(step):
+    alt = START + 40000.0*sin(6.0*step + START/10000.0)
+    alt[::37] = nan
+    return alt
+
+def same(value, expected, backend):
+    # The numba backends may differ from the numpy layers in the last bit.
+    if backend == 'numpy':
+        return array_equal(value, expected, equal_nan=True)
+    return isclose(value, expected, rtol=1e-14, atol=0.0,
+                   equal_nan=True).all()
+
+def test_tracker_0(backend):
+    tracker = AtmosphereTracker(trajectory(0.0))
+    for step in STEPS:
+        alt = trajectory(step)
+        assert same(tracker.temperature(alt), temperature(alt), backend)
+        assert same(tracker.pressure(alt), pressure(alt), backend)
+        assert same(tracker.density(alt), density(alt), backend)
+        assert array_equal(tracker.index, layer_index(alt))
+
+def test_tracker_1(backend):
+    tracker = AtmosphereTracker(trajectory(0.0))
+    out = tracker.state(trajectory(0.0))
+    for step in STEPS:
+        alt = trajectory(step)
+        assert tracker.state(alt, out=out) is out
+        for value, expected in zip(out, atmosphere_state(alt)):
+            assert same(value, expected, backend)
+    # Only the vehicles crossing a break, and the NaN ones, are located.
+    nans = trajectory(0.0)[::37].size
+    assert tracker.crossings < STEPS.size*(nans + 10)
+
+def test_tracker_2():
+    alt = trajectory(0.0).reshape(20, 10).astype(float32)
+    tracker = AtmosphereTracker(alt)
+    assert tracker.dtype == float32
+    for step in STEPS[::10]:
+        alt = trajectory(step).reshape(20, 10).astype(float32)
+        out = empty(alt.shape, dtype=float32)
+        assert tracker.pressure(alt, out=out) is out
+        assert isclose(out, pressure(alt), rtol=1e-6,
+                       equal_nan=True).all()
+
+def test_tracker_3():
+    mars = Atmosphere((-8000.0, 7000.0, 60000.0), (-2.22e-3, 0.0),
+                      temperature_0=242.1, pressure_0=699.0,
+                      gas_constant=191.8, gravity=3.711)
+    tables = mars.layer_tables(dtype('float64'))
+    alt = linspace(-9000.0, 61000.0, 71)
+    tracker = AtmosphereTracker(alt, tables=tables)
+    for shift in (0.0, 500.0, -7000.0):
+        assert array_equal(tracker.density(alt + shift),
+                           mars.density(alt + shift), equal_nan=True)
+    assert repr(tracker) == 'AtmosphereTracker(shape=(71,), dtype=float64)'
+
+def test_tracker_4():
+    tracker = AtmosphereTracker(START)
+    with raises(ValueError):
+        tracker.temperature(START[:10])
+    tracker.temperature(START + 1.0)
+    assert tracker.crossings == 0
+
+def test_tracker_5():
+    # The gas properties are those of the atmosphere tracked.
+    mars = Atmosphere((-8000.0, 7000.0, 60000.0), (-2.22e-3, 0.0),
+                      temperature_0=242.1, pressure_0=699.0,
+                      gas_constant=191.8, gravity=3.711, gamma=1.29,
+                      beta_s=1.37e-6, sutherland=222.0)
+    alt = linspace(-9000.0, 61000.0, 71)
+    tracker = AtmosphereTracker(alt, atmosphere=mars)
+    for shift in (0.0, 500.0, -7000.0):
+        for value, expected in zip(tracker.state(alt + shift),
+                                   mars.state(alt + shift)):
+            assert array_equal(value, expected, equal_nan=True)
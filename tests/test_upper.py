@@ -0,0 +1,175 @@
+from numpy import (array, array_equal, diff, empty, float32, isclose, isnan,
+                   linspace, log, nan, sqrt)
+
+import pystdatm
+from pystdatm import (atmosphere_state, density, disable_cache,
+                      disable_upper_atmosphere, enable_cache,
+                      enable_upper_atmosphere, get_cache, pressure,
+                      speed_of_sound, temperature, temperature_scalar,
+                      upper_enabled, viscosity)
+from pystdatm.backend import ACTIVE
+from pystdatm.constants import G_0, GAMMA, H_7, R_0, R
+from pystdatm.layers import Workspace
+from pystdatm.thermosphere import ANCHOR_P, ANCHOR_Z, R_STAR
+from pystdatm.upper import H_11
+
+# Temperatures and densities of the 1976 tables at geometric altitudes.
+TABLE_Z = array([86.0, 100.0, 120.0, 150.0, 200.0, 300.0, 500.0, 1000.0])*1e3
+TABLE_T = array([186.8673, 195.08, 360.00, 634.39, 854.56, 976.01, 999.24,
+                 1000.00])
+TABLE_RHO = array([6.958e-6, 5.604e-7, 2.222e-8, 2.076e-9, 2.541e-10,
+                   1.916e-11, 5.215e-13, 3.561e-15])
+ALTITUDES = linspace(H_7, H_11, 10001)
+
+def geopotential(geometric):
+    return R_0*geometric/(R_0 + geometric)
+
+def test_upper_0():
+    assert not upper_enabled()
+    assert isnan(pressure(90000.0))
+    enable_upper_atmosphere()
+    try:
+        assert upper_enabled()
+        assert isclose(temperature(geopotential(TABLE_Z)), TABLE_T,
+                       rtol=1e-5, atol=0.0).all()
+        assert isclose(density(geopotential(TABLE_Z)), TABLE_RHO,
+                       rtol=2.5e-3, atol=0.0).all()
+        assert isclose(pressure(geopotential(array(ANCHOR_Z))), ANCHOR_P,
+                       rtol=1e-12, atol=0.0).all()
+    finally:
+        disable_upper_atmosphere()
+    assert not upper_enabled()
+    assert isnan(pressure(geopotential(TABLE_Z))).all()
+    assert isnan(pressure(90000.0))
+
+def test_upper_1():
+    enable_upper_atmosphere()
+    try:
+        state = atmosphere_state(ALTITUDES)
+        # The pressure and density fall and follow the hydrostatic equation.
+        assert (diff(state.pressure) < 0.0).all()
+        assert (diff(state.density) < 0.0).all()
+        geometric = R_0*ALTITUDES/(R_0 - ALTITUDES)
+        grav = G_0*(R_0/(R_0 + geometric[1:-1]))**2
+        dlogp = (log(state.pressure[2:]) -
+                 log(state.pressure[:-2]))/(geometric[2:] - geometric[:-2])
+        assert isclose(dlogp, -grav*state.density[1:-1]/state.pressure[1:-1],
+                       rtol=1e-2, atol=0.0).all()
+        # The mean molecular weight falls from that of the air below 86 km.
+        molw = R_STAR*state.density*state.temperature/state.pressure
+        assert isclose(molw[0], 28.9644, rtol=1e-3)
+        assert isclose(molw[-1], 3.94, rtol=1e-3)
+        assert (state.viscosity > 0.0).all()
+        assert isclose(state.speed_of_sound, sqrt(GAMMA*R*state.temperature),
+                       rtol=1e-15, atol=0.0).all()
+    finally:
+        disable_upper_atmosphere()
+
+def test_upper_2():
+    # The model stays continuous at H_7 and the layers below are unchanged.
+    below = linspace(-2000.0, H_7, 1001)
+    before = atmosphere_state(below)
+    enable_upper_atmosphere()
+    try:
+        after = atmosphere_state(below)
+        for value, reference in zip(after, before):
+            assert (value == reference).all()
+        step = atmosphere_state(array([H_7, H_7 + 1e-3]))
+        assert isclose(step.pressure[0], step.pressure[1], rtol=1e-5)
+        assert isclose(step.density[0], step.density[1], rtol=1e-4)
+        assert isclose(step.temperature[0], step.temperature[1], rtol=1e-3)
+        assert isnan(atmosphere_state(array([H_11 + 1.0]))).all()
+    finally:
+        disable_upper_atmosphere()
+
+def test_upper_3():
+    below = pressure(10000.0)
+    enable_upper_atmosphere()
+    try:
+        funcs = (temperature, pressure, density, viscosity, speed_of_sound)
+        for alt in (90000.0, 150000.0, 600000.0, float(H_11)):
+            for func in funcs:
+                assert isclose(func(alt), func(array([alt]))[0], rtol=1e-15)
+            state = atmosphere_state(alt)
+            assert isclose(state.pressure, pressure(alt), rtol=1e-15)
+        assert isnan(pressure(H_11 + 1.0))
+        assert pressure(10000.0) == below
+    finally:
+        disable_upper_atmosphere()
+
+def test_upper_4():
+    enable_upper_atmosphere()
+    try:
+        single = atmosphere_state(ALTITUDES.astype(float32))
+        double = atmosphere_state(ALTITUDES)
+        for value, reference in zip(single, double):
+            assert value.dtype == float32
+            assert isclose(value, reference, rtol=1e-4, atol=0.0).all()
+    finally:
+        disable_upper_atmosphere()
+
+def test_upper_5():
+    # 0-d altitudes above H_7 evaluate as 1-d ones.
+    enable_upper_atmosphere()
+    try:
+        alt = geopotential(TABLE_Z[4])
+        for func in (temperature, pressure, density, viscosity,
+                     speed_of_sound):
+            value = func(array(alt))
+            assert value.shape == ()
+            assert value == func(array([alt]))[0]
+            assert value == func(float(alt))
+        for value, expected in zip(atmosphere_state(array(alt)),
+                                   atmosphere_state(array([alt]))):
+            assert value.shape == () and value == expected[0]
+    finally:
+        disable_upper_atmosphere()
+
+def test_upper_6():
+    # The upper atmosphere and the cache are disabled in either order.
+    alt = array([geopotential(90000.0)])
+    for first, second in ((enable_upper_atmosphere, enable_cache),
+                          (enable_cache, enable_upper_atmosphere)):
+        for disable in ((disable_upper_atmosphere, disable_cache),
+                        (disable_cache, disable_upper_atmosphere)):
+            first()
+            second()
+            cache = get_cache()
+            assert upper_enabled()
+            assert isclose(density(alt), 3.416e-6, rtol=1e-2)
+            disable[0]()
+            enabled = disable[0] is disable_cache
+            assert upper_enabled() is enabled
+            assert (get_cache() is cache) is not enabled
+            assert isnan(density(alt)[0]) is not enabled
+            assert isnan(density(float(alt[0]))) is not enabled
+            disable[1]()
+            assert not upper_enabled() and get_cache() is None
+            assert isnan(density(alt)[0]) and isnan(density(float(alt[0])))
+            assert ACTIVE['backend'] is ACTIVE['selected']
+            assert temperature_scalar is pystdatm.temperature_scalar
+
+def test_upper_7():
+    # Altitudes at or below H_7 match the lower backend, and mixed ones
+    # are evaluated into out and the workspace, even in place.
+    lower = linspace(0.0, H_7, 101)
+    mixed = linspace(H_7 - 1000.0, H_7 + 1000.0, 100).reshape(4, 25)
+    expected = density(lower)
+    enable_upper_atmosphere()
+    try:
+        backend = ACTIVE['backend']
+        assert array_equal(density(lower), expected)
+        assert density(lower[:0]).shape == (0, )
+        reference = backend.density(mixed)
+        workspace = Workspace(mixed.size)
+        out = mixed.copy()
+        assert backend.density(out, out=out, workspace=workspace) is out
+        assert array_equal(out, reference)
+        out = empty((25, 4)).T
+        assert backend.density(mixed, out=out, workspace=workspace) is out
+        assert array_equal(out, reference)
+        values = density(array([nan, H_7, H_7 + 1000.0]))
+        assert isnan(values[0]) and values[1] == expected[-1]
+        assert values[2] == reference[-1, -1]
+    finally:
+        disable_upper_atmosphere()